@@ -28,7 +28,72 @@ SCRAPING_CONFIG = {
     'reviews_per_bank': int(os.getenv('REVIEWS_PER_BANK', 400)),
     'max_retries': int(os.getenv('MAX_RETRIES', 3)),
     'lang': 'en',
-    'country': 'et'
+    'country': 'et',
+    # Reviews requested per page (one HTTP request per page)
+    'page_size': int(os.getenv('PAGE_SIZE', 100)),
+    # Concurrent mode: scrape several apps at once with a thread pool
+    'concurrent': os.getenv('SCRAPE_CONCURRENT', 'false').lower() == 'true',
+    'max_workers': int(os.getenv('MAX_WORKERS', 8)),
+    # 'full': newest N reviews every run
+    # 'incremental': only reviews newer than the stored high-water mark
+    # 'backfill': resume paging into older reviews from the stored token
+    'mode': os.getenv('SCRAPE_MODE', 'full'),
+    # Streaming mode: write each page to JSONL shards instead of one CSV
+    'stream': os.getenv('SCRAPE_STREAM', 'false').lower() == 'true',
+    'shard_size': int(os.getenv('SHARD_SIZE', 5000)),
+    # Drop reviews whose review_id was already ingested
+    'dedup': os.getenv('SCRAPE_DEDUP', 'true').lower() == 'true',
+    # Fetch backend: 'live', 'record', 'replay' or 'fake' (local fake store)
+    'backend': os.getenv('SCRAPER_BACKEND', 'live'),
+    'fake_store_url': os.getenv('FAKE_STORE_URL', 'http://127.0.0.1:8765'),
+    # Request budgets in requests/second (0 disables the limit)
+    'global_rate_limit': float(os.getenv('GLOBAL_RATE_LIMIT', 4)),
+    'per_app_rate_limit': float(os.getenv('PER_APP_RATE_LIMIT', 1)),
+    # Retries: jittered exponential backoff (seconds) within a shared budget
+    'backoff_base': float(os.getenv('BACKOFF_BASE', 0.5)),
+    'backoff_max': float(os.getenv('BACKOFF_MAX', 30)),
+    'retry_budget_ratio': float(os.getenv('RETRY_BUDGET_RATIO', 0.2)),
+    # Circuit breaker: park an app after N consecutive failures
+    'breaker_threshold': int(os.getenv('BREAKER_THRESHOLD', 5)),
+    'breaker_reset': float(os.getenv('BREAKER_RESET', 60))
+}
+
+# Scheduler (long-running scraping daemon) configuration
+SCHEDULER_CONFIG = {
+    # Seconds between incremental scrapes of an app
+    'default_interval': int(os.getenv('SCHEDULE_DEFAULT_INTERVAL', 3600)),
+    # Per-app overrides: high-churn apps are polled more often
+    'intervals': {
+        'CBE': int(os.getenv('CBE_SCHEDULE_INTERVAL', 900)),
+    },
+    # Random +/- fraction applied to every interval to spread requests
+    'jitter': float(os.getenv('SCHEDULE_JITTER', 0.1)),
+    'max_workers': int(os.getenv('SCHEDULE_MAX_WORKERS', 4))
+}
+
+# Preprocessing configuration
+PREPROCESSING_CONFIG = {
+    # 'full': whole file in memory; 'chunked': constant-memory streaming;
+    # 'parallel': shards processed on a process pool;
+    # 'incremental': only new or changed review_ids are processed
+    'mode': os.getenv('PREPROCESS_MODE', 'full'),
+    'chunksize': int(os.getenv('PREPROCESS_CHUNKSIZE', 50000)),
+    'n_workers': int(os.getenv('PREPROCESS_WORKERS', os.cpu_count() or 1)),
+    # 'rows': n_workers row ranges (uses every worker); 'bank': one shard
+    # per bank_code (at most as many busy workers as banks)
+    'shard_by': os.getenv('PREPROCESS_SHARD_BY', 'rows'),
+    # Dashboard rendering: 'background', 'sync' or 'skip'
+    'dashboard': os.getenv('PREPROCESS_DASHBOARD', 'background'),
+    'dashboard_dir': os.getenv('PREPROCESS_DASHBOARD_DIR', '.'),
+    # tracemalloc per stage (accurate Python allocation figures, but slower)
+    'trace_memory':
+        os.getenv('PREPROCESS_TRACE_MEMORY', 'false').lower() == 'true'
+}
+
+# Table storage (see Script/storage.py): 'csv', 'parquet' (partitioned
+# dataset next to each CSV path, by bank and year/month) or 'both'
+STORAGE_CONFIG = {
+    'format': os.getenv('DATA_FORMAT', 'csv')
 }
 
 # File paths
@@ -38,5 +103,9 @@ DATA_PATHS = {
     'raw_reviews': 'data/raw/reviews_raw.csv',
     'processed_reviews': 'data/processed/reviews_processed.csv',
     'app_info': 'data/raw/app_info.csv',
+    'scrape_state': 'data/raw/scrape_state.json',
+    'raw_shards': 'data/raw/shards',
+    'seen_ids': 'data/raw/seen_review_ids.txt',
+    'scrape_recording': 'data/raw/scrape_recording.jsonl',
     'outputs': 'data/outputs'
 }
@@ -0,0 +1,133 @@
+"""
+Compact in-memory dtypes for review frames.
+
+apply_schema is applied by every loader (Script/storage.load_frame and
+iter_frames, utils.load_reviews, ReviewPreprocessor.load_data, the task-2
+scripts and task-4 fetch_all_data):
+- low-cardinality text that is never reassigned (bank, weekday) -> category
+- counts and date parts -> the smallest nullable integer that fits
+- free text -> Arrow-backed strings (one buffer per column instead of one
+  Python object per value)
+
+Columns are only converted when the conversion is lossless; anything else
+is left as loaded; scores stay float64 because float32 would not read
+back the stored values exactly. Print the saving for a table with:
+
+    python -m Script.schema data/processed/reviews_processed.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+# Only columns the pipeline never writes new values into: setting a value
+# outside a categorical's categories raises
+CATEGORY_COLUMNS = ('bank_code', 'bank_name', 'review_weekday')
+
+# Column -> nullable integer dtype
+INT_COLUMNS = {
+    'rating': 'Int8',
+    'review_year': 'Int16',
+    'review_month': 'Int8',
+    'review_day': 'Int8',
+    'thumbs_up': 'Int32',
+    'text_length': 'Int32',
+}
+
+STRING_COLUMNS = ('review_id', 'review_text', 'cleaned_review', 'user_name',
+                  'reply_content', 'themes')
+
+
+def string_dtype():
+    """Arrow-backed string dtype with NaN missing values (pandas 3 'str')."""
+    if pyarrow is None:
+        return None
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3
+        return pd.StringDtype('pyarrow')
+
+
+def to_small_int(series, dtype):
+    """series as the nullable integer dtype, or None if that loses data."""
+    if not pd.api.types.is_numeric_dtype(series) \
+            or pd.api.types.is_bool_dtype(series):
+        return None
+    values = series.dropna()
+    info = np.iinfo(dtype.lower())
+    if len(values) and (
+            (values % 1 != 0).any()
+            or values.min() < info.min or values.max() > info.max):
+        return None
+    return series.astype(dtype)
+
+
+def apply_schema(df):
+    """Convert the known review columns of df to compact dtypes (in place)."""
+    strings = string_dtype()
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORY_COLUMNS:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[column] = series.astype('category')
+        elif column in INT_COLUMNS:
+            converted = to_small_int(series, INT_COLUMNS[column])
+            if converted is not None:
+                df[column] = converted
+        elif column in STRING_COLUMNS and strings is not None:
+            if series.dtype == object or (
+                    pd.api.types.is_string_dtype(series)
+                    and getattr(series.dtype, 'storage', None) != 'pyarrow'):
+                df[column] = series.astype(strings)
+    return df
+
+
+def bytes_per_review(df):
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+def memory_report(df):
+    """
+    Per-column and per-review memory of df as loaded vs. with apply_schema.
+    Returns the per-column table (bytes).
+    """
+    before = df.memory_usage(deep=True, index=False)
+    compact = apply_schema(df.copy())
+    after = compact.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype_before': df.dtypes.astype(str),
+        'dtype_after': compact.dtypes.astype(str),
+        'bytes_before': before,
+        'bytes_after': after,
+    })
+
+    rows = max(len(df), 1)
+    print(report.to_string())
+    print(f"\nRows: {len(df)}")
+    print(f"Bytes per review: {before.sum() / rows:.1f} -> "
+          f"{after.sum() / rows:.1f} "
+          f"({(1 - after.sum() / max(before.sum(), 1)) * 100:.0f}% smaller)")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memory per review before/after the compact schema")
+    parser.add_argument('path', nargs='?', default=None,
+                        help="review CSV (default: processed reviews)")
+    args = parser.parse_args()
+
+    from Script.config import DATA_PATHS
+    path = args.path or DATA_PATHS['processed_reviews']
+    memory_report(pd.read_csv(path))
+
+
+if __name__ == "__main__":
+    main()
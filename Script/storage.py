@@ -0,0 +1,278 @@
+"""
+Storage helpers for the review tables exchanged between stages.
+
+Every table has a CSV path (e.g. DATA_PATHS['processed_reviews']). Next to
+it the same table can be stored as a Parquet dataset, a directory named
+after the CSV with a '.parquet' suffix, hive-partitioned by bank and by the
+year/month of review_date:
+
+    data/processed/reviews_processed.parquet/bank=CBE/year=2025/month=6/...
+
+STORAGE_CONFIG['format'] decides what gets written ('csv', 'parquet' or
+'both'). load_frame reads the dataset when there is one and the CSV
+otherwise, with column projection and bank/date filters either way; on
+the dataset the filters prune whole partitions before any file is opened.
+
+    load_frame(DATA_PATHS['processed_reviews'],
+               columns=['review_text', 'rating'], banks=['CBE'],
+               since='2025-06')
+"""
+
+import os
+import shutil
+import uuid
+
+import pandas as pd
+
+from Script.config import STORAGE_CONFIG
+from Script.schema import CATEGORY_COLUMNS, STRING_COLUMNS, apply_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+# Partition keys derived from bank_code / review_date. They live only in
+# the directory names, so the files keep the table's own columns.
+PARTITION_KEYS = ('bank', 'year', 'month')
+
+
+def dataset_path(path):
+    """Parquet dataset directory of a CSV path."""
+    return os.path.splitext(str(path))[0] + '.parquet'
+
+
+def dataset_exists(path):
+    return os.path.isdir(dataset_path(path))
+
+
+def frame_exists(path):
+    """True if the table is stored as CSV or as a Parquet dataset."""
+    return os.path.exists(str(path)) or dataset_exists(path)
+
+
+def writes_csv():
+    return STORAGE_CONFIG['format'] in ('csv', 'both')
+
+
+def writes_parquet():
+    return STORAGE_CONFIG['format'] in ('parquet', 'both')
+
+
+def require_pyarrow():
+    if ds is None:
+        raise ImportError(
+            "pyarrow is required for the parquet storage format "
+            "(pip install pyarrow)")
+
+
+def to_table(df):
+    """
+    Arrow table of df plus the partition keys. Dates are stored as
+    timestamps and object/categorical columns as strings, so every write of
+    a table has the same schema and appends stay readable as one dataset.
+    """
+    df = df.copy()
+    if 'review_date' in df.columns:
+        df['review_date'] = pd.to_datetime(df['review_date'], errors='coerce')
+    for column in df.columns:
+        if df[column].dtype == object \
+                or isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('string')
+
+    dates = df['review_date'] if 'review_date' in df.columns \
+        else pd.Series(pd.NaT, index=df.index)
+    df['bank'] = df['bank_code'].astype('string') \
+        if 'bank_code' in df.columns else pd.NA
+    df['year'] = dates.dt.year.astype('Int16')
+    df['month'] = dates.dt.month.astype('Int8')
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_dataset(df, path, append=False):
+    """
+    Write df as the partitioned dataset of `path`. Without append the
+    dataset is replaced: it is written to a temporary directory first and
+    swapped in, so readers never see half a dataset.
+    """
+    require_pyarrow()
+    target = dataset_path(path)
+    table = to_table(df)
+    partitioning = ds.partitioning(
+        table.select(list(PARTITION_KEYS)).schema, flavor='hive')
+    # Unique file names per write, so appends never overwrite earlier files
+    basename = f"part-{uuid.uuid4().hex}-{{i}}.parquet"
+
+    if append and os.path.isdir(target):
+        ds.write_dataset(table, target, format='parquet',
+                         partitioning=partitioning,
+                         basename_template=basename,
+                         existing_data_behavior='overwrite_or_ignore')
+        return target
+
+    staging = f"{target}.tmp-{uuid.uuid4().hex}"
+    ds.write_dataset(table, staging, format='parquet',
+                     partitioning=partitioning, basename_template=basename)
+    if os.path.isdir(target):
+        retired = f"{target}.old-{uuid.uuid4().hex}"
+        os.replace(target, retired)
+        os.replace(staging, target)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.replace(staging, target)
+    return target
+
+
+def partition_filter(banks=None, since=None, until=None):
+    """Arrow expression selecting the partitions that can hold matches."""
+    expression = None
+
+    def both(left, right):
+        return right if left is None else left & right
+
+    if banks is not None:
+        expression = both(expression, ds.field('bank').isin(list(banks)))
+    if since is not None:
+        since = pd.Timestamp(since)
+        expression = both(expression, (ds.field('year') > since.year) | (
+            (ds.field('year') == since.year)
+            & (ds.field('month') >= since.month)))
+    if until is not None:
+        until = pd.Timestamp(until)
+        expression = both(expression, (ds.field('year') < until.year) | (
+            (ds.field('year') == until.year)
+            & (ds.field('month') <= until.month)))
+    return expression
+
+
+def filter_rows(df, banks=None, since=None, until=None):
+    """Exact bank/date filtering of a loaded frame (since <= date < until)."""
+    mask = pd.Series(True, index=df.index)
+    if banks is not None:
+        mask &= df['bank_code'].isin(list(banks))
+    if since is not None or until is not None:
+        dates = pd.to_datetime(df['review_date'], errors='coerce')
+        if since is not None:
+            mask &= dates >= pd.Timestamp(since)
+        if until is not None:
+            mask &= dates < pd.Timestamp(until)
+    return df[mask] if not mask.all() else df
+
+
+def read_dataset(path, columns=None, banks=None, since=None, until=None):
+    """
+    Read the partitioned dataset of `path`, only opening the partitions
+    that match the bank/date filters and only decoding `columns`.
+    """
+    require_pyarrow()
+    dataset = ds.dataset(dataset_path(path), format='parquet',
+                         partitioning='hive')
+    stored = [c for c in dataset.schema.names if c not in PARTITION_KEYS]
+    wanted = list(columns) if columns is not None else stored
+
+    # Columns needed only to filter rows are dropped again afterwards
+    extra = []
+    if banks is not None and 'bank_code' not in wanted:
+        extra.append('bank_code')
+    if (since is not None or until is not None) \
+            and 'review_date' not in wanted:
+        extra.append('review_date')
+
+    table = dataset.to_table(
+        columns=wanted + extra,
+        filter=partition_filter(banks, since, until))
+    df = filter_rows(table.to_pandas(), banks, since, until)
+    return df.drop(columns=extra).reset_index(drop=True)
+
+
+def read_csv(path, columns=None, banks=None, since=None, until=None):
+    """CSV counterpart of read_dataset (projection, then row filtering)."""
+    usecols = None
+    extra = []
+    if columns is not None:
+        usecols = list(columns)
+        if banks is not None and 'bank_code' not in usecols:
+            extra.append('bank_code')
+        if (since is not None or until is not None) \
+                and 'review_date' not in usecols:
+            extra.append('review_date')
+        usecols += extra
+    df = pd.read_csv(path, usecols=usecols)
+    if usecols is not None:
+        df = df[usecols]
+    df = filter_rows(df, banks, since, until)
+    return df.drop(columns=extra).reset_index(drop=True)
+
+
+def load_frame(path, columns=None, banks=None, since=None, until=None):
+    """
+    Load a review table, from its Parquet dataset if there is one (and the
+    storage format writes Parquet) or else from the CSV, with the compact
+    dtypes of Script/schema.py.
+    banks filters on bank_code; since/until on review_date (until exclusive).
+    """
+    if dataset_exists(path) and (
+            writes_parquet() or not os.path.exists(str(path))):
+        return apply_schema(read_dataset(path, columns, banks, since, until))
+    return apply_schema(read_csv(path, columns, banks, since, until))
+
+
+def save_frame(df, path, append=False):
+    """
+    Save a review table in the configured format(s). With append, rows are
+    added to the existing CSV / dataset instead of replacing it.
+    """
+    directory = os.path.dirname(str(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if writes_csv():
+        if append and os.path.exists(str(path)):
+            df.to_csv(path, mode='a', header=False, index=False)
+        else:
+            df.to_csv(path, index=False)
+    if writes_parquet():
+        write_dataset(df, path, append=append)
+
+
+def iter_frames(path, chunksize, columns=None):
+    """
+    Iterate a review table in frames of at most `chunksize` rows, from its
+    Parquet dataset (record batches) or its CSV (chunked reader).
+    """
+    if dataset_exists(path) and (
+            writes_parquet() or not os.path.exists(str(path))):
+        require_pyarrow()
+        dataset = ds.dataset(dataset_path(path), format='parquet',
+                             partitioning='hive')
+        if columns is None:
+            columns = [c for c in dataset.schema.names
+                       if c not in PARTITION_KEYS]
+        for batch in dataset.to_batches(columns=list(columns),
+                                        batch_size=chunksize):
+            if batch.num_rows:
+                yield apply_schema(batch.to_pandas())
+        return
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=columns):
+        yield apply_schema(chunk)
+
+
+def export_csv(path, chunksize=50000):
+    """
+    Rebuild the Parquet dataset of `path` from its CSV, chunk by chunk.
+    Used by the pipelines that produce their CSV by merging sorted runs.
+    Text columns are read as strings and every chunk goes through
+    apply_schema, so a chunk where a column is all missing (inferred as
+    float) still writes the same schema as the others.
+    """
+    require_pyarrow()
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {c: 'string' for c in header
+             if c in STRING_COLUMNS or c in CATEGORY_COLUMNS}
+    first = True
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtype):
+        write_dataset(apply_schema(chunk), path, append=not first)
+        first = False
+    if first:
+        write_dataset(apply_schema(pd.read_csv(path, dtype=dtype)), path)
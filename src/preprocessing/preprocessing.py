@@ -7,25 +7,110 @@ This script cleans and preprocesses the scraped reviews data.
 - Normalizes dates
 - Cleans text data
 - Extracts detailed date features
-- Generates simple data quality dashboard
+- Generates simple data quality dashboard (from aggregates collected
+  during the stages, rendered in a background process by default)
+
+Chunked mode (process_chunked) runs the same stages over fixed-size chunks
+of the raw CSV so peak memory does not depend on the input size.
+Parallel mode (process_parallel) shards the input by bank or row range and
+runs the stages on a process pool.
+Every run records per-stage wall/CPU time, rows in/out and memory in
+stats['stages'] and writes a JSON run report next to the output.
+Incremental mode (process_incremental) only processes raw rows whose
+review_id is new (or whose text/rating changed) and merges them into the
+existing output.
+Input and output can be CSV or partitioned Parquet datasets
+(STORAGE_CONFIG['format'], see Script/storage.py); chunked and incremental
+mode keep the output CSV as their merge base and export it to Parquet.
 """
 
 
 import pandas as pd
 import numpy as np
 import re
+import csv
+import heapq
+import tempfile
+import multiprocessing
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
-from Script.config import DATA_PATHS
+from Script.config import DATA_PATHS, PREPROCESSING_CONFIG
+from Script.storage import (export_csv, frame_exists, iter_frames, load_frame,
+                            save_frame, writes_parquet)
 import sys
 import os
 
+try:
+    import resource  # peak RSS, not available on Windows
+except ImportError:
+    resource = None
+
 # Add project root to path (one level up from src/)
 sys.path.append(os.path.abspath(os.path.join(
     os.path.dirname(__file__), '..', '..')))
 
 
+STAGES = ('handle_missing_values', 'normalize_dates', 'clean_text',
+          'validate_ratings', 'prepare_final_output')
+
+
+def current_rss_mb():
+    """
+    Current resident set size of this process in MB, from /proc (Linux);
+    None elsewhere.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size over the whole life of this process, in MB.
+    Only meaningful for the run as a whole, not for a single stage.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def instrumented(mode):
+    """
+    Wrap a process_* method so the outermost call resets the stage metrics
+    and, on success, writes the run report.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            outermost = self.run_depth == 0
+            if outermost:
+                self.begin_run()
+            self.run_depth += 1
+            try:
+                success = method(self, *args, **kwargs)
+            finally:
+                self.run_depth -= 1
+                if outermost:
+                    self.end_tracing()
+            if outermost and success:
+                self.finish_run(mode)
+            return success
+        return wrapper
+    return decorator
+
+
 class ReviewPreprocessor:
     """Preprocessor class for review data"""
 
@@ -34,11 +119,28 @@ class ReviewPreprocessor:
         self.output_path = output_path or DATA_PATHS['processed_reviews']
         self.df = None
         self.stats = {}
+        self.aggregates = None
+        self.dashboard_process = None
+        self.verbose = True
+        self.stage_metrics = {}
+        self.run_depth = 0
+        self.run_started = None
+        self.started_tracing = False
+
+    def log(self, message):
+        # Stage output is silenced per chunk in chunked mode
+        if self.verbose:
+            print(message)
 
-    def load_data(self):
+    def load_data(self, columns=None, banks=None, since=None, until=None):
+        """
+        Load the raw reviews (Parquet dataset or CSV, see Script/storage.py),
+        optionally only some columns, banks or a review_date range.
+        """
         print("Loading raw data...")
         try:
-            self.df = pd.read_csv(self.input_path)
+            self.df = load_frame(self.input_path, columns=columns,
+                                 banks=banks, since=since, until=until)
             print(f"Loaded {len(self.df)} reviews")
             self.stats['original_count'] = len(self.df)
             return True
@@ -47,20 +149,21 @@ class ReviewPreprocessor:
             return False
 
     def check_missing_data(self):
-        print("\n[1/6] Checking for missing data...")
+        self.log("\n[1/6] Checking for missing data...")
         missing = self.df.isnull().sum()
         missing_pct = (missing / len(self.df)) * 100
         for col in missing.index:
             if missing[col] > 0:
-                print(f"  {col}: {missing[col]} ({missing_pct[col]:.2f}%)")
+                self.log(f"  {col}: {missing[col]} ({missing_pct[col]:.2f}%)")
+        return missing
 
     def handle_missing_values(self):
-        print("\n[2/6] Handling missing values...")
+        self.log("\n[2/6] Handling missing values...")
         critical_cols = ['review_text', 'rating', 'bank_name']
         before_count = len(self.df)
         self.df = self.df.dropna(subset=critical_cols)
         removed = before_count - len(self.df)
-        print(f"Removed {removed} rows with missing critical values")
+        self.log(f"Removed {removed} rows with missing critical values")
 
         self.df['user_name'] = self.df.get(
             'user_name', pd.Series()).fillna('Anonymous')
@@ -72,7 +175,7 @@ class ReviewPreprocessor:
         self.stats['count_after_missing'] = len(self.df)
 
     def normalize_dates(self):
-        print("\n[3/6] Normalizing dates...")
+        self.log("\n[3/6] Normalizing dates...")
         self.df['review_date'] = pd.to_datetime(
             self.df['review_date'], errors='coerce')
         self.df.dropna(subset=['review_date'], inplace=True)
@@ -84,11 +187,11 @@ class ReviewPreprocessor:
         self.df['review_day'] = self.df['review_date'].dt.day
         self.df['review_weekday'] = self.df['review_date'].dt.day_name()
 
-        print(
+        self.log(
             f"Date range: {self.df['review_date_only'].min()} to {self.df['review_date_only'].max()}")
 
     def clean_text(self):
-        print("\n[4/6] Cleaning text...")
+        self.log("\n[4/6] Cleaning text...")
 
         def clean_review(text):
             if pd.isna(text):
@@ -101,26 +204,26 @@ class ReviewPreprocessor:
         before_count = len(self.df)
         self.df = self.df[self.df['review_text'].str.len() > 0]
         removed = before_count - len(self.df)
-        print(f"Removed {removed} reviews with empty text")
+        self.log(f"Removed {removed} reviews with empty text")
 
         self.df['text_length'] = self.df['review_text'].str.len()
         self.stats['empty_reviews_removed'] = removed
         self.stats['count_after_cleaning'] = len(self.df)
 
     def validate_ratings(self):
-        print("\n[5/6] Validating ratings...")
+        self.log("\n[5/6] Validating ratings...")
         invalid = self.df[(self.df['rating'] < 1) | (self.df['rating'] > 5)]
         if len(invalid) > 0:
-            print(
+            self.log(
                 f"WARNING: Found {len(invalid)} invalid ratings. Removing them...")
             self.df = self.df[(self.df['rating'] >= 1) &
                               (self.df['rating'] <= 5)]
         else:
-            print("All ratings are valid (1-5)")
+            self.log("All ratings are valid (1-5)")
         self.stats['invalid_ratings_removed'] = len(invalid)
 
     def prepare_final_output(self):
-        print("\n[6/6] Preparing final output...")
+        self.log("\n[6/6] Preparing final output...")
         output_columns = [
             'review_id', 'review_text', 'rating', 'review_date', 'review_year', 'review_month',
             'review_day', 'review_weekday', 'bank_code', 'bank_name', 'user_name',
@@ -131,62 +234,676 @@ class ReviewPreprocessor:
         self.df = self.df.sort_values(
             ['bank_code', 'review_date'], ascending=[True, False])
         self.df = self.df.reset_index(drop=True)
-        print(f"Final dataset: {len(self.df)} reviews")
+        # Dashboard inputs, collected here so no full-frame pass is needed
+        # later
+        self.aggregates = collect_aggregates(self.df)
+        self.log(f"Final dataset: {len(self.df)} reviews")
 
     def save_data(self):
         print("\nSaving processed data...")
-        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        self.df.to_csv(self.output_path, index=False)
+        save_frame(self.df, self.output_path)
         print(f"Data saved to: {self.output_path}")
         self.stats['final_count'] = len(self.df)
 
-    def generate_dashboard(self):
+    def generate_dashboard(self, mode=None):
+        """
+        Render the data quality dashboard from self.aggregates.
+        mode (default: PREPROCESSING_CONFIG['dashboard']):
+        - 'background': render in a separate process and return immediately
+        - 'sync': render before returning
+        - 'skip': no dashboard
+        """
+        mode = mode or PREPROCESSING_CONFIG['dashboard']
+        if mode == 'skip' or self.aggregates is None:
+            return None
+
+        if mode == 'background':
+            print("\nGenerating simple dashboard in the background...")
+            self.dashboard_process = multiprocessing.Process(
+                target=render_dashboard,
+                args=(self.aggregates, PREPROCESSING_CONFIG['dashboard_dir']))
+            self.dashboard_process.start()
+            return self.dashboard_process
+
         print("\nGenerating simple dashboard...")
-        # Missing values heatmap
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(self.df.isna(), cbar=False)
-        plt.title("Missing Values Heatmap")
-        plt.tight_layout()
-        plt.savefig("missing_values_heatmap.png")
-
-        # Rating distribution
-        plt.figure(figsize=(6, 4))
-        self.df['rating'].value_counts().sort_index().plot(
-            kind='bar', color='skyblue')
-        plt.title("Rating Distribution")
-        plt.tight_layout()
-        plt.savefig("rating_distribution.png")
-
-        # Monthly review counts
-        plt.figure(figsize=(8, 4))
-        monthly_counts = self.df.groupby(
-            ['review_year', 'review_month']).size().reset_index(name='count')
-        monthly_counts['month_year'] = monthly_counts['review_year'].astype(
-            str) + "-" + monthly_counts['review_month'].astype(str)
-        sns.barplot(x='month_year', y='count',
-                    data=monthly_counts, color='lightgreen')
-        plt.xticks(rotation=45)
-        plt.title("Monthly Review Counts")
-        plt.tight_layout()
-        plt.savefig("monthly_review_counts.png")
+        render_dashboard(self.aggregates,
+                         PREPROCESSING_CONFIG['dashboard_dir'])
+        return None
+
+    # -------------------------------
+    # Instrumentation
+    # -------------------------------
+
+    def begin_run(self):
+        self.df = None
+        self.stage_metrics = {}
+        self.run_started = time.perf_counter()
+        self.started_tracing = False
+        if (PREPROCESSING_CONFIG['trace_memory']
+                and not tracemalloc.is_tracing()):
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def end_tracing(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextmanager
+    def time_stage(self, name):
+        """
+        Record wall time, CPU time, rows in/out, the change in current RSS
+        and (when tracemalloc is tracing) the allocation delta/peak of a
+        stage. Repeated stages (chunks, shards) are accumulated; memory
+        figures keep the largest call.
+        """
+        rows_in = len(self.df) if self.df is not None else 0
+        rss_before = current_rss_mb()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            mem_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            metrics = {
+                'calls': 1,
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.process_time() - cpu,
+                'rows_in': rows_in,
+                'rows_out': len(self.df) if self.df is not None else 0,
+                'rss_delta_mb': None,
+                'tracemalloc_delta_mb': None,
+                'tracemalloc_peak_mb': None
+            }
+            rss_after = current_rss_mb()
+            if rss_before is not None and rss_after is not None:
+                metrics['rss_delta_mb'] = rss_after - rss_before
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                metrics['tracemalloc_delta_mb'] = (
+                    current - mem_before) / (1024 * 1024)
+                metrics['tracemalloc_peak_mb'] = (
+                    peak - mem_before) / (1024 * 1024)
+            self.stage_metrics = merge_stage_metrics(
+                self.stage_metrics, {name: metrics})
+
+    @property
+    def run_report_path(self):
+        return f"{os.path.splitext(self.output_path)[0]}_run_report.json"
+
+    @property
+    def run_history_path(self):
+        return f"{os.path.splitext(self.output_path)[0]}_run_history.jsonl"
 
+    def finish_run(self, mode):
+        """
+        Expose the stage metrics in stats['stages'], write the JSON run
+        report and append it to the run history, printing the change in
+        per-stage wall time against the previous run of the same mode.
+        """
+        self.stats['stages'] = self.stage_metrics
+        report = {
+            'mode': mode,
+            'finished_at': datetime.now().isoformat(),
+            'input_path': str(self.input_path),
+            'output_path': str(self.output_path),
+            'total_wall_seconds': time.perf_counter() - self.run_started,
+            # Process-lifetime peak, so it is reported once per run
+            'peak_rss_mb': peak_rss_mb(),
+            'stats': self.stats
+        }
+
+        previous = None
+        if os.path.exists(self.run_history_path):
+            with open(self.run_history_path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry.get('mode') == mode:
+                        previous = entry
+
+        os.makedirs(os.path.dirname(self.run_report_path) or '.',
+                    exist_ok=True)
+        with open(self.run_report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        with open(self.run_history_path, 'a') as f:
+            f.write(json.dumps(report, default=str) + '\n')
+
+        print(f"\nStage timings ({mode}):")
+        previous_stages = (previous or {}).get('stats', {}).get('stages', {})
+        for name, metrics in self.stage_metrics.items():
+            line = (f"  {name:<22} {metrics['wall_seconds']:8.3f}s wall "
+                    f"{metrics['cpu_seconds']:8.3f}s cpu "
+                    f"{metrics['rows_in']:>9} -> {metrics['rows_out']:<9}")
+            before = previous_stages.get(name, {}).get('wall_seconds')
+            if before:
+                change = (metrics['wall_seconds'] - before) / before * 100
+                line += f" ({change:+.0f}% vs previous run)"
+            print(line)
+        if report['peak_rss_mb'] is not None:
+            print(f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+        print(f"Run report saved to: {self.run_report_path}")
+        return report
+
+    # -------------------------------
+    # Pipelines
+    # -------------------------------
+
+    def run_stages(self):
+        """Run the cleaning stages on self.df (everything but load/save)."""
+        for name in STAGES:
+            with self.time_stage(name):
+                getattr(self, name)()
+
+    @instrumented('full')
     def process(self):
-        if not self.load_data():
+        with self.time_stage('load_data'):
+            if not self.load_data():
+                return False
+        with self.time_stage('check_missing_data'):
+            self.check_missing_data()
+        self.run_stages()
+        with self.time_stage('save_data'):
+            self.save_data()
+        with self.time_stage('generate_dashboard'):
+            self.generate_dashboard()
+        return True
+
+    @instrumented('chunked')
+    def process_chunked(self, chunksize=None):
+        """
+        Streaming variant of process():
+        1. Reads the raw CSV in chunks of `chunksize` rows
+        2. Runs the same stages on each chunk and writes it as a sorted run
+        3. Merges the runs into the output, keeping the
+           ['bank_code', 'review_date'] sort order of process()
+        Only one chunk is in memory at a time; `stats` holds the totals.
+        """
+        chunksize = chunksize or PREPROCESSING_CONFIG['chunksize']
+        print(f"Processing {self.input_path} in chunks of {chunksize} rows...")
+
+        totals = {}
+        missing_totals = None
+        aggregates = None
+        output_dir = os.path.dirname(self.output_path) or '.'
+        os.makedirs(output_dir, exist_ok=True)
+
+        if not frame_exists(self.input_path):
+            print(f"ERROR: Failed to load data: {self.input_path} not found")
             return False
-        self.check_missing_data()
-        self.handle_missing_values()
-        self.normalize_dates()
-        self.clean_text()
-        self.validate_ratings()
-        self.prepare_final_output()
-        self.save_data()
-        self.generate_dashboard()
+        reader = iter_frames(self.input_path, chunksize)
+
+        with tempfile.TemporaryDirectory(dir=output_dir) as run_dir:
+            runs = []
+            self.verbose = False
+            try:
+                chunks = iter(reader)
+                i = 0
+                while True:
+                    self.df = None
+                    with self.time_stage('read_chunk'):
+                        chunk = next(chunks, None)
+                        self.df = chunk
+                    if chunk is None:
+                        break
+                    self.stats = {'original_count': len(chunk)}
+                    with self.time_stage('check_missing_data'):
+                        missing = self.check_missing_data()
+                    missing_totals = missing if missing_totals is None \
+                        else missing_totals.add(missing, fill_value=0)
+                    self.run_stages()
+
+                    run_path = os.path.join(run_dir, f"run-{i:05d}.csv")
+                    with self.time_stage('write_run'):
+                        self.df.to_csv(run_path, index=False)
+                    runs.append(run_path)
+
+                    for key, value in self.stats.items():
+                        totals[key] = totals.get(key, 0) + value
+                    aggregates = merge_aggregates(aggregates, self.aggregates)
+                    print(f"  Chunk {i + 1}: "
+                          f"{totals['original_count']} rows read")
+                    i += 1
+            finally:
+                self.verbose = True
+                self.df = None
+
+            if not runs:
+                print("ERROR: Input file is empty")
+                return False
+
+            print("\nMerging sorted chunks...")
+            with self.time_stage('merge_runs'):
+                final_count = merge_sorted_runs(runs, self.output_path)
+                if writes_parquet():
+                    export_csv(self.output_path, chunksize)
+
+        totals['final_count'] = final_count
+        self.stats = totals
+        self.aggregates = aggregates
+
+        print("\nMissing values (all chunks):")
+        for col, count in missing_totals.items():
+            if count > 0:
+                pct = count / totals['original_count'] * 100
+                print(f"  {col}: {int(count)} ({pct:.2f}%)")
+        print(f"Final dataset: {final_count} reviews")
+        print(f"Data saved to: {self.output_path}")
+        with self.time_stage('generate_dashboard'):
+            self.generate_dashboard()
         return True
 
+    def split_shards(self, shard_by, n_shards):
+        """
+        Split self.df into shards: one per bank ('bank') or n_shards
+        contiguous row ranges ('rows'). Shard order is deterministic.
+        """
+        if shard_by == 'bank':
+            return [group for _, group in
+                    self.df.groupby('bank_code', sort=True, dropna=False)]
+        if shard_by == 'rows':
+            bounds = np.linspace(0, len(self.df), n_shards + 1, dtype=int)
+            return [self.df.iloc[start:end]
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                    if end > start]
+        raise ValueError(
+            f"Unknown shard_by '{shard_by}'. Expected 'bank' or 'rows'")
+
+    @instrumented('parallel')
+    def process_parallel(self, n_workers=None, shard_by=None):
+        """
+        Multi-core variant of process():
+        1. Loads the raw data and splits it by bank or row range
+        2. Runs the stages on each shard in a process pool
+        3. Concatenates shards in order, sums their stats and re-sorts by
+           ['bank_code', 'review_date'] with a stable sort, so the output
+           does not depend on worker timing
+        """
+        n_workers = n_workers or PREPROCESSING_CONFIG['n_workers']
+        shard_by = shard_by or PREPROCESSING_CONFIG['shard_by']
+
+        with self.time_stage('load_data'):
+            if not self.load_data():
+                return False
+        with self.time_stage('check_missing_data'):
+            self.check_missing_data()
+
+        shards = self.split_shards(shard_by, n_workers)
+        print(f"\nProcessing {len(shards)} shards ({shard_by}) "
+              f"on {n_workers} workers...")
+
+        # Worker stage metrics are summed over shards (wall = worker time);
+        # 'process_pool' is the wall time of the whole pool
+        with self.time_stage('process_pool'):
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(process_shard, shards))
+
+        totals = {'original_count': self.stats['original_count']}
+        self.aggregates = None
+        for _, shard_stats, shard_aggregates, shard_stages in results:
+            for key, value in shard_stats.items():
+                if key != 'original_count':
+                    totals[key] = totals.get(key, 0) + value
+            self.aggregates = merge_aggregates(
+                self.aggregates, shard_aggregates)
+            self.stage_metrics = merge_stage_metrics(
+                self.stage_metrics, shard_stages)
+        self.stats = totals
+
+        with self.time_stage('merge_shards'):
+            frames = [df for df, _, _, _ in results]
+            self.df = pd.concat(frames, ignore_index=True) if frames \
+                else self.df.iloc[0:0]
+            self.df = self.df.sort_values(
+                ['bank_code', 'review_date'], ascending=[True, False],
+                kind='mergesort').reset_index(drop=True)
+        print(f"Final dataset: {len(self.df)} reviews")
+
+        with self.time_stage('save_data'):
+            self.save_data()
+        with self.time_stage('generate_dashboard'):
+            self.generate_dashboard()
+        return True
+
+    @property
+    def seen_ids_path(self):
+        """
+        Sidecar of review_id -> content hash (CSV content) for every raw row
+        already run through the stages, including rows the stages rejected.
+        Its '.seen_ids' suffix keeps it out of the *.csv tables that
+        load_reviews() picks up from the processed directory.
+        """
+        return f"{os.path.splitext(self.output_path)[0]}.seen_ids"
+
+    def migrate_seen_ids(self):
+        """Rename a sidecar written under the old '_seen_ids.csv' name."""
+        legacy = f"{os.path.splitext(self.output_path)[0]}_seen_ids.csv"
+        if os.path.exists(legacy) and not os.path.exists(self.seen_ids_path):
+            os.replace(legacy, self.seen_ids_path)
+
+    @staticmethod
+    def content_hash(df):
+        """Hash of whitespace-normalized text and rating, one per row."""
+        text = df['review_text'].fillna('').astype(str).str.replace(
+            r'\s+', ' ', regex=True).str.strip()
+        rating = pd.to_numeric(df['rating'], errors='coerce').astype('float64')
+        return pd.util.hash_pandas_object(
+            pd.DataFrame({'text': text, 'rating': rating}), index=False)
+
+    def save_seen_ids(self, df):
+        seen = pd.DataFrame({
+            'review_id': df['review_id'].astype(str),
+            'content_hash': self.content_hash(df).astype(str)
+        })
+        header = not os.path.exists(self.seen_ids_path)
+        seen.to_csv(self.seen_ids_path, mode='a', header=header, index=False)
+
+    def load_seen_ids(self):
+        """
+        review_id -> content hash of processed rows (latest entry wins).
+        Falls back to hashing the existing output when there is no sidecar.
+        """
+        if os.path.exists(self.seen_ids_path):
+            seen = pd.read_csv(self.seen_ids_path, dtype=str)
+        else:
+            existing = pd.read_csv(
+                self.output_path,
+                usecols=['review_id', 'review_text', 'rating'])
+            seen = pd.DataFrame({
+                'review_id': existing['review_id'].astype(str),
+                'content_hash': self.content_hash(existing).astype(str)
+            })
+        seen = seen.drop_duplicates('review_id', keep='last')
+        return seen.set_index('review_id')['content_hash']
+
+    def find_delta(self):
+        """
+        Compare raw rows in self.df with the rows processed by earlier runs.
+        Returns (new_mask, updated_mask): rows with an unseen review_id, and
+        rows whose review_id was seen but whose text or rating changed.
+        """
+        seen = self.load_seen_ids()
+        review_ids = self.df['review_id'].astype(str)
+        previous = review_ids.map(seen)
+        new_mask = previous.isna()
+        updated_mask = ~new_mask & (
+            self.content_hash(self.df).astype(str) != previous)
+        return new_mask, updated_mask
+
+    @instrumented('incremental')
+    def process_incremental(self):
+        """
+        Delta variant of process():
+        1. Compares the raw rows with the seen-ids sidecar of earlier runs
+        2. Keeps only raw rows that are new or changed since then
+        3. Runs the stages on that delta and merges it into the sorted output
+        Stats report the new / skipped / updated row counts; stage counters
+        refer to the delta only.
+        """
+        self.migrate_seen_ids()
+        if not os.path.exists(self.output_path):
+            print("No existing processed output, running a full pass...")
+            raw = load_frame(self.input_path,
+                             columns=['review_id', 'review_text', 'rating'])
+            success = self.process()
+            if success and not os.path.exists(self.output_path):
+                # The CSV is the merge base of later incremental runs
+                self.df.to_csv(self.output_path, index=False)
+            if success:
+                self.save_seen_ids(
+                    raw.drop_duplicates('review_id', keep='last'))
+            self.stats.update({
+                'incremental_new': self.stats.get('original_count', 0),
+                'incremental_skipped': 0,
+                'incremental_updated': 0
+            })
+            return success
+
+        with self.time_stage('load_data'):
+            if not self.load_data():
+                return False
+        total_raw = len(self.df)
+
+        with self.time_stage('find_delta'):
+            # The raw file may hold the same review more than once; latest wins
+            self.df = self.df.drop_duplicates('review_id', keep='last')
+            new_mask, updated_mask = self.find_delta()
+            updated_ids = set(self.df.loc[updated_mask, 'review_id'])
+            self.df = self.df[new_mask | updated_mask]
+
+        print(f"\nNew: {int(new_mask.sum())} | Updated: {len(updated_ids)} | "
+              f"Skipped: {total_raw - len(self.df)}")
+        self.stats = {
+            'original_count': len(self.df),
+            'incremental_new': int(new_mask.sum()),
+            'incremental_updated': len(updated_ids),
+            'incremental_skipped': total_raw - len(self.df)
+        }
+
+        if self.df.empty:
+            print("Processed output is already up to date")
+            return True
+
+        delta = self.df[['review_id', 'review_text', 'rating']].copy()
+        with self.time_stage('check_missing_data'):
+            self.check_missing_data()
+        self.run_stages()
+
+        output_dir = os.path.dirname(self.output_path) or '.'
+        with tempfile.TemporaryDirectory(dir=output_dir) as run_dir:
+            header = list(pd.read_csv(self.output_path, nrows=0).columns)
+            runs = [self.output_path]
+            if updated_ids:
+                # Rewrite the existing output without the superseded rows,
+                # one chunk at a time so the output is never fully loaded
+                runs[0] = os.path.join(run_dir, 'existing.csv')
+                with self.time_stage('drop_updated'):
+                    drop_review_ids(self.output_path, runs[0], updated_ids)
+
+            delta_path = os.path.join(run_dir, 'delta.csv')
+            self.df.reindex(columns=header).to_csv(delta_path, index=False)
+            runs.append(delta_path)
+
+            print("\nMerging delta into processed output...")
+            with self.time_stage('merge_runs'):
+                self.stats['final_count'] = merge_sorted_runs(
+                    runs, self.output_path)
+                if writes_parquet():
+                    export_csv(self.output_path)
+        self.save_seen_ids(delta)
+
+        print(f"Final dataset: {self.stats['final_count']} reviews")
+        print(f"Data saved to: {self.output_path}")
+        if PREPROCESSING_CONFIG['dashboard'] != 'skip':
+            # The delta alone would give a partial picture
+            with self.time_stage('generate_dashboard'):
+                self.aggregates = aggregate_file(self.output_path)
+                self.generate_dashboard()
+        return True
+
+
+def process_shard(df):
+    """
+    Process-pool worker: run the preprocessing stages on one shard.
+    Returns (processed_df, stats, aggregates, stage_metrics).
+    """
+    preprocessor = ReviewPreprocessor()
+    preprocessor.verbose = False
+    preprocessor.df = df
+    preprocessor.run_stages()
+    return (preprocessor.df, preprocessor.stats, preprocessor.aggregates,
+            preprocessor.stage_metrics)
+
+
+def collect_aggregates(df):
+    """
+    Small summaries the dashboard is drawn from: row count, missing values
+    per column, rating counts and monthly review counts.
+    """
+    monthly = df.groupby(['review_year', 'review_month']).size() \
+        if {'review_year', 'review_month'} <= set(df.columns) \
+        else pd.Series(dtype='int64')
+    return {
+        'rows': len(df),
+        'missing': df.isna().sum(),
+        'ratings': df['rating'].value_counts(),
+        'monthly': monthly
+    }
+
+
+def merge_aggregates(left, right):
+    """Combine the aggregates of two chunks/shards (either may be None)."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return {
+        'rows': left['rows'] + right['rows'],
+        'missing': left['missing'].add(right['missing'], fill_value=0),
+        'ratings': left['ratings'].add(right['ratings'], fill_value=0),
+        'monthly': left['monthly'].add(right['monthly'], fill_value=0)
+    }
+
+
+def merge_stage_metrics(left, right):
+    """
+    Combine per-stage metrics of chunks/shards: times, calls and row counts
+    are summed, memory figures keep the maximum.
+    """
+    merged = {name: dict(metrics) for name, metrics in left.items()}
+    for name, metrics in right.items():
+        if name not in merged:
+            merged[name] = dict(metrics)
+            continue
+        for key, value in metrics.items():
+            current = merged[name].get(key)
+            if value is None or current is None:
+                merged[name][key] = value if current is None else current
+            elif key.endswith('_mb'):
+                merged[name][key] = max(current, value)
+            else:
+                merged[name][key] = current + value
+    return merged
+
+
+def aggregate_file(path, chunksize=None):
+    """Aggregates of an already processed CSV, read in chunks."""
+    aggregates = None
+    for chunk in pd.read_csv(
+            path, chunksize=chunksize or PREPROCESSING_CONFIG['chunksize']):
+        aggregates = merge_aggregates(aggregates, collect_aggregates(chunk))
+    return aggregates
+
+
+def render_dashboard(aggregates, output_dir='.'):
+    """
+    Draw the data quality dashboard from pre-aggregated counts.
+    Runs fine in a separate process; plot cost does not grow with row count.
+    """
+    plt.switch_backend('Agg')
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Missing values per column (% of rows)
+    plt.figure(figsize=(10, 6))
+    rows = max(aggregates['rows'], 1)
+    missing_pct = aggregates['missing'].sort_index() / rows * 100
+    missing_pct.plot(kind='bar', color='salmon')
+    plt.ylabel("% missing")
+    plt.title("Missing Values per Column")
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, "missing_values.png"))
+    plt.close()
+
+    # Rating distribution
+    plt.figure(figsize=(6, 4))
+    aggregates['ratings'].sort_index().plot(kind='bar', color='skyblue')
+    plt.title("Rating Distribution")
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, "rating_distribution.png"))
+    plt.close()
+
+    # Monthly review counts
+    plt.figure(figsize=(8, 4))
+    monthly_counts = aggregates['monthly'].sort_index().reset_index(
+        name='count')
+    monthly_counts['month_year'] = monthly_counts['review_year'].astype(
+        int).astype(str) + "-" + monthly_counts['review_month'].astype(
+        int).astype(str)
+    sns.barplot(x='month_year', y='count',
+                data=monthly_counts, color='lightgreen')
+    plt.xticks(rotation=45)
+    plt.title("Monthly Review Counts")
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, "monthly_review_counts.png"))
+    plt.close()
+
+
+def drop_review_ids(input_path, output_path, review_ids, chunksize=None):
+    """
+    Copy the CSV at input_path to output_path without the rows whose
+    review_id is in review_ids, reading `chunksize` rows at a time. Rows
+    keep their order, so a sorted input stays a sorted run.
+    """
+    chunksize = chunksize or PREPROCESSING_CONFIG['chunksize']
+    review_ids = {str(review_id) for review_id in review_ids}
+    header = True
+    for chunk in pd.read_csv(input_path, chunksize=chunksize, dtype=str,
+                             keep_default_na=False):
+        chunk = chunk[~chunk['review_id'].isin(review_ids)]
+        chunk.to_csv(output_path, mode='w' if header else 'a',
+                     header=header, index=False)
+        header = False
+    if header:
+        # Empty input: keep the header so the run is still a valid CSV
+        pd.read_csv(input_path, nrows=0).to_csv(output_path, index=False)
+
+
+def merge_sorted_runs(run_paths, output_path):
+    """
+    K-way merge of CSV runs, each already sorted by bank_code ascending and
+    review_date descending, into output_path. Streams rows, so memory use
+    stays at one row per run. output_path may itself be one of the runs.
+    Returns the number of rows written.
+    """
+    tmp_path = f"{output_path}.tmp"
+    files = [open(path, newline='') for path in run_paths]
+    try:
+        readers = [csv.reader(f) for f in files]
+        header = [next(r, None) for r in readers][0]
+        bank_idx = header.index('bank_code')
+        date_idx = header.index('review_date')
+
+        def sort_key(row):
+            # Newest first within a bank
+            return (row[bank_idx],
+                    -datetime.fromisoformat(row[date_idx]).timestamp())
+
+        count = 0
+        with open(tmp_path, 'w', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow(header)
+            for row in heapq.merge(*readers, key=sort_key):
+                writer.writerow(row)
+                count += 1
+    finally:
+        for f in files:
+            f.close()
+
+    os.replace(tmp_path, output_path)
+    return count
+
 
 def main():
     preprocessor = ReviewPreprocessor()
-    success = preprocessor.process()
+    if PREPROCESSING_CONFIG['mode'] == 'chunked':
+        success = preprocessor.process_chunked()
+    elif PREPROCESSING_CONFIG['mode'] == 'parallel':
+        success = preprocessor.process_parallel()
+    elif PREPROCESSING_CONFIG['mode'] == 'incremental':
+        success = preprocessor.process_incremental()
+    else:
+        success = preprocessor.process()
     if success:
         print("\n✓ Preprocessing completed successfully!")
         return preprocessor.df
@@ -0,0 +1,236 @@
+"""
+Fetch backends for PlayStoreScraper.
+
+A backend exposes two calls, mirroring google_play_scraper:
+- app_info(app_id, lang, country) -> dict
+- reviews(app_id, lang, country, count, continuation_token) -> (list, token)
+
+Available backends:
+- 'live':   the real Google Play Store (google_play_scraper)
+- 'record': live requests, every response also saved to a recording file
+- 'replay': serves a recording, no network access needed
+- 'fake':   a local FakePlayStoreServer (see fake_play_store.py)
+"""
+
+import json
+import os
+import threading
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from importlib import metadata
+
+from google_play_scraper import app, reviews as public_reviews, Sort
+
+# Attributes of google_play_scraper's continuation token
+TOKEN_FIELDS = ('token', 'lang', 'country', 'sort', 'count',
+                'filter_score_with', 'filter_device_with')
+
+# The live backend uses private parts of google_play_scraper (pinned in
+# requirements.txt). If a release drops them, fall back to the public
+# reviews() call and a token class with the same attributes.
+try:
+    from google_play_scraper.constants.element import ElementSpecs
+    from google_play_scraper.constants.request import Formats
+    from google_play_scraper.features.reviews import (
+        MAX_COUNT_EACH_FETCH, _ContinuationToken as ContinuationToken,
+        _fetch_review_items)
+except ImportError as e:
+    print(f"WARNING: google_play_scraper "
+          f"{metadata.version('google_play_scraper')} lacks the private "
+          f"review page API this scraper was written against ({e}). "
+          "Install the version pinned in requirements.txt; until then the "
+          "public reviews() call is used, which reports a failed request as "
+          "an empty last page instead of an error to retry.")
+    MAX_COUNT_EACH_FETCH = 4500
+    _fetch_review_items = None
+
+    class ContinuationToken:
+        """Stand-in for google_play_scraper's _ContinuationToken"""
+        __slots__ = TOKEN_FIELDS
+
+        def __init__(self, *values):
+            for field, value in zip(TOKEN_FIELDS, values):
+                setattr(self, field, value)
+
+# Review fields returned as datetime objects by google_play_scraper
+DATETIME_FIELDS = ('at', 'repliedAt')
+
+
+def make_token(token, count, lang='en', country='us'):
+    """Build a continuation token in the format google_play_scraper uses."""
+    return ContinuationToken(
+        token, lang, country, Sort.NEWEST.value, count, None, None)
+
+
+def encode_review(review):
+    """Make a review dict JSON serializable."""
+    return {k: (v.isoformat() if isinstance(v, datetime) else v)
+            for k, v in review.items()}
+
+
+def decode_review(review):
+    """Inverse of encode_review: restore the datetime fields."""
+    review = dict(review)
+    for field in DATETIME_FIELDS:
+        if review.get(field):
+            review[field] = datetime.fromisoformat(review[field])
+    return review
+
+
+class PlayStoreBackend:
+    """Live Google Play Store backend"""
+
+    def app_info(self, app_id, lang, country):
+        return app(app_id, lang=lang, country=country)
+
+    def reviews(self, app_id, lang, country, count, continuation_token=None):
+        """
+        One page of the newest reviews (all ratings). Uses the library's
+        page fetch directly: google_play_scraper.reviews swallows request
+        errors and returns an empty page without a token, which would look
+        like the end of the reviews instead of a failure to retry.
+        Without that private API the public call is used anyway.
+        """
+        count = min(count, MAX_COUNT_EACH_FETCH)
+        if _fetch_review_items is None:
+            if continuation_token is not None:
+                # The public call takes the page size from the token, so
+                # carry the requested count over instead of the first one
+                continuation_token = ContinuationToken(*(
+                    count if field == 'count'
+                    else getattr(continuation_token, field)
+                    for field in TOKEN_FIELDS))
+            return public_reviews(app_id, lang=lang, country=country,
+                                  sort=Sort.NEWEST, count=count,
+                                  continuation_token=continuation_token)
+        token = None
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            token = continuation_token.token
+        items, next_token = _fetch_review_items(
+            Formats.Reviews.build(lang=lang, country=country),
+            app_id,
+            Sort.NEWEST.value,      # Get the most recent reviews
+            count,
+            None,                   # Fetch all ratings (1-5 stars)
+            None,
+            token)
+        # The last page carries a list instead of a token
+        if isinstance(next_token, list):
+            next_token = None
+        page = [{k: spec.extract_content(item)
+                 for k, spec in ElementSpecs.Review.items()}
+                for item in items]
+        return page, make_token(next_token, count, lang, country)
+
+
+class RecordingBackend:
+    """
+    Wraps another backend and appends every response to a JSONL recording
+    that ReplayBackend can serve later.
+    """
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def _record(self, entry):
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry, default=str) + '\n')
+
+    def app_info(self, app_id, lang, country):
+        result = self.inner.app_info(app_id, lang, country)
+        self._record({'call': 'app', 'app_id': app_id, 'result': result})
+        return result
+
+    def reviews(self, app_id, lang, country, count, continuation_token=None):
+        result, token = self.inner.reviews(
+            app_id, lang, country, count, continuation_token)
+        self._record({
+            'call': 'reviews',
+            'app_id': app_id,
+            'token': continuation_token.token if continuation_token else None,
+            'next_token': token.token if token else None,
+            'result': [encode_review(r) for r in result]
+        })
+        return result, token
+
+
+class ReplayBackend:
+    """
+    Serves responses captured by RecordingBackend.
+    Requests that were never recorded raise a KeyError.
+    """
+
+    def __init__(self, path):
+        self.apps = {}
+        self.pages = {}
+        with open(path, 'r') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['call'] == 'app':
+                    self.apps[entry['app_id']] = entry['result']
+                else:
+                    key = (entry['app_id'], entry['token'])
+                    self.pages[key] = (entry['result'], entry['next_token'])
+
+    def app_info(self, app_id, lang, country):
+        if app_id not in self.apps:
+            raise KeyError(f"No recorded app info for {app_id}")
+        return self.apps[app_id]
+
+    def reviews(self, app_id, lang, country, count, continuation_token=None):
+        key = (app_id,
+               continuation_token.token if continuation_token else None)
+        if key not in self.pages:
+            raise KeyError(f"No recorded review page for {key}")
+        result, next_token = self.pages[key]
+        return ([decode_review(r) for r in result],
+                make_token(next_token, count, lang, country))
+
+
+class FakePlayStoreBackend:
+    """HTTP client for a local FakePlayStoreServer"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _get(self, path, **params):
+        query = urllib.parse.urlencode(
+            {k: v for k, v in params.items() if v is not None})
+        app_path = urllib.parse.quote(path)
+        url = f"{self.base_url}{app_path}?{query}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def app_info(self, app_id, lang, country):
+        return self._get(f"/app/{app_id}")
+
+    def reviews(self, app_id, lang, country, count, continuation_token=None):
+        token = continuation_token.token if continuation_token else None
+        data = self._get(f"/reviews/{app_id}", count=count, token=token)
+        return ([decode_review(r) for r in data['reviews']],
+                make_token(data['next_token'], count, lang, country))
+
+
+def make_backend(name='live', recording_path=None, fake_url=None):
+    """
+    Build a backend from its config name ('live', 'record', 'replay', 'fake').
+    """
+    if name == 'live':
+        return PlayStoreBackend()
+    if name == 'record':
+        return RecordingBackend(PlayStoreBackend(), recording_path)
+    if name == 'replay':
+        return ReplayBackend(recording_path)
+    if name == 'fake':
+        return FakePlayStoreBackend(fake_url)
+    raise ValueError(
+        f"Unknown scraper backend '{name}'. "
+        "Expected one of ('live', 'record', 'replay', 'fake')")
@@ -0,0 +1,93 @@
+"""
+Scraper throughput benchmark against the local fake Play Store.
+
+Runs the sequential and the concurrent review path of PlayStoreScraper over
+a set of synthetic apps and reports reviews/second for each. No network
+access is needed and nothing is written to DATA_PATHS.
+
+Usage (from the project root):
+    python -m src.scraper.benchmark --apps 20 --reviews 400 --latency 0.05
+"""
+
+import argparse
+import time
+
+from .backends import FakePlayStoreBackend
+from .fake_play_store import FakePlayStoreServer
+from .rate_limiter import RateLimiter
+from .scraper import PlayStoreScraper
+
+
+def build_scraper(url, n_apps, reviews_per_app, max_workers, global_rate,
+                  per_app_rate):
+    """A scraper pointed at the fake store, tracking n_apps synthetic apps."""
+    scraper = PlayStoreScraper(backend=FakePlayStoreBackend(url))
+    scraper.app_ids = {f"APP{i:03d}": f"com.fake.bank{i:03d}"
+                       for i in range(n_apps)}
+    scraper.bank_names = {code: f"Fake Bank {code}"
+                          for code in scraper.app_ids}
+    scraper.reviews_per_bank = reviews_per_app
+    scraper.max_workers = max_workers
+    scraper.mode = 'full'
+    scraper.policy.rate_limiter = RateLimiter(global_rate, per_app_rate)
+    return scraper
+
+
+def run_path(scraper, concurrent):
+    """Time the review phase for one path; returns (reviews, seconds)."""
+    start = time.perf_counter()
+    results = scraper.run_for_all_banks(
+        scraper.collect_reviews, "Benchmark", concurrent)
+    elapsed = time.perf_counter() - start
+    return sum(len(r) for r in results), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scraper throughput benchmark")
+    parser.add_argument('--apps', type=int, default=20)
+    parser.add_argument('--reviews', type=int, default=400,
+                        help="reviews scraped per app")
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="simulated seconds per request")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--global-rate', type=float, default=0,
+                        help="requests/second across all apps (0 = unlimited)")
+    parser.add_argument('--per-app-rate', type=float, default=0,
+                        help="requests/second per app (0 = unlimited)")
+    args = parser.parse_args()
+
+    results = {}
+    stats = {}
+    with FakePlayStoreServer(reviews_per_app=args.reviews,
+                             latency=args.latency,
+                             error_rate=args.error_rate) as server:
+        for name, concurrent in (('sequential', False), ('concurrent', True)):
+            scraper = build_scraper(server.url, args.apps, args.reviews,
+                                    args.workers, args.global_rate,
+                                    args.per_app_rate)
+            results[name] = run_path(scraper, concurrent)
+            stats[name] = scraper.policy.stats.summary()
+
+    print("\n" + "=" * 60)
+    print("Scraper Benchmark")
+    print("=" * 60)
+    print(f"Apps: {args.apps} | Reviews/app: {args.reviews} | "
+          f"Latency: {args.latency}s | Error rate: {args.error_rate}")
+    for name, (n_reviews, elapsed) in results.items():
+        rate = n_reviews / elapsed if elapsed else float('inf')
+        print(f"  {name:<11} {n_reviews:>7} reviews in {elapsed:7.2f}s "
+              f"-> {rate:9.1f} reviews/s "
+              f"({int(stats[name]['retries'].sum())} retries, "
+              f"{int(stats[name]['failures'].sum())} failed requests)")
+
+    if results['concurrent'][1] > 0:
+        speedup = results['sequential'][1] / results['concurrent'][1]
+        print(f"\nConcurrent speedup: {speedup:.1f}x")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
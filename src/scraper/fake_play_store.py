@@ -0,0 +1,177 @@
+"""
+Local stand-in for the Google Play Store.
+
+Serves paginated synthetic reviews over HTTP so the scraper can be
+benchmarked and tested without network access:
+
+    GET /app/<app_id>                      -> app info
+    GET /reviews/<app_id>?count=N&token=T  -> {"reviews": [...],
+                                               "next_token": ...}
+
+Latency and error rate are configurable; failed requests return HTTP 503.
+Reviews are generated deterministically from the app id, newest first.
+
+Run standalone:
+    python -m src.scraper.fake_play_store --port 8765 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_TEXTS = [
+    "The app is very good and easy to use",
+    "Transfer failed many times, please fix",
+    "Login with OTP is too slow",
+    "Best mobile banking app in Ethiopia",
+    "App crashes after the last update",
+    "Customer support never replies",
+]
+
+
+def synthetic_review(app_id, index, newest_at):
+    """The index-th newest review of an app."""
+    rng = random.Random(f"{app_id}-{index}")
+    return {
+        'reviewId': f"{app_id}-{index:08d}",
+        'userName': f"user{rng.randint(1, 100000)}",
+        'content': rng.choice(SAMPLE_TEXTS),
+        'score': rng.randint(1, 5),
+        'thumbsUpCount': rng.randint(0, 20),
+        'reviewCreatedVersion': '1.0.0',
+        'at': (newest_at - timedelta(minutes=index)).isoformat(),
+        'replyContent': None,
+        'repliedAt': None,
+    }
+
+
+class FakePlayStoreServer:
+    """
+    Threaded HTTP server serving synthetic apps and review pages.
+    Use as a context manager to run it in a background thread.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, reviews_per_app=1000,
+                 latency=0.0, error_rate=0.0, seed=42):
+        self.reviews_per_app = reviews_per_app
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.newest_at = datetime(2025, 6, 1)
+        self.requests_served = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self):
+        with self.rng_lock:
+            self.requests_served += 1
+            return self.rng.random() < self.error_rate
+
+    def app_info(self, app_id):
+        return {
+            'title': f"Fake app {app_id}",
+            'score': 4.0,
+            'ratings': self.reviews_per_app * 3,
+            'reviews': self.reviews_per_app,
+            'installs': '100,000+'
+        }
+
+    def review_page(self, app_id, count, token):
+        start = int(token) if token else 0
+        end = min(start + count, self.reviews_per_app)
+        page = [synthetic_review(app_id, i, self.newest_at)
+                for i in range(start, end)]
+        next_token = str(end) if end < self.reviews_per_app else None
+        return {'reviews': page, 'next_token': next_token}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_fail():
+                    self.send_error(503, "Synthetic failure")
+                    return
+
+                parsed = urllib.parse.urlparse(self.path)
+                params = urllib.parse.parse_qs(parsed.query)
+                path = urllib.parse.unquote(parsed.path)
+                parts = path.strip('/').split('/', 1)
+                if len(parts) != 2:
+                    self.send_error(404)
+                    return
+
+                kind, app_id = parts
+                if kind == 'app':
+                    body = server.app_info(app_id)
+                elif kind == 'reviews':
+                    count = int(params.get('count', ['100'])[0])
+                    token = params.get('token', [None])[0]
+                    body = server.review_page(app_id, count, token)
+                else:
+                    self.send_error(404)
+                    return
+
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Keep benchmark output readable
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Play Store")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--reviews-per-app', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakePlayStoreServer(args.host, args.port, args.reviews_per_app,
+                                 args.latency, args.error_rate)
+    print(f"Fake Play Store listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
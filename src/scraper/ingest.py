@@ -0,0 +1,159 @@
+"""
+Columnar, deduplicating review ingestion.
+
+- ReviewBatch: appends scraped review fields straight into per-column
+  buffers (typed int arrays for numeric fields) instead of one dict per review
+- SeenIndex: set of already ingested review ids, persisted on disk
+  (one id per line, append-only), so duplicates are dropped at ingest time
+"""
+
+import os
+import threading
+from array import array
+from datetime import datetime
+
+import pandas as pd
+
+from Script.storage import frame_exists, load_frame
+
+# Output column -> (raw review field, default)
+REVIEW_FIELDS = {
+    'review_id': ('reviewId', ''),
+    'review_text': ('content', ''),
+    'rating': ('score', 0),
+    'review_date': ('at', None),
+    'user_name': ('userName', 'Anonymous'),
+    'thumbs_up': ('thumbsUpCount', 0),
+    'reply_content': ('replyContent', None),
+    'app_id': ('reviewCreatedVersion', 'N/A'),
+}
+
+COLUMNS = ['review_id', 'review_text', 'rating', 'review_date', 'user_name',
+           'thumbs_up', 'reply_content', 'bank_code', 'bank_name', 'app_id',
+           'source']
+
+INT_COLUMNS = ('rating', 'thumbs_up')
+
+
+class ReviewBatch:
+    """Column buffers for processed reviews"""
+
+    def __init__(self):
+        self.columns = {c: array('q') if c in INT_COLUMNS else []
+                        for c in COLUMNS}
+
+    def __len__(self):
+        return len(self.columns['review_id'])
+
+    def append_raw(self, review, bank_code, bank_name, source='Google Play'):
+        """Append one raw google_play_scraper review."""
+        for column, (field, default) in REVIEW_FIELDS.items():
+            value = review.get(field, default)
+            if column in INT_COLUMNS:
+                value = int(value or 0)
+            elif column == 'review_date' and value is None:
+                value = datetime.now()
+            self.columns[column].append(value)
+        self.columns['bank_code'].append(bank_code)
+        self.columns['bank_name'].append(bank_name)
+        self.columns['source'].append(source)
+
+    def extend(self, other):
+        for column in COLUMNS:
+            self.columns[column].extend(other.columns[column])
+
+    @property
+    def review_ids(self):
+        return self.columns['review_id']
+
+    def to_frame(self):
+        return pd.DataFrame({
+            c: (pd.Series(self.columns[c], dtype='int64')
+                if c in INT_COLUMNS else self.columns[c])
+            for c in COLUMNS
+        })
+
+    def rows(self):
+        """Iterate the batch as row dicts (for the JSONL shard writer)."""
+        for i in range(len(self)):
+            yield {c: self.columns[c][i] for c in COLUMNS}
+
+
+class SeenIndex:
+    """
+    Thread-safe set of ingested review ids.
+    With a path, ids are loaded from and persisted to an append-only file
+    (seeded from bootstrap_csv the first time); without one it only
+    deduplicates within the current run.
+
+    Claims are staged per owner (the app being scraped) and only join the
+    index on commit, once their reviews are saved; release drops the claims
+    of a run whose reviews never made it to disk.
+    """
+
+    def __init__(self, path=None, bootstrap_csv=None):
+        self.path = path
+        self.ids = set()
+        self.staged = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                self.ids = {line.rstrip('\n') for line in f if line.strip()}
+        elif path and bootstrap_csv and frame_exists(bootstrap_csv):
+            # First run with an index: seed it from reviews already on disk
+            existing = load_frame(bootstrap_csv, columns=['review_id'])
+            self.persist(existing['review_id'].dropna().astype(str).tolist())
+            self.ids = set(existing['review_id'].dropna().astype(str))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, review_id):
+        return review_id in self.ids
+
+    def claim(self, review_id, owner=None):
+        """
+        Stage review_id as seen by owner. Returns False if it was already
+        seen or is staged by a run still in flight.
+        Reviews without an id are never treated as duplicates.
+        """
+        if not review_id:
+            return True
+        with self.lock:
+            if review_id in self.ids or any(
+                    review_id in claims for claims in self.staged.values()):
+                return False
+            self.staged.setdefault(owner, set()).add(review_id)
+            return True
+
+    def commit(self, owners=None):
+        """
+        Move the staged claims of owners (default: all) into the index.
+        Call only once their reviews are durably saved.
+        """
+        with self.lock:
+            if owners is None:
+                owners = list(self.staged)
+            for owner in owners:
+                self.ids |= self.staged.pop(owner, set())
+
+    def release(self, owner=None):
+        """Drop the staged claims of owner, whose reviews were not saved."""
+        with self.lock:
+            self.staged.pop(owner, None)
+
+    def persist(self, review_ids):
+        """
+        Append review ids to the on-disk index.
+        Call only once the reviews themselves are durably saved, so a crash
+        never marks unsaved reviews as seen.
+        """
+        if not self.path:
+            return
+        review_ids = [r for r in review_ids if r]
+        if not review_ids:
+            return
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write('\n'.join(review_ids) + '\n')
@@ -0,0 +1,73 @@
+"""
+Request rate limiting for the Play Store scraper.
+
+Replaces the fixed `time.sleep` between banks with token buckets:
+- one global bucket shared by every worker thread
+- one bucket per app, so a single app cannot use the whole budget
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Take `tokens` from the bucket and return how many seconds the caller
+        has to wait before the reservation is honoured.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Combined global + per-app request limiter.
+    A rate of None or 0 disables the corresponding limit.
+    """
+
+    def __init__(self, global_rate=None, per_app_rate=None, burst=1):
+        self.global_bucket = TokenBucket(global_rate or 0, burst)
+        self.per_app_rate = per_app_rate or 0
+        self.burst = burst
+        self.app_buckets = {}
+        self.lock = threading.Lock()
+
+    def _app_bucket(self, app_id):
+        with self.lock:
+            if app_id not in self.app_buckets:
+                self.app_buckets[app_id] = TokenBucket(
+                    self.per_app_rate, self.burst)
+            return self.app_buckets[app_id]
+
+    def acquire(self, app_id=None):
+        """
+        Block until one request for `app_id` is allowed.
+        Returns the number of seconds spent waiting.
+        """
+        delay = self.global_bucket.reserve()
+        if app_id is not None:
+            delay = max(delay, self._app_bucket(app_id).reserve())
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,198 @@
+"""
+Shared request policy for the Play Store scraper.
+
+Every request of the scraper goes through RequestPolicy.call, which applies:
+- the global / per-app rate limiter
+- retries with jittered exponential backoff
+- a retry budget shared by all apps, so retries can't snowball under throttling
+- a per-app circuit breaker that parks a failing app while others continue
+- per-app latency and outcome counters (RequestStats)
+"""
+
+import random
+import threading
+import time
+
+import pandas as pd
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the app's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-app circuit breaker.
+    After `failure_threshold` consecutive failures the app is parked for
+    `reset_timeout` seconds; then one trial request is let through
+    (half-open) and its outcome closes or re-opens the circuit. Other
+    requests for the app are rejected while the trial is in flight.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = {}
+        self.opened_at = {}
+        # Apps whose half-open trial request is in flight
+        self.probing = set()
+        self.lock = threading.Lock()
+
+    def allow(self, app_id):
+        with self.lock:
+            opened_at = self.opened_at.get(app_id)
+            if opened_at is None:
+                return True
+            if (app_id not in self.probing
+                    and time.monotonic() - opened_at >= self.reset_timeout):
+                # Half-open: let one trial request through
+                self.probing.add(app_id)
+                return True
+            return False
+
+    def record_success(self, app_id):
+        with self.lock:
+            self.failures[app_id] = 0
+            if app_id in self.probing:
+                # The trial succeeded: close the circuit
+                self.probing.discard(app_id)
+                del self.opened_at[app_id]
+
+    def record_failure(self, app_id):
+        """Returns True if this failure opened the circuit."""
+        with self.lock:
+            self.failures[app_id] = self.failures.get(app_id, 0) + 1
+            if app_id in self.probing:
+                # The trial failed: park the app for another reset_timeout
+                self.probing.discard(app_id)
+                self.opened_at[app_id] = time.monotonic()
+                return True
+            if (self.failures[app_id] >= self.failure_threshold
+                    and app_id not in self.opened_at):
+                self.opened_at[app_id] = time.monotonic()
+                return True
+            return False
+
+    def is_open(self, app_id):
+        with self.lock:
+            return app_id in self.opened_at
+
+
+class RetryBudget:
+    """
+    Retries allowed across all apps: `min_retries` plus `ratio` retries
+    per request made so far.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def try_spend(self):
+        """Take one retry from the budget; False when it is exhausted."""
+        with self.lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+
+class RequestStats:
+    """Thread-safe per-app request counters"""
+
+    FIELDS = ('requests', 'successes', 'failures', 'retries',
+              'rejected', 'circuit_opens', 'total_latency', 'max_latency')
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def _entry(self, app_id):
+        if app_id not in self.counters:
+            self.counters[app_id] = dict.fromkeys(self.FIELDS, 0)
+        return self.counters[app_id]
+
+    def record(self, app_id, outcome, latency=None):
+        with self.lock:
+            entry = self._entry(app_id)
+            entry[outcome] += 1
+            if latency is not None:
+                entry['requests'] += 1
+                entry['total_latency'] += latency
+                entry['max_latency'] = max(entry['max_latency'], latency)
+
+    def summary(self):
+        """One row per app with counters and mean latency."""
+        with self.lock:
+            df = pd.DataFrame.from_dict(self.counters, orient='index')
+        if df.empty:
+            return pd.DataFrame(columns=('app_id',) + self.FIELDS)
+        df['mean_latency'] = df['total_latency'] / df['requests'].clip(lower=1)
+        return df.rename_axis('app_id').reset_index()
+
+
+class RequestPolicy:
+    """Rate limiting, retries, retry budget and circuit breaking"""
+
+    def __init__(self, rate_limiter, max_retries=3, backoff_base=0.5,
+                 backoff_max=30, retry_budget_ratio=0.2,
+                 breaker_threshold=5, breaker_reset=60):
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = RetryBudget(retry_budget_ratio)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.stats = RequestStats()
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def call(self, app_id, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) for app_id under the policy.
+        Raises CircuitOpenError if the app is parked, or the last error
+        once retries (or the retry budget) are used up.
+        """
+        for attempt in range(self.max_retries):
+            if not self.breaker.allow(app_id):
+                self.stats.record(app_id, 'rejected')
+                raise CircuitOpenError(f"Circuit open for {app_id}")
+
+            self.rate_limiter.acquire(app_id)
+            self.budget.record_request()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.stats.record(app_id, 'failures',
+                                  time.perf_counter() - start)
+                if self.breaker.record_failure(app_id):
+                    self.stats.record(app_id, 'circuit_opens')
+                    print(f"Circuit opened for {app_id}: parking it for "
+                          f"{self.breaker.reset_timeout}s")
+                    raise
+
+                last_attempt = attempt == self.max_retries - 1
+                if last_attempt or not self.budget.try_spend():
+                    raise
+
+                delay = self.backoff(attempt)
+                print(f"Attempt {attempt + 1} for {app_id} failed: {str(e)}. "
+                      f"Retrying in {delay:.1f}s...")
+                self.stats.record(app_id, 'retries')
+                time.sleep(delay)
+            else:
+                self.stats.record(app_id, 'successes',
+                                  time.perf_counter() - start)
+                self.breaker.record_success(app_id)
+                return result
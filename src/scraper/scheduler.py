@@ -0,0 +1,162 @@
+"""
+Long-running scraping daemon.
+
+Keeps a queue of apps, each with its own refresh cadence
+(SCHEDULER_CONFIG['intervals'], falling back to 'default_interval').
+When an app is due it is scraped in 'incremental' mode, so only reviews
+newer than the stored high-water mark are fetched. New reviews are appended
+to the raw CSV and handed to every registered batch handler as they arrive.
+
+All requests still go through the scraper's request policy, so the global
+rate budget holds however many apps are due at the same time. Intervals
+get a random jitter so apps drift apart instead of firing in lockstep.
+
+Usage (from the project root):
+    python -m src.scraper.scheduler
+"""
+
+import heapq
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Script.config import SCHEDULER_CONFIG
+
+from .scraper import PlayStoreScraper
+
+
+class ScrapeScheduler:
+    """Per-app cadence scheduler around a PlayStoreScraper"""
+
+    def __init__(self, scraper=None, intervals=None, default_interval=None,
+                 jitter=None, max_workers=None, on_batch=None):
+        self.scraper = scraper or PlayStoreScraper()
+        self.intervals = (SCHEDULER_CONFIG['intervals']
+                          if intervals is None else intervals)
+        self.default_interval = (default_interval
+                                 or SCHEDULER_CONFIG['default_interval'])
+        self.jitter = SCHEDULER_CONFIG['jitter'] if jitter is None else jitter
+        self.max_workers = max_workers or SCHEDULER_CONFIG['max_workers']
+        self.handlers = [on_batch] if on_batch else []
+
+        # Heap of (due_time, bank_code); apps being scraped are not in it
+        self.queue = []
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.runs = 0
+
+    def add_handler(self, handler):
+        """
+        Register handler(bank_code, df), called with every fresh batch.
+        """
+        self.handlers.append(handler)
+
+    def interval_for(self, bank_code):
+        """Refresh interval of an app with jitter applied."""
+        base = self.intervals.get(bank_code, self.default_interval)
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def schedule(self, bank_code, delay):
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic() + delay, bank_code))
+            self.condition.notify()
+
+    def run_app(self, bank_code):
+        """
+        Scrape one app incrementally, save and dispatch the new reviews,
+        then put the app back in the queue.
+        """
+        try:
+            app_id = self.scraper.app_ids[bank_code]
+            batch = self.scraper.collect_reviews(
+                bank_code, app_id, mode='incremental')
+            df = None
+            if len(batch):
+                df = self.scraper.save_reviews(batch, append=True)
+            # The high-water mark moves only once the batch is on disk
+            self.scraper.commit_state([app_id])
+            if df is not None:
+                for handler in self.handlers:
+                    try:
+                        handler(bank_code, df)
+                    except Exception as e:
+                        print(f"Batch handler failed for {bank_code}: "
+                              f"{str(e)}")
+        except Exception as e:
+            print(f"Scheduled scrape failed for {bank_code}: {str(e)}")
+            self.scraper.discard_state(self.scraper.app_ids.get(bank_code))
+        finally:
+            # Workers finish concurrently; count under the queue's lock
+            with self.condition:
+                self.runs += 1
+            if not self.stop_event.is_set():
+                self.schedule(bank_code, self.interval_for(bank_code))
+
+    def next_due(self):
+        """
+        Wait until the earliest app is due and pop it.
+        Returns None once the scheduler is stopped.
+        """
+        with self.condition:
+            while not self.stop_event.is_set():
+                if not self.queue:
+                    self.condition.wait()
+                    continue
+                due, bank_code = self.queue[0]
+                wait = due - time.monotonic()
+                if wait <= 0:
+                    heapq.heappop(self.queue)
+                    return bank_code
+                self.condition.wait(timeout=wait)
+        return None
+
+    def stop(self, *args):
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def run(self, max_runs=None):
+        """
+        Run until stop() is called (or SIGINT/SIGTERM), or until max_runs
+        app scrapes have been started.
+        """
+        # The daemon only appends, so dedup against the persistent index
+        self.scraper.open_seen_index(append_only=True)
+
+        # Spread the first round over the jitter window instead of bursting
+        for bank_code in self.scraper.app_ids:
+            self.schedule(bank_code, random.uniform(
+                0, self.jitter * self.intervals.get(
+                    bank_code, self.default_interval)))
+
+        print("=" * 60)
+        print(f"Scheduler started for {len(self.scraper.app_ids)} apps")
+        print("=" * 60)
+
+        started = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while max_runs is None or started < max_runs:
+                bank_code = self.next_due()
+                if bank_code is None:
+                    break
+                executor.submit(self.run_app, bank_code)
+                started += 1
+            self.stop()
+
+        print(f"\nScheduler stopped after {self.runs} scrapes")
+        self.scraper.print_request_stats()
+
+
+def main():
+    scheduler = ScrapeScheduler()
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
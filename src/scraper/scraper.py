@@ -1,21 +1,35 @@
+"""
+Google Play Store review scraper.
+
+Usage (from the project root):
+    python -m src.scraper.scraper
+"""
 
 
 from Script.config import APP_IDS, BANK_NAMES, SCRAPING_CONFIG, DATA_PATHS
+from Script.storage import save_frame
 from tqdm import tqdm
-import time
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
-from google_play_scraper import app, Sort, reviews_all, reviews
 import sys
 import os
 # Add parent directory to path to allow importing modules from there
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from .rate_limiter import RateLimiter  # noqa: E402
+from .state import ScrapeStateStore  # noqa: E402
+from .shard_writer import ShardWriter  # noqa: E402
+from .backends import make_backend  # noqa: E402
+from .request_policy import CircuitOpenError, RequestPolicy  # noqa: E402
+from .ingest import ReviewBatch, SeenIndex  # noqa: E402
+
+SCRAPE_MODES = ('full', 'incremental', 'backfill')
 
 
 class PlayStoreScraper:
     """Scraper class for Google Play Store reviews"""
 
-    def __init__(self):
+    def __init__(self, backend=None):
         # Load configuration variables from the config file
         self.app_ids = APP_IDS
         self.bank_names = BANK_NAMES
@@ -23,6 +37,44 @@ class PlayStoreScraper:
         self.lang = SCRAPING_CONFIG['lang']
         self.country = SCRAPING_CONFIG['country']
         self.max_retries = SCRAPING_CONFIG['max_retries']
+        self.page_size = SCRAPING_CONFIG['page_size']
+        self.concurrent = SCRAPING_CONFIG['concurrent']
+        self.max_workers = SCRAPING_CONFIG['max_workers']
+        self.mode = SCRAPING_CONFIG['mode']
+        self.stream = SCRAPING_CONFIG['stream']
+        self.shard_size = SCRAPING_CONFIG['shard_size']
+        self.dedup = SCRAPING_CONFIG['dedup']
+
+        # Review ids already ingested; in-memory until scrape_all_banks picks
+        # the persistent index for append-only outputs
+        self.seen_index = SeenIndex() if self.dedup else None
+        self.save_lock = threading.Lock()
+
+        # Where requests go: live Play Store, record/replay or a local fake
+        self.backend = backend or make_backend(
+            SCRAPING_CONFIG['backend'],
+            recording_path=DATA_PATHS['scrape_recording'],
+            fake_url=SCRAPING_CONFIG['fake_store_url'])
+
+        # Per-app high-water marks and backfill tokens for incremental runs.
+        # A run's state update waits in pending_state until its reviews are
+        # durably saved (see commit_state)
+        self.state_store = ScrapeStateStore(DATA_PATHS['scrape_state'])
+        self.pending_state = {}
+        self.state_lock = threading.Lock()
+
+        # Rate limiting, retries and circuit breaking for every request,
+        # shared by every worker thread in concurrent mode
+        self.policy = RequestPolicy(
+            RateLimiter(
+                global_rate=SCRAPING_CONFIG['global_rate_limit'],
+                per_app_rate=SCRAPING_CONFIG['per_app_rate_limit']),
+            max_retries=self.max_retries,
+            backoff_base=SCRAPING_CONFIG['backoff_base'],
+            backoff_max=SCRAPING_CONFIG['backoff_max'],
+            retry_budget_ratio=SCRAPING_CONFIG['retry_budget_ratio'],
+            breaker_threshold=SCRAPING_CONFIG['breaker_threshold'],
+            breaker_reset=SCRAPING_CONFIG['breaker_reset'])
 
     def get_app_info(self, app_id):
         """
@@ -30,7 +82,8 @@ class PlayStoreScraper:
         """
         try:
             # Fetch app details from Google Play Store
-            result = app(app_id, lang=self.lang, country=self.country)
+            result = self.policy.call(
+                app_id, self.backend.app_info, app_id, self.lang, self.country)
             return {
                 'app_id': app_id,
                 'title': result.get('title', 'N/A'),
@@ -43,68 +96,335 @@ class PlayStoreScraper:
             print(f"Error getting app info for {app_id}: {str(e)}")
             return None
 
-    def scrape_reviews(self, app_id, count=400):
+    def scrape_reviews(self, app_id, count=400, mode=None, on_page=None,
+                       on_finish=None):
         """
         Scrape reviews for a specific app.
-        Attempts to fetch 'count' number of reviews, sorted by newest first.
+        Attempts to fetch 'count' number of reviews, sorted by newest first,
+        one page of 'page_size' reviews per request.
         Includes a retry mechanism for stability.
+
+        Modes (default: SCRAPING_CONFIG['mode']):
+        - 'full': the newest 'count' reviews, no state involved
+        - 'incremental': stops paging at the first already-seen review
+          (stored high-water mark). Once a mark exists 'count' is ignored:
+          stopping short of the mark would leave a gap that no later run
+          fetches. The mark only moves when the run caught up with it.
+        - 'backfill': continues into older reviews from the stored
+          continuation token
+
+        When on_page is given, each page is handed to on_page(page) as soon
+        as it arrives and nothing is kept in memory; the return value is
+        then an empty list. on_page returns True when it has durably
+        committed everything received so far, which is when the backfill
+        token is checkpointed. on_finish() is called once paging stops, before
+        the final state update, to commit whatever is still buffered.
+
+        Without on_page the reviews are returned, not saved, so the state
+        update (high-water mark, backfill token) is only left pending; the
+        caller applies it with commit_state once the reviews are on disk.
+        """
+        mode = mode or self.mode
+        if mode not in SCRAPE_MODES:
+            raise ValueError(
+                f"Unknown scrape mode '{mode}'. "
+                f"Expected one of {SCRAPE_MODES}")
+
+        print(f"\nScraping reviews for {app_id} ({mode})...")
+
+        token = None
+        seen_id, seen_at = None, None
+        if mode == 'incremental':
+            seen_id, seen_at = self.state_store.high_water_mark(app_id)
+        elif mode == 'backfill':
+            if self.state_store.get(app_id).get('backfill_done'):
+                print("Backfill already complete, nothing to fetch")
+                return []
+            token = self.state_store.backfill_token(app_id)
+        first_run = not self.state_store.get(app_id)
+        catch_up = seen_id is not None or seen_at is not None
+
+        result = []
+        fetched = 0
+        newest = None
+        reached_seen = False
+        failed = False
+        while catch_up or fetched < count:
+            page_count = self.page_size if catch_up \
+                else min(self.page_size, count - fetched)
+            page, token = self.fetch_review_page(app_id, page_count, token)
+            if page is None:
+                failed = True
+                break
+
+            if catch_up:
+                fresh = self.filter_unseen(page, seen_id, seen_at)
+                reached_seen = len(fresh) < len(page)
+                page = fresh
+
+            fetched += len(page)
+            dated = [r for r in page if r.get('at') is not None]
+            if dated:
+                page_newest = max(dated, key=lambda r: r['at'])
+                if newest is None or page_newest['at'] > newest['at']:
+                    newest = page_newest
+
+            if on_page is None:
+                result.extend(page)
+            elif on_page(page) and mode == 'backfill':
+                # Everything up to this page is on disk: checkpoint the token
+                self.state_store.update(app_id, [], token, save_token=True)
+
+            # No continuation token means the app has no older reviews
+            if (reached_seen or not page
+                    or token is None or token.token is None):
+                break
+
+        if on_finish is not None:
+            on_finish()
+
+        if mode != 'full':
+            # The first incremental run seeds the backfill token; later ones
+            # only move the high-water mark so the backfill position is kept
+            save_token = not failed and (mode == 'backfill' or first_run)
+            # A catch-up cut short by a failure keeps the old mark, so the
+            # next run pages over the missing reviews again
+            move_mark = newest is not None and not (catch_up and failed)
+            with self.state_lock:
+                self.pending_state[app_id] = (
+                    [newest] if move_mark else [], token, save_token)
+        if on_page is not None:
+            # Streamed pages were committed by on_page / on_finish
+            self.commit_state([app_id])
+
+        print(f"Successfully scraped {fetched} reviews")
+        return result
+
+    def commit_state(self, app_ids=None):
         """
-        print(f"\nScraping reviews for {app_id}...")
-
-        # Retry loop to handle potential network errors or API issues
-        for attempt in range(self.max_retries):
-            try:
-                # Use the google_play_scraper 'reviews' function
-                result, _ = reviews(
-                    app_id,
-                    lang=self.lang,
-                    country=self.country,
-                    sort=Sort.NEWEST,      # Get the most recent reviews
-                    count=count,           # Number of reviews to fetch
-                    filter_score_with=None  # Fetch all ratings (1-5 stars)
-                )
-
-                print(f"Successfully scraped {len(result)} reviews")
-                return result
-
-            except Exception as e:
-                print(f"Attempt {attempt + 1} failed: {str(e)}")
-                # Wait before retrying if it's not the last attempt
-                if attempt < self.max_retries - 1:
-                    print(f"Retrying in 5 seconds...")
-                    time.sleep(5)
-                else:
-                    print(
-                        f"Failed to scrape reviews after {self.max_retries} attempts")
-                    return []
-
-        return []
+        Apply the pending state updates and seen-index claims of app_ids
+        (default: all apps).
+        Call only once the reviews of those runs are durably saved.
+        """
+        if self.seen_index is not None:
+            self.seen_index.commit(app_ids)
+        with self.state_lock:
+            if app_ids is None:
+                app_ids = list(self.pending_state)
+            pending = [(app_id, self.pending_state.pop(app_id))
+                       for app_id in app_ids if app_id in self.pending_state]
+        for app_id, (reviews_data, token, save_token) in pending:
+            self.state_store.update(app_id, reviews_data, token, save_token)
+
+    def discard_state(self, app_id):
+        """
+        Drop a pending state update whose reviews were not saved, and
+        release their seen-index claims so the next run ingests them again.
+        """
+        if self.seen_index is not None:
+            self.seen_index.release(app_id)
+        with self.state_lock:
+            self.pending_state.pop(app_id, None)
+
+    @staticmethod
+    def filter_unseen(page, seen_id, seen_at):
+        """
+        Keep the reviews of a newest-first page that come before the
+        high-water mark (stored reviewId or anything older than its date).
+        """
+        fresh = []
+        for review in page:
+            at = review.get('at')
+            if review.get('reviewId') == seen_id or (
+                    seen_at is not None and at is not None and at < seen_at):
+                break
+            fresh.append(review)
+        return fresh
+
+    def fetch_review_page(self, app_id, count, continuation_token=None):
+        """
+        Fetch a single page of reviews through the request policy
+        (rate limit, jittered backoff retries, circuit breaker).
+        Returns (reviews, continuation_token), or (None, None) on failure.
+        """
+        try:
+            return self.policy.call(
+                app_id, self.backend.reviews,
+                app_id, self.lang, self.country, count, continuation_token)
+        except CircuitOpenError as e:
+            print(f"Skipping {app_id}: {str(e)}")
+        except Exception as e:
+            print(f"Failed to scrape reviews for {app_id}: {str(e)}")
+
+        return None, None
 
     def process_reviews(self, reviews_data, bank_code):
         """
-        Process raw review data from the scraper into a clean dictionary format.
-        Extracts only the relevant fields we need for analysis.
+        Process raw review data from the scraper into column buffers.
+        Extracts only the relevant fields we need for analysis and drops
+        reviews whose review_id was already ingested (see SeenIndex).
+        New ids stay staged under the app until commit_state.
+        Returns a ReviewBatch.
         """
-        processed = []
+        batch = ReviewBatch()
+        bank_name = self.bank_names[bank_code]
+        app_id = self.app_ids.get(bank_code)
+        duplicates = 0
 
         for review in reviews_data:
-            processed.append({
-                'review_id': review.get('reviewId', ''),
-                'review_text': review.get('content', ''),
-                'rating': review.get('score', 0),
-                'review_date': review.get('at', datetime.now()),
-                'user_name': review.get('userName', 'Anonymous'),
-                'thumbs_up': review.get('thumbsUpCount', 0),
-                'reply_content': review.get('replyContent', None),
-                'bank_code': bank_code,
-                'bank_name': self.bank_names[bank_code],
-                'app_id': review.get('reviewCreatedVersion', 'N/A'),
-                'source': 'Google Play'
-            })
+            if (self.seen_index is not None
+                    and not self.seen_index.claim(review.get('reviewId'),
+                                                  app_id)):
+                duplicates += 1
+                continue
+            batch.append_raw(review, bank_code, bank_name)
 
+        if duplicates:
+            print(f"Dropped {duplicates} already ingested reviews "
+                  f"for {bank_name}")
+
+        return batch
+
+    def collect_app_info(self, bank_code, app_id):
+        """
+        Fetch app metadata for one bank and tag it with the bank details.
+        """
+        info = self.get_app_info(app_id)
+        if info:
+            info['bank_code'] = bank_code
+            info['bank_name'] = self.bank_names[bank_code]
+            print(f"\n{bank_code}: {self.bank_names[bank_code]}")
+            print(f"App ID: {app_id}")
+            print(f"Current Rating: {info['score']}")
+            print(f"Total Ratings: {info['ratings']}")
+            print(f"Total Reviews: {info['reviews']}")
+        return info
+
+    def collect_reviews(self, bank_code, app_id, mode=None):
+        """
+        Scrape and process the reviews of one bank.
+        """
+        # Fetch the reviews
+        reviews_data = self.scrape_reviews(
+            app_id, self.reviews_per_bank, mode=mode)
+
+        if not reviews_data:
+            print(
+                f"WARNING: No reviews collected for {self.bank_names[bank_code]}")
+            return ReviewBatch()
+
+        # Process and format the data
+        processed = self.process_reviews(reviews_data, bank_code)
+        print(
+            f"Collected {len(processed)} reviews for {self.bank_names[bank_code]}")
         return processed
 
-    def scrape_all_banks(self):
+    def stream_reviews(self, bank_code, app_id, mode=None):
+        """
+        Scrape the reviews of one bank straight into JSONL shards.
+        Only one page is held in memory at a time.
+        Returns a small summary of what was written.
+        """
+        writer = ShardWriter(DATA_PATHS['raw_shards'],
+                             bank_code, shard_size=self.shard_size)
+        # Ids written to the open shard; persisted as seen once it commits
+        pending_ids = []
+
+        def write_page(page):
+            batch = self.process_reviews(page, bank_code)
+            pending_ids.extend(batch.review_ids)
+            committed = writer.write(batch.rows())
+            if committed:
+                self.persist_seen(pending_ids)
+                pending_ids.clear()
+            return committed
+
+        def finish():
+            writer.commit()
+            self.persist_seen(pending_ids)
+            pending_ids.clear()
+
+        try:
+            self.scrape_reviews(
+                app_id, self.reviews_per_bank, mode=mode,
+                on_page=write_page, on_finish=finish)
+        finally:
+            # Never publish a partial shard after a crash mid-page
+            if writer.file is not None:
+                writer.file.close()
+
+        if writer.rows_written == 0:
+            print(f"WARNING: No reviews collected for "
+                  f"{self.bank_names[bank_code]}")
+        else:
+            print(f"Streamed {writer.rows_written} reviews for "
+                  f"{self.bank_names[bank_code]} "
+                  f"into {len(writer.shards_committed)} shard(s)")
+
+        return {
+            'bank_code': bank_code,
+            'bank_name': self.bank_names[bank_code],
+            'reviews': writer.rows_written,
+            'shards': len(writer.shards_committed),
+            'shard_dir': writer.directory
+        }
+
+    def open_seen_index(self, append_only):
+        """
+        Pick the seen index for a run: the persistent one for append-only
+        outputs, an in-memory one otherwise (no-op when dedup is off).
+        """
+        if self.dedup:
+            self.seen_index = SeenIndex(
+                DATA_PATHS['seen_ids'] if append_only else None,
+                bootstrap_csv=DATA_PATHS['raw_reviews'])
+
+    def save_reviews(self, batch, append=False, df=None):
+        """
+        Write a ReviewBatch to the raw reviews table (appending when append
+        is True) and record its ids in the seen index. Safe to call from
+        several threads.
+        """
+        if df is None:
+            df = batch.to_frame()
+        with self.save_lock:
+            save_frame(df, DATA_PATHS['raw_reviews'], append=append)
+            self.persist_seen(batch.review_ids)
+        return df
+
+    def persist_seen(self, review_ids):
+        """
+        Record durably saved review ids in the seen index.
+        """
+        if self.seen_index is not None:
+            self.seen_index.persist(review_ids)
+
+    def run_for_all_banks(self, func, desc, concurrent):
+        """
+        Call func(bank_code, app_id) for every configured bank and return
+        the results in APP_IDS order.
+        Sequential by default, or on a thread pool in concurrent mode;
+        request pacing is left to the shared rate limiter either way.
+        """
+        items = list(self.app_ids.items())
+
+        if not concurrent:
+            return [func(bank_code, app_id)
+                    for bank_code, app_id in tqdm(items, desc=desc)]
+
+        results = [None] * len(items)
+        workers = max(1, min(self.max_workers, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(func, bank_code, app_id): i
+                for i, (bank_code, app_id) in enumerate(items)
+            }
+            for future in tqdm(as_completed(futures), total=len(futures),
+                               desc=desc):
+                results[futures[future]] = future.result()
+        return results
+
+    def scrape_all_banks(self, concurrent=None, mode=None, stream=None):
         """
         Main orchestration method:
         1. Iterates through all configured banks
@@ -112,9 +432,29 @@ class PlayStoreScraper:
         3. Scrapes reviews for each bank
         4. Combines all data into a single DataFrame
         5. Saves the raw data to CSV
+
+        When concurrent is True (default: SCRAPING_CONFIG['concurrent']),
+        apps are scraped in parallel on a thread pool of 'max_workers'.
+
+        In 'incremental' and 'backfill' mode only unseen reviews are fetched
+        and they are appended to the raw CSV instead of overwriting it.
+        For these append-only outputs (and streaming) review ids are also
+        checked against the persistent seen index (DATA_PATHS['seen_ids']),
+        so a review is never stored twice across runs.
+
+        When stream is True (default: SCRAPING_CONFIG['stream']), pages are
+        written to append-only shards under DATA_PATHS['raw_shards'] as they
+        arrive, and a per-bank summary DataFrame is returned instead.
         """
-        all_reviews = []
-        app_info_list = []
+        if concurrent is None:
+            concurrent = self.concurrent
+        if stream is None:
+            stream = self.stream
+        mode = mode or self.mode
+
+        self.open_seen_index(append_only=stream or mode != 'full')
+
+        all_reviews = ReviewBatch()
 
         print("=" * 60)
         print("Starting Google Play Store Review Scraper")
@@ -122,18 +462,8 @@ class PlayStoreScraper:
 
         # --- Phase 1: Fetch App Info ---
         print("\n[1/2] Fetching app information...")
-        for bank_code, app_id in self.app_ids.items():
-            print(f"\n{bank_code}: {self.bank_names[bank_code]}")
-            print(f"App ID: {app_id}")
-
-            info = self.get_app_info(app_id)
-            if info:
-                info['bank_code'] = bank_code
-                info['bank_name'] = self.bank_names[bank_code]
-                app_info_list.append(info)
-                print(f"Current Rating: {info['score']}")
-                print(f"Total Ratings: {info['ratings']}")
-                print(f"Total Reviews: {info['reviews']}")
+        app_info_list = [info for info in self.run_for_all_banks(
+            self.collect_app_info, "App info", concurrent) if info]
 
         # Save the gathered app info to a CSV file
         if app_info_list:
@@ -146,31 +476,38 @@ class PlayStoreScraper:
 
         # --- Phase 2: Scrape Reviews ---
         print("\n[2/2] Scraping reviews...")
-        # Use tqdm to show a progress bar for the banks
-        for bank_code, app_id in tqdm(self.app_ids.items(), desc="Banks"):
-            # Fetch the reviews
-            reviews_data = self.scrape_reviews(app_id, self.reviews_per_bank)
-
-            if reviews_data:
-                # Process and format the data
-                processed = self.process_reviews(reviews_data, bank_code)
-                all_reviews.extend(processed)
-                print(
-                    f"Collected {len(processed)} reviews for {self.bank_names[bank_code]}")
-            else:
-                print(
-                    f"WARNING: No reviews collected for {self.bank_names[bank_code]}")
-
-            # Small delay between banks to be polite to the server
-            time.sleep(2)
+        if stream:
+            summary = pd.DataFrame(self.run_for_all_banks(
+                lambda bank_code, app_id: self.stream_reviews(
+                    bank_code, app_id, mode),
+                "Banks", concurrent))
+
+            print("\n" + "=" * 60)
+            print("Scraping Complete!")
+            print("=" * 60)
+            print(f"\nTotal reviews collected: {summary['reviews'].sum()}")
+            print("Reviews per bank:")
+            for _, row in summary.iterrows():
+                print(f"  {row['bank_name']}: {row['reviews']}")
+            print(f"\nShards saved under: {DATA_PATHS['raw_shards']}")
+            self.print_request_stats()
+            return summary
+
+        for processed in self.run_for_all_banks(
+                lambda bank_code, app_id: self.collect_reviews(
+                    bank_code, app_id, mode),
+                "Banks", concurrent):
+            all_reviews.extend(processed)
+        self.print_request_stats()
 
         # --- Phase 3: Save Data ---
-        if all_reviews:
-            df = pd.DataFrame(all_reviews)
+        if len(all_reviews):
+            df = all_reviews.to_frame()
 
-            # Save raw data to CSV
-            os.makedirs(DATA_PATHS['raw'], exist_ok=True)
-            df.to_csv(DATA_PATHS['raw_reviews'], index=False)
+            # Save raw data to CSV (append new reviews in incremental modes)
+            self.save_reviews(all_reviews, append=mode != 'full', df=df)
+            # Only now can the high-water marks move past these reviews
+            self.commit_state()
 
             print("\n" + "=" * 60)
             print("Scraping Complete!")
@@ -187,9 +524,27 @@ class PlayStoreScraper:
 
             return df
         else:
+            # Nothing to save; backfill tokens and done flags still apply
+            self.commit_state()
             print("\nERROR: No reviews were collected!")
             return pd.DataFrame()
 
+    def print_request_stats(self):
+        """
+        Print per-app request counters collected by the request policy.
+        """
+        stats = self.policy.stats.summary()
+        if stats.empty:
+            return stats
+
+        print("\nRequest stats per app:")
+        for _, row in stats.iterrows():
+            print(f"  {row['app_id']}: {row['successes']} ok, "
+                  f"{row['failures']} failed, {row['retries']} retried, "
+                  f"{row['rejected']} parked, "
+                  f"mean latency {row['mean_latency']:.2f}s")
+        return stats
+
     def display_sample_reviews(self, df, n=3):
         """
         Display sample reviews from each bank to verify data quality.
@@ -219,8 +574,8 @@ def main():
     # Scrape all reviews
     df = scraper.scrape_all_banks()
 
-    # Display samples if data was collected
-    if not df.empty:
+    # Display samples if data was collected (not in streaming mode)
+    if not df.empty and 'review_text' in df.columns:
         scraper.display_sample_reviews(df)
 
     return df
@@ -0,0 +1,109 @@
+"""
+Append-only JSONL shard output for streaming scrapes.
+
+Every fetched page is written straight to disk instead of being collected
+in memory. Shards are partitioned by bank and scrape date:
+
+    data/raw/shards/<bank_code>/<YYYY-MM-DD>/part-00000.jsonl
+
+A shard is first written as `part-XXXXX.jsonl.tmp` and renamed once it
+holds at least `shard_size` rows (or the bank is done). Readers only pick up
+committed `.jsonl` files, so a crash loses at most the shard being written.
+"""
+
+import glob
+import json
+import os
+from datetime import date
+
+import pandas as pd
+
+
+class ShardWriter:
+    """Streams processed review rows of one bank into rolling JSONL shards"""
+
+    def __init__(self, root, bank_code, shard_size=5000, run_date=None):
+        self.root = root
+        self.bank_code = bank_code
+        self.shard_size = shard_size
+        self.run_date = (run_date or date.today()).isoformat()
+        self.directory = os.path.join(root, bank_code, self.run_date)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.part = self._next_part()
+        self.file = None
+        self.rows_in_shard = 0
+        self.rows_written = 0
+        self.shards_committed = []
+
+    def _next_part(self):
+        # Continue numbering after shards committed by earlier runs today
+        existing = glob.glob(os.path.join(self.directory, 'part-*.jsonl'))
+        if not existing:
+            return 0
+        return max(int(os.path.basename(p)[5:10]) for p in existing) + 1
+
+    def _shard_path(self):
+        return os.path.join(self.directory, f"part-{self.part:05d}.jsonl")
+
+    def write(self, rows):
+        """
+        Append one page of rows to the open shard.
+        Shards are only cut between pages, so a committed shard always ends
+        on the page the saved continuation token points after.
+        Returns True if a shard boundary was reached and committed.
+        """
+        for row in rows:
+            if self.file is None:
+                # Truncates any stale .tmp left behind by a crashed run
+                self.file = open(f"{self._shard_path()}.tmp", 'w')
+            self.file.write(json.dumps(row, default=str) + '\n')
+            self.rows_in_shard += 1
+            self.rows_written += 1
+
+        if self.rows_in_shard >= self.shard_size:
+            self.commit()
+            return True
+        return False
+
+    def commit(self):
+        """
+        Close the open shard and atomically publish it.
+        """
+        if self.file is None:
+            return None
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        path = self._shard_path()
+        os.replace(f"{path}.tmp", path)
+        self.shards_committed.append(path)
+
+        self.file = None
+        self.rows_in_shard = 0
+        self.part += 1
+        return path
+
+    def close(self):
+        return self.commit()
+
+
+def read_shards(root, bank_codes=None, columns=None):
+    """
+    Load committed shards into one DataFrame.
+    Optionally restricted to some banks and columns.
+    """
+    paths = sorted(glob.glob(os.path.join(root, '*', '*', 'part-*.jsonl')))
+    if bank_codes is not None:
+        paths = [p for p in paths
+                 if os.path.basename(os.path.dirname(os.path.dirname(p)))
+                 in bank_codes]
+    if not paths:
+        return pd.DataFrame(columns=columns)
+
+    frames = []
+    for path in paths:
+        df = pd.read_json(path, lines=True, dtype=False)
+        frames.append(df[columns] if columns else df)
+    return pd.concat(frames, ignore_index=True)
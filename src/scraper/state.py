@@ -0,0 +1,101 @@
+"""
+Persistent scrape state for incremental runs.
+
+For every app we keep:
+- the high-water mark: newest reviewId and its date seen so far
+- the continuation token of the deep backfill, so it resumes where it stopped
+
+The state lives in a small JSON file (DATA_PATHS['scrape_state']).
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from .backends import TOKEN_FIELDS, ContinuationToken
+
+
+class ScrapeStateStore:
+    """Thread-safe JSON store of per-app scraping state"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not read scrape state {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        # Write to a temp file first so a crash never leaves a half-written
+        # state
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, app_id):
+        with self.lock:
+            return dict(self.state.get(app_id, {}))
+
+    def high_water_mark(self, app_id):
+        """
+        Return (newest_review_id, newest_at) for the app, or (None, None).
+        """
+        entry = self.get(app_id)
+        newest_at = entry.get('newest_at')
+        if newest_at:
+            newest_at = datetime.fromisoformat(newest_at)
+        return entry.get('newest_review_id'), newest_at
+
+    def backfill_token(self, app_id):
+        """
+        Rebuild the stored backfill continuation token, or None if there
+        is none.
+        """
+        stored = self.get(app_id).get('backfill_token')
+        if not stored:
+            return None
+        return ContinuationToken(*[stored.get(f) for f in TOKEN_FIELDS])
+
+    def update(self, app_id, reviews_data, token=None, save_token=False):
+        """
+        Record a finished scrape for the app:
+        - moves the high-water mark forward to the newest review in
+          reviews_data
+        - stores the continuation token when save_token is True; a token
+          without continuation marks the backfill as done, so only pass one
+          from a page that was fetched successfully
+        """
+        with self.lock:
+            entry = self.state.setdefault(app_id, {})
+
+            dated = [r for r in reviews_data if r.get('at') is not None]
+            if dated:
+                newest = max(dated, key=lambda r: r['at'])
+                current = entry.get('newest_at')
+                if (current is None
+                        or newest['at'] > datetime.fromisoformat(current)):
+                    entry['newest_review_id'] = newest.get('reviewId')
+                    entry['newest_at'] = newest['at'].isoformat()
+
+            if save_token:
+                if token is None or token.token is None:
+                    entry['backfill_token'] = None
+                    entry['backfill_done'] = True
+                else:
+                    entry['backfill_token'] = {
+                        f: getattr(token, f) for f in TOKEN_FIELDS}
+                    entry['backfill_done'] = False
+
+            entry['updated_at'] = datetime.now().isoformat()
+            self._save()
@@ -7,7 +7,28 @@ from pathlib import Path
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
-from utils import PROJECT_ROOT, load_reviews
+import os
+from utils import PROJECT_ROOT, load_reviews, save_frame
+from normalizer import NORMALIZER_VERSION, SpacyNormalizer, normalize_texts
+from text_cache import CleanTextCache, cached_normalize
+
+# 'batch': TextNormalizer in this process; 'parallel': TextNormalizer on a
+# process pool; 'legacy': preprocess_text row by row (same output, slowest);
+# 'spacy': SpacyNormalizer via nlp.pipe (spaCy lemmas, for big backfills)
+ENGINE = "batch"
+N_WORKERS = os.cpu_count() or 1
+
+# spaCy engine settings ('blank' = blank English pipeline + lookup lemmas)
+SPACY_MODEL = "en_core_web_sm"
+SPACY_BATCH_SIZE = 1000
+SPACY_N_PROCESS = N_WORKERS
+
+# Cleaned text is cached by hash of the raw text + normalizer version, so
+# reruns only normalize new or changed reviews
+USE_CACHE = True
+CACHE_PATH = (PROJECT_ROOT / "data" / "outputs" / "cache"
+              / "cleaned_text.sqlite")
+CACHE_MAX_ENTRIES = 2_000_000
 
 # -------------------------------
 # 1️⃣ Setup NLTK safely (works in Jupyter / venv)
@@ -62,6 +83,22 @@ def preprocess_text(text):
 
     return " ".join(tokens)
 
+
+def build_engine():
+    """Returns (normalize_batch, version) for the configured ENGINE."""
+    if ENGINE == "legacy":
+        # Same output as TextNormalizer, so it shares its cache entries
+        return (lambda texts: [preprocess_text(t) for t in texts],
+                NORMALIZER_VERSION)
+    if ENGINE == "spacy":
+        normalizer = SpacyNormalizer(
+            SPACY_MODEL, batch_size=SPACY_BATCH_SIZE,
+            n_process=SPACY_N_PROCESS)
+        return normalizer.normalize_batch, normalizer.version
+    n_workers = N_WORKERS if ENGINE == "parallel" else 1
+    return (lambda texts: normalize_texts(texts, n_workers=n_workers),
+            NORMALIZER_VERSION)
+
 # -------------------------------
 # 3️⃣ Main preprocessing routine
 # -------------------------------
@@ -86,15 +123,27 @@ def main():
         f"Auto-selected review column: '{review_column}' (avg length {avg_lengths[review_column]:.1f})")
 
     # Preprocess text
-    print("Preprocessing text (cleaning, tokenizing, lemmatizing)...")
-    df["cleaned_review"] = df[review_column].apply(preprocess_text)
+    print("Preprocessing text (cleaning, tokenizing, lemmatizing) "
+          f"with the '{ENGINE}' engine...")
+    normalize_batch, version = build_engine()
+    texts = df[review_column].tolist()
+    if USE_CACHE:
+        cache = CleanTextCache(CACHE_PATH, CACHE_MAX_ENTRIES)
+        try:
+            df["cleaned_review"], hits, misses = cached_normalize(
+                texts, normalize_batch, version, cache)
+        finally:
+            cache.close()
+        print(f"Cache: {hits} reused, {misses} normalized ({CACHE_PATH})")
+    else:
+        df["cleaned_review"] = normalize_batch(texts)
 
     # Save to output directory
     OUTPUT_DIR = PROJECT_ROOT / "data" / "outputs"
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output_file = OUTPUT_DIR / "reviews_cleaned.csv"
 
-    df.to_csv(output_file, index=False)
+    save_frame(df, output_file)
     print(f"✅ Success! Saved cleaned reviews to {output_file}")
 
 
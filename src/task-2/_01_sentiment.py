@@ -7,14 +7,41 @@ Two modes:
 TextBlob analysis is run alongside the selected mode to generate columns 
 needed for downstream correlation visualizations.
 """
-import pandas as pd
-from utils import OUTPUT_DIR, load_reviews
+from utils import (OUTPUT_DIR, frame_exists, load_frame, load_reviews,
+                   save_frame)
+import os
 import nltk
+import numpy as np
 from pathlib import Path
 from textblob import TextBlob  # New Import!
+from lexicon_scorer import (TEXTBLOB_VERSION, labels_from_compound,
+                            lexicon_sentiment)
+from score_cache import ScoreCache
 
 MODE = "vader"  # change to 'transformer' if available
 
+# VADER mode scores TextBlob + VADER in one pass over a process pool
+LEXICON_WORKERS = os.cpu_count() or 1
+LEXICON_CHUNKSIZE = 2000
+
+# Transformer mode: reviews per forward pass and torch intra-op threads
+# (None keeps torch's default)
+TRANSFORMER_BATCH_SIZE = 32
+TORCH_THREADS = None
+# 'torch', 'int8' (dynamic quantization) or 'onnx' (ONNX Runtime); set
+# TRANSFORMER_MODEL_DIR to a local save_pretrained directory to run offline
+TRANSFORMER_BACKEND = "torch"
+TRANSFORMER_MODEL_DIR = None
+# URL of a running scoring_service.py (e.g. "http://127.0.0.1:8766") to
+# reuse its warm model instead of loading one here
+SCORING_SERVICE_URL = None
+
+# Scores are cached per (scorer, version, text hash); only new or changed
+# reviews are scored again
+USE_SCORE_CACHE = True
+SCORE_CACHE_PATH = OUTPUT_DIR / "cache" / "sentiment_scores.sqlite"
+SCORE_CACHE_MAX_ENTRIES = 5_000_000
+
 # -------------------------------
 # Ensure NLTK VADER lexicon is downloaded
 # -------------------------------
@@ -46,15 +73,20 @@ def get_review_column(df):
 # -------------------------------
 
 
-def textblob_sentiment(df):
+def textblob_sentiment(df, cache=None):
     """Adds TextBlob polarity and subjectivity columns to the DataFrame."""
     col_name = get_review_column(df)
 
-    # Get polarity and subjectivity
-    df["tb_polarity"] = df[col_name].apply(
-        lambda x: TextBlob(str(x)).sentiment.polarity)
-    df["tb_subjectivity"] = df[col_name].apply(
-        lambda x: TextBlob(str(x)).sentiment.subjectivity)
+    def score_batch(texts):
+        # Polarity and subjectivity from a single parse per review
+        sentiments = (TextBlob(str(x)).sentiment for x in texts)
+        return [[s.polarity, s.subjectivity] for s in sentiments]
+
+    texts = df[col_name].tolist()
+    scores = cache.scores(texts, "textblob", TEXTBLOB_VERSION, score_batch) \
+        if cache else score_batch(texts)
+    df["tb_polarity"] = [polarity for polarity, _ in scores]
+    df["tb_subjectivity"] = [subjectivity for _, subjectivity in scores]
 
     return df
 
@@ -63,7 +95,7 @@ def textblob_sentiment(df):
 # -------------------------------
 
 
-def vader_sentiment(df):
+def vader_sentiment(df, cache=None):
     from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
     sid = SentimentIntensityAnalyzer()
@@ -72,48 +104,61 @@ def vader_sentiment(df):
     col_name = get_review_column(df)
     print(f"Running VADER on column: '{col_name}'")
 
-    df["vader_compound"] = df[col_name].apply(
-        lambda x: sid.polarity_scores(str(x))["compound"])
-
-    def label_from_compound(c):
-        if c >= 0.05:
-            return "positive"
-        elif c <= -0.05:
-            return "negative"
-        else:
-            return "neutral"
+    def score_batch(texts):
+        return [sid.polarity_scores(str(x))["compound"] for x in texts]
 
-    df["sentiment_label"] = df["vader_compound"].apply(label_from_compound)
+    texts = df[col_name].tolist()
+    df["vader_compound"] = cache.scores(
+        texts, "vader", nltk.__version__, score_batch) \
+        if cache else score_batch(texts)
+    df["sentiment_label"] = labels_from_compound(df["vader_compound"])
     df["sentiment_score"] = df["vader_compound"]
     return df
 
 
-def transformer_sentiment(df):
+def transformer_sentiment(df, cache=None):
     # requires transformers & torch, internet to download the model on first run
-    from transformers import pipeline
-    classifier = pipeline(
-        "sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+    from transformer_scorer import MODEL_NAME, TransformerScorer, print_summary
+
+    model_name = TRANSFORMER_MODEL_DIR or MODEL_NAME
+    scorers = []
+
+    def score_batch(texts):
+        # The model is only loaded if some review is not cached
+        if SCORING_SERVICE_URL:
+            scorer = client
+        else:
+            scorer = TransformerScorer(model_name,
+                                       batch_size=TRANSFORMER_BATCH_SIZE,
+                                       num_threads=TORCH_THREADS,
+                                       backend=TRANSFORMER_BACKEND)
+        scorers.append(scorer)
+        return scorer.score(texts)
 
     col_name = get_review_column(df)
     print(f"Running Transformer on column: '{col_name}'")
 
-    def infer(text):
-        try:
-            # Truncate to 512 tokens to avoid errors
-            r = classifier(str(text)[:512])[0]
-            label = r["label"].lower()
-            score = float(r["score"])
-            # map LABELS: 'POSITIVE'/'NEGATIVE'
-            if score < 0.6:
-                # consider low-confidence as neutral
-                return ("neutral", score if label == "positive" else -score)
-            return (label, score if label == "positive" else -score)
-        except Exception as e:
-            return ("neutral", 0.0)
-
-    out = df[col_name].apply(lambda t: infer(t))
-    df["sentiment_label"] = out.apply(lambda x: x[0])
-    df["sentiment_score"] = out.apply(lambda x: x[1])
+    # Batched, length-bucketed inference; truncation is by tokens (512)
+    texts = df[col_name].tolist()
+    if SCORING_SERVICE_URL:
+        from scoring_service import ScoringClient
+        client = ScoringClient(SCORING_SERVICE_URL)
+        version = client.version
+        print(f"Scoring via service at {SCORING_SERVICE_URL} ({version})")
+    else:
+        version = TransformerScorer.version_for(model_name,
+                                                TRANSFORMER_BACKEND)
+    out = cache.scores(texts, "transformer", version, score_batch) \
+        if cache else score_batch(texts)
+    # Reviews the model failed on stay unlabeled (NaN) and are not cached
+    failed = sum(result is None for result in out)
+    if failed:
+        print(f"WARNING: {failed} reviews could not be scored")
+    df["sentiment_label"] = [result[0] if result else None for result in out]
+    df["sentiment_score"] = [result[1] if result else np.nan
+                             for result in out]
+    if scorers:
+        print_summary(scorers[0].last_stats)
     return df
 
 
@@ -122,31 +167,43 @@ def main():
     try:
         # Try to load the output from the previous step
         clean_path = OUTPUT_DIR / "reviews_cleaned.csv"
-        if clean_path.exists():
+        if frame_exists(clean_path):
             print(f"Loading cleaned data from {clean_path}")
-            df = pd.read_csv(clean_path)
+            df = load_frame(clean_path)
         else:
             print("Cleaned data not found, falling back to raw processed data.")
             df = load_reviews()
     except Exception as e:
         df = load_reviews()
 
-    # 1. Run TextBlob analysis to generate tb_polarity needed for visualization
-    df = textblob_sentiment(df)
-
-    # 2. Run the selected sentiment mode (VADER or Transformer)
-    if MODE == "vader":
-        df = vader_sentiment(df)
-    else:
-        df = transformer_sentiment(df)
+    cache = ScoreCache(SCORE_CACHE_PATH, SCORE_CACHE_MAX_ENTRIES) \
+        if USE_SCORE_CACHE else None
+    try:
+        if MODE == "vader":
+            # TextBlob (for the correlation plots) and VADER in a single pass
+            col_name = get_review_column(df)
+            print(f"Running TextBlob + VADER on column: '{col_name}'")
+            df = lexicon_sentiment(df, col_name, n_workers=LEXICON_WORKERS,
+                                   chunksize=LEXICON_CHUNKSIZE, cache=cache)
+        else:
+            # 1. Run TextBlob analysis to generate tb_polarity needed for
+            # visualization
+            df = textblob_sentiment(df, cache)
+            # 2. Run the Transformer mode
+            df = transformer_sentiment(df, cache)
+    finally:
+        if cache:
+            cache.close()
 
     output_file = OUTPUT_DIR / "sentiment_results.csv"
-    df.to_csv(output_file, index=False)
+    save_frame(df, output_file)
     print(f"Saved sentiment_results.csv to {output_file}")
 
     # Basic KPI
     coverage = df["sentiment_label"].notnull().mean()
     print(f"Sentiment coverage: {coverage*100:.2f}%")
+    if cache:
+        cache.print_summary()
     print("✅ TextBlob and VADER scores saved, ready for correlation plots.")
 
 
@@ -2,14 +2,135 @@
 """
 Compute TF-IDF top n-grams per bank and build an LDA model (optional)
 to surface topics to help theme grouping.
+
+TF-IDF modes:
+- 'global': one vectorizer fit over the whole corpus; per-bank (and
+  optionally per-month) term sums come from a single sparse product of a
+  group indicator matrix with the TF-IDF matrix, so scores are comparable
+  across banks and the corpus is vectorized once however many banks there are
+- 'per_bank' (default): a separate vectorizer per bank (original behaviour)
+- 'streaming': out-of-core hashed n-grams read from the cleaned file in
+  chunks (streaming_keywords.py), for corpora that do not fit in memory.
+  main() then never loads the whole corpus: the online LDA is also
+  updated and applied chunk by chunk, and batch LDA is skipped
+
+LDA modes:
+- 'online': a persisted OnlineTopicModel (topic_model.py) over hashed
+  n-grams is updated with mini-batch partial_fit on reviews it has not
+  seen, and every review's topic distribution is saved with the other
+  columns in reviews_topics.csv
+- 'batch' (default): refit CountVectorizer + LDA over the whole corpus
+  (original)
+
+The defaults keep the original stateless run. 'global', 'streaming' and
+'online' are opt-in: set TFIDF_MODE / LDA_MODE below or pass them on the
+command line (run from src/task-2):
+    python _02_keywords_topics.py --tfidf-mode global --lda-mode online
 """
+import argparse
+
+import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
-from utils import OUTPUT_DIR, load_reviews
+from topic_model import OnlineTopicModel, topic_columns
+from utils import (OUTPUT_DIR, frame_exists, iter_frames, load_frame,
+                   load_reviews, save_frame)
+
+TFIDF_MODES = ("per_bank", "global", "streaming")
+TFIDF_MODE = "per_bank"
+# Also write top terms per bank and month (global mode only)
+TFIDF_BY_MONTH = False
+
+LDA_MODES = ("batch", "online")
+LDA_MODE = "batch"
+LDA_TOPICS = 8
+LDA_MODEL_PATH = OUTPUT_DIR / "models" / "lda_online.joblib"
+LDA_BATCH_SIZE = 2048
+LDA_N_JOBS = -1
+
+# Rows per chunk read from the cleaned file in streaming mode
+STREAM_CHUNKSIZE = 50000
+
+
+def group_indicator(keys):
+    """
+    (groups, indicator) where indicator is a sparse groups x rows matrix
+    with a 1 where row i belongs to group g. Rows with a missing key are
+    left out of every group.
+    """
+    codes, groups = pd.factorize(keys, sort=True)
+    rows = np.flatnonzero(codes >= 0)
+    indicator = sparse.csr_matrix(
+        (np.ones(len(rows)), (codes[rows], rows)),
+        shape=(len(groups), len(codes)))
+    return groups, indicator
+
+
+def top_terms_per_row(sums, terms, top_n):
+    """Top (term, score) pairs of every row of a sparse group x term matrix."""
+    sums = sparse.csr_matrix(sums)
+    top = []
+    for g in range(sums.shape[0]):
+        start, end = sums.indptr[g], sums.indptr[g + 1]
+        values, cols = sums.data[start:end], sums.indices[start:end]
+        # Highest score first, ties in term order
+        order = np.lexsort((-cols, values))[::-1][:top_n]
+        top.append([(terms[cols[i]], float(values[i])) for i in order])
+    return top
+
+
+def fit_tfidf(df, ngram_range=(1, 2), max_features=5000):
+    """One TF-IDF fit over all reviews: (tfidf matrix, terms)."""
+    corpus = df["cleaned_review"].fillna("").tolist()
+    vec = TfidfVectorizer(ngram_range=ngram_range, max_features=max_features)
+    return vec.fit_transform(corpus), vec.get_feature_names_out()
+
+
+def group_keys(df, by):
+    """Row keys for the `by` columns; 'month' is derived from review_date."""
+    key_columns = []
+    for column in by:
+        if column == "month":
+            months = pd.to_datetime(df["review_date"], errors="coerce") \
+                .dt.to_period("M")
+            key = months.astype(str).where(months.notna(), None)
+        else:
+            key = df[column].astype(object)
+        key_columns.append(key.to_numpy())
+    if len(by) == 1:
+        return key_columns[0]
+    # Rows missing any key get no group
+    missing = np.any([pd.isna(key) for key in key_columns], axis=0)
+    return np.where(missing, None,
+                    pd.Series(list(zip(*key_columns))).to_numpy())
+
+
+def grouped_top_terms(df, tfidf, terms, by=("bank_name",), top_n=30):
+    """Top terms of every group of `by` columns from one TF-IDF matrix."""
+    groups, indicator = group_indicator(group_keys(df, by))
+    top = top_terms_per_row(indicator @ tfidf, terms, top_n)
+    results = []
+    for group, top_terms in zip(groups, top):
+        group = group if isinstance(group, tuple) else (group,)
+        entry = {("bank" if column == "bank_name" else column): value
+                 for column, value in zip(by, group)}
+        entry["top_terms"] = top_terms
+        results.append(entry)
+    return results
+
 
+def top_tfidf_per_bank(df, ngram_range=(1, 2), top_n=30, mode="per_bank",
+                       by_month=False):
+    if mode == "global":
+        tfidf, terms = fit_tfidf(df, ngram_range)
+        by = ("bank_name", "month") if by_month else ("bank_name",)
+        return grouped_top_terms(df, tfidf, terms, by, top_n)
+    if mode != "per_bank":
+        raise ValueError(
+            f"Unknown TF-IDF mode '{mode}'. Expected 'global' or 'per_bank'")
 
-def top_tfidf_per_bank(df, ngram_range=(1, 2), top_n=30):
     # FIX: Change 'bank' to 'bank_name'
     banks = df["bank_name"].unique()
     results = []
@@ -52,25 +173,119 @@ def lda_topics(df, n_topics=8):
     return topics
 
 
-# 02_keywords_topics.py
+def online_lda_topics(df, n_topics=8, model_path=LDA_MODEL_PATH,
+                      batch_size=LDA_BATCH_SIZE, n_jobs=LDA_N_JOBS):
+    """
+    Update the persisted online LDA model with the reviews in df it has not
+    been trained on, save it, and return (topics, df with topic columns).
+    """
+    model = OnlineTopicModel.load_or_create(
+        model_path, n_topics=n_topics, batch_size=batch_size, n_jobs=n_jobs)
+    new_rows = model.update(df)
+    print(f"LDA updated with {new_rows} new reviews "
+          f"({model.n_docs_seen} seen in total)")
+    model.save(model_path)
+    return model.topics(), with_topics(model, df)
+
+
+def with_topics(model, df):
+    """df with topic_0..topic_<k-1> and dominant_topic from the model."""
+    doc_topic = model.transform(df["cleaned_review"].fillna("").astype(str))
+    df = df.drop(columns=[c for c in df.columns
+                          if c.startswith("topic_") or c == "dominant_topic"])
+    columns = topic_columns(doc_topic)
+    return df.assign(**{c: columns[c].to_numpy() for c in columns.columns})
+
+
+def streaming_online_lda_topics(path, output_path, chunksize=STREAM_CHUNKSIZE,
+                                n_topics=8, model_path=LDA_MODEL_PATH,
+                                batch_size=LDA_BATCH_SIZE, n_jobs=LDA_N_JOBS):
+    """
+    online_lda_topics over a cleaned review table read in chunks: one pass
+    updates the model, a second writes every chunk with its topic columns
+    to output_path. Returns the topics.
+    The model hashes n-grams instead of fitting a vocabulary, so terms that
+    first appear in a later chunk are learned too.
+    """
+    model = OnlineTopicModel.load_or_create(
+        model_path, n_topics=n_topics, batch_size=batch_size, n_jobs=n_jobs)
+    new_rows = 0
+    for chunk in iter_frames(path, chunksize):
+        new_rows += model.update(chunk[chunk["cleaned_review"].notna()])
+    print(f"LDA updated with {new_rows} new reviews "
+          f"({model.n_docs_seen} seen in total)")
+    model.save(model_path)
+
+    for i, chunk in enumerate(iter_frames(path, chunksize)):
+        chunk = chunk[chunk["cleaned_review"].notna()]
+        save_frame(with_topics(model, chunk), output_path, append=i > 0)
+    return model.topics()
+
+
+def streaming_main(cleaned_file, lda_mode=LDA_MODE):
+    """main() for TFIDF_MODE = 'streaming': nothing is loaded whole."""
+    import json
+    from streaming_keywords import streaming_top_terms
 
-# ... (imports and functions remain the same) ...
+    print("Computing TF-IDF keywords per bank (streaming)...")
+    tfidf = streaming_top_terms(cleaned_file, STREAM_CHUNKSIZE)
+    with open(OUTPUT_DIR / "tfidf_top_terms.json", "w") as f:
+        json.dump(tfidf, f, indent=2)
 
-def main():
-    # 1. Load the original dataframe (which contains the 'bank' column)
-    print("Loading base data to get 'bank' column...")
-    df_base = load_reviews()  # This should load the file with 'bank' and original IDs/Text
+    if lda_mode != "online":
+        print("Skipping LDA: batch LDA needs the whole corpus in memory; "
+              "use --lda-mode online to stream it too.")
+        print("✅ Saved tf-idf output to outputs/ folder.")
+        return
+
+    print("Running LDA for topic modeling (online, streaming)...")
+    topics = streaming_online_lda_topics(
+        cleaned_file, OUTPUT_DIR / "reviews_topics.csv",
+        n_topics=LDA_TOPICS)
+    with open(OUTPUT_DIR / "lda_topics.json", "w") as f:
+        json.dump(topics, f, indent=2)
+
+    print("✅ Saved tf-idf and lda outputs to outputs/ folder.")
 
-    # 2. Load the cleaned reviews file (which contains 'cleaned_review')
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="TF-IDF keywords and LDA topics per bank")
+    parser.add_argument("--tfidf-mode", choices=TFIDF_MODES,
+                        default=TFIDF_MODE)
+    parser.add_argument("--lda-mode", choices=LDA_MODES, default=LDA_MODE)
+    parser.add_argument("--by-month", action="store_true",
+                        default=TFIDF_BY_MONTH,
+                        help="also write top terms per bank and month "
+                             "(global mode only)")
+    return parser.parse_args()
+
+
+def main(tfidf_mode=None, lda_mode=None, by_month=None):
+    """Modes default to TFIDF_MODE, LDA_MODE and TFIDF_BY_MONTH."""
+    tfidf_mode = tfidf_mode or TFIDF_MODE
+    lda_mode = lda_mode or LDA_MODE
+    by_month = TFIDF_BY_MONTH if by_month is None else by_month
     CLEANED_FILE = OUTPUT_DIR / "reviews_cleaned.csv"
 
-    if not CLEANED_FILE.exists():
+    if not frame_exists(CLEANED_FILE):
         raise FileNotFoundError(
             f"Expected file not found at {CLEANED_FILE}. "
             "Please ensure you run the previous script (00_preprocess.py) first."
         )
 
-    df_cleaned = pd.read_csv(CLEANED_FILE)
+    # The cleaned file carries every column: stream it instead of loading
+    if tfidf_mode == "streaming":
+        streaming_main(CLEANED_FILE, lda_mode)
+        return
+
+    # 1. Load the original dataframe (which contains the 'bank' column)
+    print("Loading base data to get 'bank' column...")
+    df_base = load_reviews()  # This should load the file with 'bank' and original IDs/Text
+
+    # 2. Load the cleaned reviews file (which contains 'cleaned_review');
+    #    only the cleaned text is merged below
+    df_cleaned = load_frame(CLEANED_FILE, columns=["cleaned_review"])
     print(f"Loaded {len(df_cleaned)} rows of cleaned data.")
 
     # 3. Merge the cleaned text onto the base dataframe.
@@ -91,49 +306,29 @@ def main():
         raise KeyError(
             "Could not find the 'cleaned_review' column after loading/merging.")
 
-    print("Computing TF-IDF keywords per bank...")
-    tfidf = top_tfidf_per_bank(df_pre)
-
     import json
-    with open(OUTPUT_DIR / "tfidf_top_terms.json", "w") as f:
-        json.dump(tfidf, f, indent=2)
-
-    print("Running LDA for topic modeling...")
-    topics = lda_topics(df_pre, n_topics=8)
-    with open(OUTPUT_DIR / "lda_topics.json", "w") as f:
-        json.dump(topics, f, indent=2)
-
-    print("✅ Saved tf-idf and lda outputs to outputs/ folder.")
-
-
-if __name__ == "__main__":
-    # Ensure the code above is placed *inside* the 02_keywords_topics.py file
-    main()
-    # FIX 1: Change filename from 'reviews_preprocessed.csv' to 'reviews_cleaned.csv'
-    CLEANED_FILE = OUTPUT_DIR / "reviews_cleaned.csv"
-
-    if not CLEANED_FILE.exists():
-        raise FileNotFoundError(
-            f"Expected file not found at {CLEANED_FILE}. "
-            "Please ensure you run the previous script (00_preprocess.py) first."
-        )
-
-    # Load the cleaned data
-    df_pre = pd.read_csv(CLEANED_FILE)
-    print(f"Loaded {len(df_pre)} rows of cleaned data.")
-
-    # You still need bank info, so load the original dataframe too if not merged in df_pre
-    # Assuming 'bank' column is preserved in reviews_cleaned.csv
-
-    print("Computing TF-IDF keywords per bank...")
-    tfidf = top_tfidf_per_bank(df_pre)
+    print(f"Computing TF-IDF keywords per bank ({tfidf_mode})...")
+    if tfidf_mode == "global":
+        # Vectorize once; every grouping reuses the same matrix
+        matrix, terms = fit_tfidf(df_pre)
+        tfidf = grouped_top_terms(df_pre, matrix, terms)
+        if by_month:
+            monthly = grouped_top_terms(df_pre, matrix, terms,
+                                        by=("bank_name", "month"))
+            with open(OUTPUT_DIR / "tfidf_top_terms_monthly.json", "w") as f:
+                json.dump(monthly, f, indent=2)
+    else:
+        tfidf = top_tfidf_per_bank(df_pre, mode=tfidf_mode)
 
-    import json
     with open(OUTPUT_DIR / "tfidf_top_terms.json", "w") as f:
         json.dump(tfidf, f, indent=2)
 
-    print("Running LDA for topic modeling...")
-    topics = lda_topics(df_pre, n_topics=8)
+    print(f"Running LDA for topic modeling ({lda_mode})...")
+    if lda_mode == "online":
+        topics, df_topics = online_lda_topics(df_pre, n_topics=LDA_TOPICS)
+        save_frame(df_topics, OUTPUT_DIR / "reviews_topics.csv")
+    else:
+        topics = lda_topics(df_pre, n_topics=LDA_TOPICS)
     with open(OUTPUT_DIR / "lda_topics.json", "w") as f:
         json.dump(topics, f, indent=2)
 
@@ -141,4 +336,4 @@ if __name__ == "__main__":
 
 
 if __name__ == "__main__":
-    main()
+    main(**vars(parse_args()))
@@ -5,9 +5,8 @@ This file provides:
 - a dictionary of theme -> keyword patterns
 - a function to label each review with 0/1 theme membership
 """
-import pandas as pd
 import re
-from utils import OUTPUT_DIR
+from utils import OUTPUT_DIR, frame_exists, load_frame, save_frame
 
 # --- Theme Definitions (No change needed here) ---
 THEME_KEYWORDS = {
@@ -37,13 +36,13 @@ def map_themes(text):
 def main():
     # 1. Load the file containing sentiment results and, hopefully, the cleaned review
     FILE_PATH = OUTPUT_DIR / "sentiment_results.csv"
-    if not FILE_PATH.exists():
+    if not frame_exists(FILE_PATH):
         # Fallback to the latest successful file if sentiment_results hasn't run yet
         FILE_PATH = OUTPUT_DIR / "reviews_cleaned.csv"
         print(
             f"Warning: sentiment_results.csv not found. Using {FILE_PATH.name} instead.")
 
-    df = pd.read_csv(FILE_PATH)
+    df = load_frame(FILE_PATH)
 
     # 2. Standardize the column name for text analysis
     TEXT_COL = "cleaned_review"
@@ -59,7 +58,7 @@ def main():
     df["themes"] = df[TEXT_COL].apply(map_themes)
 
     # 4. Save the results
-    df.to_csv(OUTPUT_DIR / "sentiment_thematic.csv", index=False)
+    save_frame(df, OUTPUT_DIR / "sentiment_thematic.csv")
     print("✅ Saved outputs/sentiment_thematic.csv")
 
 
@@ -0,0 +1,107 @@
+# src/task-2/lexicon_scorer.py
+"""
+Single-pass TextBlob + VADER scorer for _01_sentiment.
+
+Each review is parsed once by TextBlob (polarity and subjectivity from the
+same blob) and once by VADER, in chunks spread over a process pool; every
+worker builds its SentimentIntensityAnalyzer once. Labels are derived from
+the whole compound array at once.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+import nltk
+import numpy as np
+from textblob import TextBlob
+
+# Same NLTK data directory as _01_sentiment (needed in spawned workers)
+nltk_data_dir = Path.home() / "nltk_data"
+if str(nltk_data_dir) not in nltk.data.path:
+    nltk.data.path.append(str(nltk_data_dir))
+
+# Score cache versions
+TEXTBLOB_VERSION = metadata.version("textblob")
+SCORER_VERSION = f"textblob-{TEXTBLOB_VERSION}-nltk-{nltk.__version__}"
+
+# VADER compound thresholds used for sentiment_label
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+# One analyzer per process, built lazily (or by the pool initializer)
+analyzer = None
+
+
+def get_analyzer():
+    global analyzer
+    if analyzer is None:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        analyzer = SentimentIntensityAnalyzer()
+    return analyzer
+
+
+def score_chunk(texts):
+    """(polarity, subjectivity, compound) arrays for a list of texts."""
+    sid = get_analyzer()
+    polarity = np.empty(len(texts))
+    subjectivity = np.empty(len(texts))
+    compound = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        text = str(text)
+        sentiment = TextBlob(text).sentiment
+        polarity[i] = sentiment.polarity
+        subjectivity[i] = sentiment.subjectivity
+        compound[i] = sid.polarity_scores(text)["compound"]
+    return polarity, subjectivity, compound
+
+
+def labels_from_compound(compound):
+    """Vectorized positive / negative / neutral labels."""
+    compound = np.asarray(compound)
+    return np.select(
+        [compound >= POSITIVE_THRESHOLD, compound <= NEGATIVE_THRESHOLD],
+        ["positive", "negative"], default="neutral")
+
+
+def score_texts(texts, n_workers=None, chunksize=2000):
+    """Score texts in chunks, on a process pool when n_workers > 1."""
+    texts = list(texts)
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+    if n_workers <= 1 or len(chunks) <= 1:
+        results = [score_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 initializer=get_analyzer) as executor:
+            results = list(executor.map(score_chunk, chunks))
+    if not results:
+        return np.empty(0), np.empty(0), np.empty(0)
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def lexicon_sentiment(df, col_name, n_workers=None, chunksize=2000,
+                      cache=None):
+    """
+    Adds tb_polarity, tb_subjectivity, vader_compound, sentiment_label and
+    sentiment_score in one pass over df[col_name]. With a ScoreCache only
+    texts not scored before are run through the scorers.
+    """
+    texts = df[col_name].tolist()
+    if cache is None:
+        polarity, subjectivity, compound = score_texts(
+            texts, n_workers, chunksize)
+    else:
+        scores = np.array(cache.scores(
+            texts, "textblob+vader", SCORER_VERSION,
+            lambda batch: np.column_stack(
+                score_texts(batch, n_workers, chunksize)).tolist()),
+            dtype=float).reshape(-1, 3)
+        polarity, subjectivity, compound = scores.T
+    df["tb_polarity"] = polarity
+    df["tb_subjectivity"] = subjectivity
+    df["vader_compound"] = compound
+    df["sentiment_label"] = labels_from_compound(compound)
+    df["sentiment_score"] = compound
+    return df
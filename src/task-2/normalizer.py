@@ -0,0 +1,247 @@
+# src/task-2/normalizer.py
+"""
+Batched text normalizer for the cleaned_review column.
+
+Produces exactly what _00_preprocess.preprocess_text produces (lowercase,
+letters only, stopwords removed, WordNet lemmas) but:
+- loads the stopword set and the lemmatizer once per process
+- memoizes lemmas in a bounded LRU cache (review vocabularies are small)
+- tokenizes with a plain whitespace split, which is what word_tokenize
+  returns once the text is reduced to letters and whitespace (no sentence
+  punctuation left for punkt, no quotes for the treebank rules) apart from
+  its contraction splits, which are replicated
+- works on lists of texts, optionally spread over a process pool in chunks
+
+SpacyNormalizer is an alternative engine for big backfills: the same
+cleaned_review contract (lowercase letters-only lemmas, NLTK stopwords
+removed, space separated) with spaCy lemmas, streamed through nlp.pipe
+with a configurable batch_size and n_process. Lemmas can differ from
+WordNet's, so don't mix engines within one output.
+
+Benchmark against preprocess_text (run from src/task-2):
+    python normalizer.py --reviews 200000 --workers 4 [--spacy]
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import nltk
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+# Bump when the output of normalize() changes (cached results are keyed on it)
+NORMALIZER_VERSION = "nltk-1"
+
+NON_LETTERS = re.compile(r'[^a-z\s]')
+
+# word_tokenize splits these even without an apostrophe
+CONTRACTIONS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+# Same NLTK data directory as _00_preprocess (needed in spawned workers)
+nltk_data_dir = Path.home() / "nltk_data"
+if str(nltk_data_dir) not in nltk.data.path:
+    nltk.data.path.append(str(nltk_data_dir))
+
+
+class TextNormalizer:
+    """NLTK normalizer with resources loaded once and cached lemmas"""
+
+    version = NORMALIZER_VERSION
+
+    def __init__(self, cache_size=100_000):
+        self.stop_words = frozenset(stopwords.words("english"))
+        self.lemmatize = lru_cache(maxsize=cache_size)(
+            WordNetLemmatizer().lemmatize)
+
+    def tokenize(self, text):
+        tokens = []
+        for token in text.split():
+            tokens.extend(CONTRACTIONS.get(token, (token,)))
+        return tokens
+
+    def normalize(self, text):
+        if not isinstance(text, str):
+            return ""
+        text = NON_LETTERS.sub('', text.lower())
+        stop_words = self.stop_words
+        lemmatize = self.lemmatize
+        return " ".join(lemmatize(t) for t in self.tokenize(text)
+                        if t not in stop_words)
+
+    def normalize_batch(self, texts):
+        normalize = self.normalize
+        return [normalize(text) for text in texts]
+
+    def cache_info(self):
+        return self.lemmatize.cache_info()
+
+
+class SpacyNormalizer:
+    """
+    spaCy engine: tokenizer and lemmatizer only, texts streamed through
+    nlp.pipe. model='blank' uses a blank English pipeline with the lookup
+    lemmatizer (needs spacy-lookups-data); otherwise the named pipeline is
+    loaded without parser/NER, keeping only what its lemmatizer needs.
+    """
+
+    def __init__(self, model="en_core_web_sm", batch_size=1000, n_process=1):
+        import spacy
+
+        if model == "blank":
+            self.nlp = spacy.blank("en")
+            self.nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+            self.nlp.initialize()
+        else:
+            self.nlp = spacy.load(model, exclude=["parser", "ner", "senter"])
+            lemmatizer = self.nlp.get_pipe("lemmatizer")
+            # Components the lemmatizer does not need are not run at all
+            needed = {"lemmatizer"}
+            if lemmatizer.mode == "rule":
+                needed |= {"tok2vec", "tagger", "attribute_ruler"}
+            for name in self.nlp.pipe_names:
+                if name not in needed:
+                    self.nlp.disable_pipe(name)
+
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.stop_words = frozenset(stopwords.words("english"))
+        self.version = f"spacy-{spacy.__version__}-{model}"
+
+    def normalize_batch(self, texts):
+        stop_words = self.stop_words
+        letters_only = (NON_LETTERS.sub('', text.lower())
+                        if isinstance(text, str) else "" for text in texts)
+        docs = self.nlp.pipe(letters_only, batch_size=self.batch_size,
+                             n_process=self.n_process)
+        results = []
+        for doc in docs:
+            lemmas = (NON_LETTERS.sub('', token.lemma_.lower())
+                      for token in doc
+                      if not token.is_space and token.text not in stop_words)
+            results.append(" ".join(lemma for lemma in lemmas if lemma))
+        return results
+
+    def normalize(self, text):
+        return self.normalize_batch([text])[0]
+
+
+# One normalizer per pool worker, built by the pool initializer
+worker_normalizer = None
+
+
+def init_worker(cache_size):
+    global worker_normalizer
+    worker_normalizer = TextNormalizer(cache_size)
+
+
+def normalize_chunk(texts):
+    return worker_normalizer.normalize_batch(texts)
+
+
+def normalize_texts(texts, n_workers=1, chunksize=5000, cache_size=100_000):
+    """
+    Normalize a list of texts, in-process (n_workers=1) or on a process
+    pool in chunks of `chunksize` texts. Output order matches the input.
+    """
+    texts = list(texts)
+    if n_workers <= 1 or len(texts) <= chunksize:
+        return TextNormalizer(cache_size).normalize_batch(texts)
+
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker,
+                             initargs=(cache_size,)) as executor:
+        results = executor.map(normalize_chunk, chunks)
+        return [text for chunk in results for text in chunk]
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+SAMPLE_WORDS = (
+    "app bank transfer failed login otp slow crash update customer support "
+    "never replies money account balance the is very good bad easy use "
+    "working payments cannot gonna wanna fast service best worst please fix "
+    "transactions pending network errors updated opened closing features"
+).split()
+
+
+def synthetic_corpus(n_reviews, seed=42):
+    """Review-like texts with punctuation, digits and mixed case."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n_reviews):
+        words = [rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(3, 40))]
+        if rng.random() < 0.3:
+            words[0] = words[0].capitalize()
+        suffix = rng.choice([".", "!!", " 10/10", " 😡", ""])
+        texts.append(" ".join(words) + suffix)
+    return texts
+
+
+def timed(label, func, texts):
+    start = time.perf_counter()
+    result = func(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {len(texts):>8} reviews in {elapsed:7.2f}s "
+          f"-> {len(texts) / elapsed:10.0f} reviews/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text normalizer benchmark")
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--baseline-reviews", type=int, default=5_000,
+                        help="reviews run through the per-row preprocess_text")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--spacy", action="store_true",
+                        help="also time the spaCy engine")
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    parser.add_argument("--spacy-batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Importing _00_preprocess also downloads missing NLTK data
+    from _00_preprocess import preprocess_text
+
+    texts = synthetic_corpus(args.reviews)
+    baseline_texts = texts[:args.baseline_reviews]
+
+    print("=" * 60)
+    print("Text normalizer benchmark")
+    print("=" * 60)
+    expected = timed("preprocess_text (apply)",
+                     lambda t: [preprocess_text(x) for x in t], baseline_texts)
+
+    normalizer = TextNormalizer()
+    batch = timed("TextNormalizer (batch)", normalizer.normalize_batch, texts)
+    parallel = timed(
+        f"normalize_texts ({args.workers} procs)",
+        lambda t: normalize_texts(t, args.workers, args.chunksize), texts)
+
+    if args.spacy:
+        spacy_normalizer = SpacyNormalizer(
+            args.spacy_model, args.spacy_batch_size, args.workers)
+        timed(f"SpacyNormalizer ({args.workers} procs)",
+              spacy_normalizer.normalize_batch, texts)
+
+    assert batch[:len(expected)] == expected, "batch output differs"
+    assert parallel == batch, "parallel output differs"
+    print(f"\nOutputs identical. Lemma cache: {normalizer.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
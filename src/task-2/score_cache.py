@@ -0,0 +1,37 @@
+# src/task-2/score_cache.py
+"""
+Persistent sentiment score cache for _01_sentiment.
+
+Scores are stored per (scorer name, scorer version, text) in a
+sqlite_cache.SQLiteCache, so a review is only scored again when its text
+changes or the scorer does. Values are a number or a list such as
+[label, score]. Hits and misses are counted per scorer for the run summary.
+"""
+
+from sqlite_cache import SQLiteCache
+
+
+class ScoreCache(SQLiteCache):
+    """Score cache with per-scorer hit counters"""
+
+    def __init__(self, path, max_entries=5_000_000):
+        super().__init__(path, max_entries)
+        self.hits = {}
+        self.misses = {}
+
+    def scores(self, texts, scorer, version, score_batch):
+        """
+        One score per text: cached ones are reused, the rest (deduplicated)
+        go through score_batch(list_of_texts) and are stored.
+        """
+        values, hits, misses = self.lookup(texts, scorer, version, score_batch)
+        self.hits[scorer] = self.hits.get(scorer, 0) + hits
+        self.misses[scorer] = self.misses.get(scorer, 0) + misses
+        return values
+
+    def print_summary(self):
+        for scorer in self.hits:
+            total = self.hits[scorer] + self.misses[scorer]
+            rate = self.hits[scorer] / total * 100 if total else 0.0
+            print(f"Score cache [{scorer}]: {self.hits[scorer]}/{total} hits "
+                  f"({rate:.1f}%), {self.misses[scorer]} scored")
@@ -0,0 +1,279 @@
+# src/task-2/scoring_service.py
+"""
+Long-lived local sentiment scoring service.
+
+Loads the transformer model once and serves it over HTTP on localhost, so
+_01_sentiment, notebooks, the DB loader or the scraper can all reuse a warm
+model:
+
+    POST /score     {"texts": [...]}  -> {"results": [[label, score], ...]}
+                    (null for a review that could not be scored)
+    GET  /info      model version and batching settings
+    GET  /metrics   throughput, batch sizes, latency percentiles
+
+Concurrent requests are coalesced into dynamic micro-batches: a batch is
+run as soon as it holds max_batch_size texts, or max_wait_ms after its
+first text arrived, whichever comes first. Inference runs in a worker
+thread so the event loop keeps accepting requests meanwhile.
+
+Run (from src/task-2):
+    python scoring_service.py --port 8766 --max-batch 64 --max-wait-ms 10
+and set SCORING_SERVICE_URL in _01_sentiment to use it.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from collections import deque
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Coalesces queued texts into batches and scores them off the loop"""
+
+    def __init__(self, scorer, max_batch_size=64, max_wait_ms=10):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.started = time.monotonic()
+        self.reviews = 0
+        self.batches = 0
+        self.failed = 0
+        self.batch_latencies = deque(maxlen=10_000)
+
+    async def submit(self, texts):
+        """Queue texts and wait for their (label, score) results."""
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, future in zip(texts, futures):
+            self.queue.put_nowait((text, future))
+        return await asyncio.gather(*futures)
+
+    async def collect(self):
+        """Next batch: wait for one text, then fill until full or deadline."""
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect()
+            texts = [text for text, _ in batch]
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(
+                    None, self.scorer.score, texts)
+            except Exception as e:
+                # Requests coalesced into this batch still get an answer:
+                # null for each of their reviews, like a failed model batch
+                print(f"Batch of {len(batch)} reviews failed: {e}")
+                results = [None] * len(batch)
+            self.batch_latencies.append(time.perf_counter() - start)
+            self.reviews += len(batch)
+            self.batches += 1
+            self.failed += sum(result is None for result in results)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class ScoringService:
+    """asyncio HTTP front end around a MicroBatcher"""
+
+    def __init__(self, scorer, max_batch_size=64, max_wait_ms=10):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batcher = None
+        self.requests = 0
+        self.request_latencies = deque(maxlen=10_000)
+
+    def info(self):
+        return {
+            "version": getattr(self.scorer, "version", "unknown"),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+    def metrics(self):
+        batcher = self.batcher
+        uptime = time.monotonic() - batcher.started
+        metrics = {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "reviews": batcher.reviews,
+            "failed": batcher.failed,
+            "batches": batcher.batches,
+            "mean_batch_size": batcher.reviews / max(batcher.batches, 1),
+            "reviews_per_s": batcher.reviews / uptime if uptime else 0.0,
+            "queued": batcher.queue.qsize(),
+        }
+        for name, values in (("request", self.request_latencies),
+                             ("batch", batcher.batch_latencies)):
+            values = np.array(values) * 1000
+            for p in (50, 90, 99):
+                metrics[f"{name}_p{p}_ms"] = float(np.percentile(values, p)) \
+                    if len(values) else 0.0
+        return metrics
+
+    async def route(self, method, path, body):
+        """Returns (status, payload)."""
+        if method == "GET" and path == "/info":
+            return 200, self.info()
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics()
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "POST" and path == "/score":
+            try:
+                texts = [str(text) for text in json.loads(body)["texts"]]
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": "expected JSON body {\"texts\": [...]}"}
+            start = time.perf_counter()
+            results = await self.batcher.submit(texts)
+            self.requests += 1
+            self.request_latencies.append(time.perf_counter() - start)
+            # Reviews that could not be scored are sent as null
+            return 200, {"results": [None if result is None else list(result)
+                                     for result in results]}
+        return 404, {"error": f"no route for {method} {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode().split()
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0], request_line[1]
+            length = 0
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length) if length else b""
+
+            try:
+                status, payload = await self.route(method, path, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            data = json.dumps(payload).encode()
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(
+                status, "Internal Server Error")
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n".encode() + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8766, ready=None):
+        self.batcher = MicroBatcher(
+            self.scorer, self.max_batch_size, self.max_wait_ms)
+        batch_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Scoring service listening on http://{address[0]}:{address[1]}")
+        if ready is not None:
+            ready(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+class ScoringClient:
+    """Client for the scoring service, usable in place of a scorer"""
+
+    def __init__(self, url, chunk_size=256, timeout=300):
+        self.url = url.rstrip("/")
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.last_stats = None
+
+    def get(self, path):
+        with urllib.request.urlopen(self.url + path,
+                                    timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    @property
+    def version(self):
+        return self.get("/info")["version"]
+
+    def metrics(self):
+        return self.get("/metrics")
+
+    def score(self, texts):
+        """(label, signed score) per text, sent in chunks of chunk_size."""
+        from transformer_scorer import latency_summary
+
+        texts = [str(text) for text in texts]
+        start = time.perf_counter()
+        results, latencies, sizes = [], [], []
+        for i in range(0, len(texts), self.chunk_size):
+            chunk = texts[i:i + self.chunk_size]
+            request = urllib.request.Request(
+                self.url + "/score",
+                data=json.dumps({"texts": chunk}).encode(),
+                headers={"Content-Type": "application/json"})
+            chunk_start = time.perf_counter()
+            with urllib.request.urlopen(request,
+                                        timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+            latencies.append(time.perf_counter() - chunk_start)
+            sizes.append(len(chunk))
+            # None marks a review the service failed to score
+            results.extend(None if result is None else tuple(result)
+                           for result in payload["results"])
+        self.last_stats = latency_summary(
+            latencies, sizes, len(texts), time.perf_counter() - start)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local sentiment scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--model-dir", default=None,
+                        help="local model directory "
+                             "(default: download by name)")
+    parser.add_argument("--backend", default="torch",
+                        help="'torch', 'int8' or 'onnx'")
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    from transformer_scorer import MODEL_NAME, TransformerScorer
+
+    print("Loading model...")
+    scorer = TransformerScorer(args.model_dir or MODEL_NAME,
+                               batch_size=args.max_batch,
+                               num_threads=args.threads, backend=args.backend)
+    service = ScoringService(scorer, args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nScoring service stopped")
+
+
+if __name__ == "__main__":
+    main()
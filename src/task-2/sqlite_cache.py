@@ -0,0 +1,118 @@
+# src/task-2/sqlite_cache.py
+"""
+Persistent, content-addressed SQLite cache shared by the task-2 steps
+(text_cache for cleaned text, score_cache for sentiment scores).
+
+Entries are keyed by (namespace, version, sha1 of the text), so a value is
+only computed again when the text changes or whatever produced it does
+(bump its version). Values are stored as JSON. The cache is a single
+SQLite file capped at `max_entries`; the least recently used entries are
+evicted first.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+# Keys per SQL statement (below SQLite's host parameter limit)
+BATCH = 500
+
+
+def text_hash(text):
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """(namespace, version, key) -> value store with LRU eviction"""
+
+    def __init__(self, path, max_entries):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, version TEXT NOT NULL,"
+            " key TEXT NOT NULL, value TEXT NOT NULL,"
+            " last_used INTEGER NOT NULL,"
+            " PRIMARY KEY (namespace, version, key))")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used"
+            " ON entries (last_used)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_many(self, namespace, version, keys):
+        """Cached values for the keys that are present; marks them as used."""
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), BATCH):
+            batch = keys[i:i + BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                "SELECT key, value FROM entries"
+                " WHERE namespace = ? AND version = ?"
+                f" AND key IN ({placeholders})", [namespace, version, *batch])
+            found.update((key, json.loads(value)) for key, value in rows)
+        # Nanoseconds, so reads within the same second keep their order
+        now = time.time_ns()
+        self.conn.executemany(
+            "UPDATE entries SET last_used = ?"
+            " WHERE namespace = ? AND version = ? AND key = ?",
+            ((now, namespace, version, key) for key in found))
+        self.conn.commit()
+        return found
+
+    def put_many(self, namespace, version, items):
+        """Store (key, value) pairs, then evict down to max_entries."""
+        now = time.time_ns()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries"
+            " (namespace, version, key, value, last_used)"
+            " VALUES (?, ?, ?, ?, ?)",
+            ((namespace, version, key, json.dumps(value), now)
+             for key, value in items))
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM entries WHERE rowid IN ("
+                " SELECT rowid FROM entries ORDER BY last_used LIMIT ?)",
+                (excess,))
+
+    def lookup(self, texts, namespace, version, compute_batch):
+        """
+        One value per text: cached ones are reused, the rest (deduplicated)
+        go through compute_batch(list_of_texts) and are stored.
+        compute_batch returns None for a text it failed on; that None is
+        passed through but not stored, so the text is computed again on
+        the next run. Returns (values, hits, misses).
+        """
+        keys = [text_hash(text) for text in texts]
+        cached = self.get_many(namespace, version, set(keys))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+        if missing:
+            new_entries = dict(zip(missing.keys(),
+                                   compute_batch(list(missing.values()))))
+            self.put_many(namespace, version,
+                          ((key, value) for key, value in new_entries.items()
+                           if value is not None))
+            cached.update(new_entries)
+
+        misses = sum(1 for key in keys if key in missing)
+        return [cached[key] for key in keys], len(keys) - misses, misses
+
+    def close(self):
+        self.conn.close()
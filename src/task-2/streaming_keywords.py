@@ -0,0 +1,134 @@
+# src/task-2/streaming_keywords.py
+"""
+Out-of-core TF-IDF keywords per bank.
+
+Reads the cleaned corpus in chunks (Script.storage.iter_frames) and hashes
+n-grams into a fixed number of features, so no vocabulary has to be fitted
+and memory stays bounded however many reviews there are:
+- document frequencies: one int32 array of n_features
+- per-bank sums of the l2-normalized term counts: one sparse row per bank
+- a reverse-lookup sketch mapping hash buckets back to readable terms
+
+At the end idf is applied to the per-bank sums and the top buckets are
+named through the sketch. Because idf is only known after the last chunk,
+it is applied after the per-review normalization, so scores are close to
+(not identical to) those of the in-memory TfidfVectorizer modes.
+
+The sketch (term_sketch.TermSketch, shared with the online topic model)
+keeps the dominant term per bucket; a bucket without a name shows as
+'#<index>'.
+
+Run (from src/task-2):
+    python streaming_keywords.py --chunksize 50000
+or pass --tfidf-mode streaming to _02_keywords_topics.py.
+"""
+
+import argparse
+import json
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from _02_keywords_topics import group_indicator, top_terms_per_row
+from term_sketch import SKETCH_SIZE, TermSketch
+from utils import OUTPUT_DIR, frame_exists, iter_frames
+
+N_FEATURES = 2 ** 20
+
+
+class StreamingKeywords:
+    """Incremental per-bank TF-IDF statistics over hashed n-grams"""
+
+    def __init__(self, ngram_range=(1, 2), n_features=N_FEATURES,
+                 sketch_size=SKETCH_SIZE):
+        # Same tokenization as the TfidfVectorizer modes
+        self.analyzer = HashingVectorizer(ngram_range=ngram_range) \
+            .build_analyzer()
+        self.hasher = FeatureHasher(n_features=n_features,
+                                    input_type="string", alternate_sign=False)
+        self.n_features = n_features
+        self.n_docs = 0
+        self.doc_freq = np.zeros(n_features, dtype=np.int32)
+        self.bank_sums = {}
+        self.sketch = TermSketch(n_features, sketch_size)
+
+    def partial_fit(self, texts, banks):
+        """Add one chunk of cleaned texts and their bank names."""
+        tokens = [self.analyzer(text) for text in texts]
+        counts = self.hasher.transform(tokens).tocsr()
+        counts.sum_duplicates()
+        self.sketch.update(Counter(chain.from_iterable(tokens)))
+        self.doc_freq += np.bincount(
+            counts.indices, minlength=self.n_features).astype(np.int32)
+        self.n_docs += counts.shape[0]
+
+        groups, indicator = group_indicator(np.asarray(banks, dtype=object))
+        sums = (indicator @ normalize(counts)).tocsr()
+        for g, bank in enumerate(groups):
+            previous = self.bank_sums.get(bank)
+            self.bank_sums[bank] = sums[g] if previous is None \
+                else previous + sums[g]
+        return self
+
+    def idf(self):
+        """Smoothed idf, as TfidfVectorizer computes it."""
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+
+    def top_terms(self, top_n=30):
+        """[{"bank": ..., "top_terms": [(term, score), ...]}], banks sorted."""
+        banks = sorted(self.bank_sums)
+        if not banks:
+            return []
+        scores = sparse.vstack([self.bank_sums[b] for b in banks]) \
+            .multiply(self.idf()).tocsr()
+        top = top_terms_per_row(scores, self.sketch, top_n)
+        return [{"bank": bank, "top_terms": terms}
+                for bank, terms in zip(banks, top)]
+
+
+def streaming_top_terms(path, chunksize=50000, top_n=30,
+                        n_features=N_FEATURES, sketch_size=SKETCH_SIZE):
+    """Top TF-IDF terms per bank of a cleaned review table, chunk by chunk."""
+    keywords = StreamingKeywords(n_features=n_features,
+                                 sketch_size=sketch_size)
+    for chunk in iter_frames(path, chunksize,
+                             columns=["bank_name", "cleaned_review"]):
+        keywords.partial_fit(chunk["cleaned_review"].fillna("").astype(str),
+                             chunk["bank_name"].astype(object))
+    print(f"Hashed {keywords.n_docs} reviews, "
+          f"{len(keywords.sketch.entries)} terms in the lookup sketch")
+    return keywords.top_terms(top_n)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Out-of-core TF-IDF keywords per bank")
+    parser.add_argument("--input",
+                        default=str(OUTPUT_DIR / "reviews_cleaned.csv"))
+    parser.add_argument("--output",
+                        default=str(OUTPUT_DIR / "tfidf_top_terms.json"))
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--top-n", type=int, default=30)
+    parser.add_argument("--n-features", type=int, default=N_FEATURES)
+    parser.add_argument("--sketch-size", type=int, default=SKETCH_SIZE)
+    args = parser.parse_args()
+
+    if not frame_exists(args.input):
+        raise FileNotFoundError(
+            f"Expected file not found at {args.input}. "
+            "Please ensure you run the previous script (00_preprocess.py) "
+            "first.")
+    results = streaming_top_terms(args.input, args.chunksize, args.top_n,
+                                  args.n_features, args.sketch_size)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# src/task-2/term_sketch.py
+"""
+Bounded reverse lookup from hash buckets to readable terms, for the hashed
+feature spaces of streaming_keywords and topic_model.
+
+The sketch keeps, per bucket, the term that dominates it (a majority vote
+weighted by counts) and is pruned to its most frequent entries when it
+grows past max_entries. Frequent terms, which are the ones that reach the
+top lists, survive pruning.
+"""
+
+import heapq
+
+from sklearn.utils import murmurhash3_32
+
+SKETCH_SIZE = 200_000
+
+
+class TermSketch:
+    """Bounded hash bucket -> dominant term map"""
+
+    def __init__(self, n_features, max_entries=SKETCH_SIZE):
+        self.n_features = n_features
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def bucket(self, term):
+        # Same bucket as FeatureHasher / HashingVectorizer
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def update(self, term_counts):
+        for term, count in term_counts.items():
+            index = self.bucket(term)
+            entry = self.entries.get(index)
+            if entry is None:
+                self.entries[index] = [term, count]
+            elif entry[0] == term:
+                entry[1] += count
+            elif entry[1] > count:
+                entry[1] -= count
+            else:
+                self.entries[index] = [term, count - entry[1]]
+        if len(self.entries) > self.max_entries:
+            self.prune()
+
+    def prune(self):
+        """Keep the most frequent half, so pruning is amortized."""
+        keep = heapq.nlargest(self.max_entries // 2, self.entries.items(),
+                              key=lambda item: item[1][1])
+        self.entries = dict(keep)
+
+    def __getitem__(self, index):
+        entry = self.entries.get(int(index))
+        return entry[0] if entry else f"#{index}"
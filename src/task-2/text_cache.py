@@ -0,0 +1,29 @@
+# src/task-2/text_cache.py
+"""
+Persistent cache of cleaned review text.
+
+Cleaned text is stored per (normalizer version, raw text) in a
+sqlite_cache.SQLiteCache, so a review is only normalized again when its
+text changes or the normalizer does (bump its version).
+"""
+
+from sqlite_cache import SQLiteCache
+
+NAMESPACE = "cleaned_text"
+
+
+class CleanTextCache(SQLiteCache):
+    """Cleaned text cache with LRU eviction"""
+
+    def __init__(self, path, max_entries=2_000_000):
+        super().__init__(path, max_entries)
+
+
+def cached_normalize(texts, normalize_batch, version, cache):
+    """
+    Normalize texts, looking each one up in the cache first.
+    Only missing (deduplicated) texts go through normalize_batch.
+    Returns (cleaned_texts, hits, misses).
+    """
+    texts = ["" if not isinstance(text, str) else text for text in texts]
+    return cache.lookup(texts, NAMESPACE, version, normalize_batch)
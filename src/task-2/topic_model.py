@@ -0,0 +1,225 @@
+# src/task-2/topic_model.py
+"""
+Online, incrementally updatable LDA topic model for _02_keywords_topics.
+
+Reviews are tokenized like the TF-IDF modes and their n-grams hashed into
+a fixed number of features (the HashingVectorizer buckets), so there is no
+vocabulary to fit: the model is updated with mini-batch partial_fit as new
+reviews arrive instead of being refit over the whole history, and terms
+first seen in a later chunk or run are learned like any other. Streamed
+results therefore do not depend on chunk order or chunksize beyond the
+usual order sensitivity of online LDA. Document frequencies and a
+term_sketch.TermSketch are kept alongside, so topics() can name the
+buckets and apply max_df / min_df when listing top terms (the model itself
+is trained on every term).
+
+Vectorizer and model are persisted together with joblib. The ids of the
+reviews already trained on live in a SQLite index next to it
+(<model>.ids.sqlite, see TrainedIndex), so memory and model size do not
+grow with the corpus: each update only looks up the ids it is given.
+Delete both files (or pass refit=True to load_or_create) to start over.
+
+Per-review topic distributions come from transform and are returned as
+topic_0 ... topic_<k-1> plus dominant_topic columns.
+"""
+
+import sqlite3
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from sqlite_cache import BATCH, text_hash
+from term_sketch import SKETCH_SIZE, TermSketch
+
+# Hashed feature space of the topic model (LDA keeps two dense
+# n_topics x n_features matrices)
+N_FEATURES = 2 ** 18
+
+
+def index_path(model_path):
+    """Trained-id index stored next to a saved model."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name + ".ids.sqlite")
+
+
+class TrainedIndex:
+    """On-disk set of the review keys a model was trained on"""
+
+    def __init__(self, path=":memory:"):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS trained (key TEXT PRIMARY KEY)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM trained").fetchone()[0]
+
+    def contains(self, keys):
+        """Boolean array: which of keys are in the index."""
+        keys = list(keys)
+        found = set()
+        unique = list(set(keys))
+        for i in range(0, len(unique), BATCH):
+            batch = unique[i:i + BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key FROM trained WHERE key IN ({placeholders})",
+                batch)
+            found.update(key for key, in rows)
+        return np.fromiter((key in found for key in keys), dtype=bool,
+                           count=len(keys))
+
+    def add(self, keys):
+        """Stage keys; they are persisted by the next commit()."""
+        self.conn.executemany("INSERT OR IGNORE INTO trained VALUES (?)",
+                              ((key,) for key in keys))
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class OnlineTopicModel:
+    """Hashed n-gram counts + online LatentDirichletAllocation"""
+
+    def __init__(self, n_topics=8, batch_size=2048, n_jobs=None,
+                 max_df=0.95, min_df=5, ngram_range=(1, 2),
+                 n_features=N_FEATURES, sketch_size=SKETCH_SIZE,
+                 total_samples=1_000_000, random_state=42):
+        self.batch_size = batch_size
+        self.max_df = max_df
+        self.min_df = min_df
+        self.ngram_range = ngram_range
+        self.hasher = FeatureHasher(n_features=n_features,
+                                    input_type="string", alternate_sign=False)
+        self.doc_freq = np.zeros(n_features, dtype=np.int32)
+        self.sketch = TermSketch(n_features, sketch_size)
+        self.lda = LatentDirichletAllocation(
+            n_components=n_topics, learning_method="online",
+            batch_size=batch_size, total_samples=total_samples,
+            n_jobs=n_jobs, random_state=random_state)
+        # Attached by load_or_create; not pickled with the model
+        self.index = TrainedIndex()
+        self.n_docs_seen = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["index"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.index = TrainedIndex()
+
+    def tokenize(self, corpus):
+        # Same tokenization as the TF-IDF modes
+        analyzer = HashingVectorizer(ngram_range=self.ngram_range) \
+            .build_analyzer()
+        return [analyzer(text) for text in corpus]
+
+    def counts(self, tokens):
+        counts = self.hasher.transform(tokens).tocsr()
+        counts.sum_duplicates()
+        return counts
+
+    def partial_fit(self, corpus):
+        """Update the model with a corpus, in mini-batches of batch_size."""
+        tokens = self.tokenize(corpus)
+        if not tokens:
+            return self
+        dtm = self.counts(tokens)
+        self.sketch.update(Counter(chain.from_iterable(tokens)))
+        self.doc_freq += np.bincount(
+            dtm.indices, minlength=dtm.shape[1]).astype(np.int32)
+        for start in range(0, dtm.shape[0], self.batch_size):
+            self.lda.partial_fit(dtm[start:start + self.batch_size])
+        self.n_docs_seen += len(tokens)
+        return self
+
+    def update(self, df, text_col="cleaned_review", id_col="review_id"):
+        """
+        Train on the rows of df not trained on before (by id_col, or by
+        text hash when df has no id column). Returns the number of rows used.
+        """
+        texts = df[text_col].fillna("").astype(str)
+        keys = df[id_col].astype(str) if id_col in df.columns \
+            else texts.map(text_hash)
+        new = ~self.index.contains(keys)
+        self.partial_fit(texts[new].tolist())
+        self.index.add(keys[new])
+        return int(new.sum())
+
+    def transform(self, corpus):
+        """Topic distribution per document (rows sum to 1)."""
+        dtm = self.counts(self.tokenize(corpus))
+        return self.lda.transform(dtm).astype(np.float32)
+
+    def topics(self, top_n=15):
+        """
+        Top terms per topic, in the format of lda_topics.json. Buckets
+        outside [min_df, max_df] or without a name in the sketch are
+        skipped.
+        """
+        max_df = self.max_df if isinstance(self.max_df, int) \
+            else self.max_df * self.n_docs_seen
+        listed = (self.doc_freq >= self.min_df) & (self.doc_freq <= max_df)
+        named = np.zeros_like(listed)
+        named[list(self.sketch.entries)] = True
+        listed &= named
+        topics = []
+        for comp in self.lda.components_:
+            order = comp.argsort()[::-1]
+            topics.append([self.sketch[t] for t in order[listed[order]]
+                           [:top_n]])
+        return topics
+
+    def save(self, path):
+        """Save the model, then commit the ids it was trained on."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        self.index.commit()
+
+    @classmethod
+    def load_or_create(cls, path, refit=False, **kwargs):
+        """
+        The model saved at path, or a new one built with kwargs, with its
+        trained-id index opened next to path.
+        """
+        ids_path = index_path(path)
+        model = None
+        if Path(path).exists() and not refit:
+            model = joblib.load(path)
+            # Runtime settings may change between runs
+            if "n_jobs" in kwargs:
+                model.lda.n_jobs = kwargs["n_jobs"]
+        if model is not None and not hasattr(model, "hasher"):
+            print(f"{path} has a fixed-vocabulary model; "
+                  "retraining it on hashed features")
+            model = None
+        if model is None:
+            model = cls(**kwargs)
+            if ids_path.exists():
+                ids_path.unlink()
+        model.index = TrainedIndex(ids_path)
+        return model
+
+
+def topic_columns(doc_topic):
+    """topic_0 ... topic_<k-1> and dominant_topic as a DataFrame."""
+    columns = pd.DataFrame(
+        doc_topic,
+        columns=[f"topic_{i}" for i in range(doc_topic.shape[1])])
+    columns["dominant_topic"] = doc_topic.argmax(axis=1).astype(np.int16)
+    return columns
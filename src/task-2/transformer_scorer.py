@@ -0,0 +1,346 @@
+# src/task-2/transformer_scorer.py
+"""
+Batched transformer sentiment inference for _01_sentiment.
+
+Instead of one pipeline call per review, texts are tokenized a chunk of
+a few thousand at a time (truncated to max_length tokens, not characters),
+sorted by token length within the chunk and run through the model in
+batches of similar length, so little compute is spent on padding and
+memory depends on the chunk size, not on the corpus size. Results come
+back in input order with the same (label, signed score) mapping the
+per-review version used.
+
+torch intra-op threads and the batch size are configurable; every run
+records throughput and batch latency percentiles in `last_stats`.
+
+Backends (all CPU friendly, all loadable offline from a local model
+directory saved with save_pretrained):
+- 'torch': full-precision PyTorch
+- 'int8': PyTorch with dynamic int8 quantization of the Linear layers
+- 'onnx': <model_dir>/model.onnx under ONNX Runtime (see export_onnx)
+
+Compare accuracy and speed of the backends on a labeled sample
+(run from src/task-2):
+    python transformer_scorer.py --model-dir models/distilbert-sst2 --export
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+BACKENDS = ("torch", "int8", "onnx")
+# Model files that identify a local checkpoint in its cache version
+WEIGHT_SUFFIXES = (".safetensors", ".bin", ".onnx")
+
+# Predictions below this confidence are reported as neutral
+NEUTRAL_THRESHOLD = 0.6
+
+
+def to_label(label, score):
+    """(label, signed score) in the format of _01_sentiment."""
+    label = label.lower()
+    signed = score if label == "positive" else -score
+    if score < NEUTRAL_THRESHOLD:
+        return ("neutral", signed)
+    return (label, signed)
+
+
+def latency_summary(batch_latencies, batch_sizes, n_texts, elapsed):
+    """Throughput plus batch and per-review latency percentiles (ms)."""
+    latencies = np.array(batch_latencies) * 1000
+    per_review = latencies / np.maximum(np.array(batch_sizes), 1)
+    summary = {
+        "reviews": n_texts,
+        "seconds": elapsed,
+        "reviews_per_s": n_texts / elapsed if elapsed else 0.0,
+        "batches": len(batch_latencies),
+    }
+    for p in (50, 90, 99):
+        has_batches = len(latencies) > 0
+        summary[f"batch_p{p}_ms"] = float(np.percentile(latencies, p)) \
+            if has_batches else 0.0
+        summary[f"review_p{p}_ms"] = float(np.percentile(per_review, p)) \
+            if has_batches else 0.0
+    return summary
+
+
+def print_summary(summary):
+    print(f"Scored {summary['reviews']} reviews in {summary['seconds']:.2f}s "
+          f"({summary['reviews_per_s']:.1f} reviews/s, "
+          f"{summary['batches']} batches)")
+    print(f"Batch latency  p50/p90/p99: {summary['batch_p50_ms']:.1f} / "
+          f"{summary['batch_p90_ms']:.1f} / {summary['batch_p99_ms']:.1f} ms")
+    print(f"Review latency p50/p90/p99: {summary['review_p50_ms']:.2f} / "
+          f"{summary['review_p90_ms']:.2f} / "
+          f"{summary['review_p99_ms']:.2f} ms")
+
+
+def softmax(logits):
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def export_onnx(model_dir, onnx_path=None, opset=14):
+    """
+    Export the PyTorch model in model_dir to ONNX (default
+    <model_dir>/model.onnx) with dynamic batch and sequence axes.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    onnx_path = onnx_path or os.path.join(model_dir, "model.onnx")
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_dir, local_files_only=True)
+    model.eval()
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = [name for name in ("input_ids", "attention_mask")
+             if name in sample]
+    torch.onnx.export(
+        model, tuple(sample[name] for name in names), onnx_path,
+        input_names=names, output_names=["logits"],
+        dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in names},
+                      "logits": {0: "batch"}},
+        opset_version=opset)
+    print(f"Exported ONNX model to {onnx_path}")
+    return onnx_path
+
+
+class TransformerScorer:
+    """Length-bucketed, batched sequence classification on CPU/GPU"""
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=32, max_length=512,
+                 num_threads=None, backend="torch", chunk_size=4096):
+        from transformers import AutoConfig, AutoTokenizer
+
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}'. Expected one of {BACKENDS}")
+        # A local directory is used as-is, without reaching the Hub
+        local = os.path.isdir(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            model_name, local_files_only=local)
+        self.id2label = AutoConfig.from_pretrained(
+            model_name, local_files_only=local).id2label
+        self.backend = backend
+        if backend == "onnx":
+            self.load_onnx(model_name, num_threads)
+        else:
+            self.load_torch(model_name, local, num_threads,
+                            quantize=backend == "int8")
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.chunk_size = chunk_size
+        self.version = self.version_for(model_name, backend)
+        self.last_stats = None
+
+    @staticmethod
+    def version_for(model_name, backend="torch"):
+        """
+        Scorer version (score cache key) without loading the model.
+        Hub models are keyed by their full name; a local directory by its
+        name plus a hash of its resolved path, config and weight files
+        (name, size, mtime), so two checkpoints never share scores.
+        """
+        if not os.path.isdir(model_name):
+            return f"{model_name}-{backend}"
+        model_dir = Path(model_name).resolve()
+        digest = hashlib.sha1(str(model_dir).encode("utf-8"))
+        config = model_dir / "config.json"
+        if config.exists():
+            digest.update(config.read_bytes())
+        for path in sorted(model_dir.iterdir()):
+            if path.suffix in WEIGHT_SUFFIXES:
+                stat = path.stat()
+                digest.update(
+                    f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return f"{model_dir.name}-{digest.hexdigest()[:12]}-{backend}"
+
+    def load_torch(self, model_name, local, num_threads, quantize):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.torch = torch
+        self.model = AutoModelForSequenceClassification.from_pretrained(
+            model_name, local_files_only=local)
+        self.model.eval()
+        if quantize:
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def load_onnx(self, model_dir, num_threads):
+        import onnxruntime as ort
+
+        onnx_path = os.path.join(model_dir, "model.onnx")
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(
+                f"{onnx_path} not found. "
+                f"Run export_onnx('{model_dir}') first.")
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            onnx_path, options, providers=["CPUExecutionProvider"])
+        self.onnx_inputs = [i.name for i in self.session.get_inputs()]
+
+    def predict_batch(self, encodings):
+        """Class probabilities for a list of tokenized (unpadded) texts."""
+        if self.backend == "onnx":
+            batch = self.tokenizer.pad(encodings, return_tensors="np")
+            logits = self.session.run(
+                None, {name: batch[name].astype(np.int64)
+                       for name in self.onnx_inputs})[0]
+            return softmax(logits)
+
+        batch = self.tokenizer.pad(encodings, return_tensors="pt")
+        with self.torch.inference_mode():
+            logits = self.model(**batch).logits
+        return softmax(logits.float().numpy())
+
+    def score(self, texts):
+        """
+        Returns one (label, signed score) per text, in input order.
+        Texts in a batch that fails get None instead, so callers (and the
+        score cache) can tell them from a real neutral prediction.
+        """
+        texts = [str(text) for text in texts]
+        start = time.perf_counter()
+        results = [None] * len(texts)
+        failed = 0
+        batch_latencies, batch_sizes = [], []
+        for c in range(0, len(texts), self.chunk_size):
+            chunk = texts[c:c + self.chunk_size]
+            encoded = self.tokenizer(chunk, truncation=True,
+                                     max_length=self.max_length)
+            input_ids = encoded["input_ids"]
+            # Longest first: the slowest batches run while memory is fresh
+            order = sorted(range(len(chunk)),
+                           key=lambda i: -len(input_ids[i]))
+
+            for b in range(0, len(order), self.batch_size):
+                indices = order[b:b + self.batch_size]
+                batch_start = time.perf_counter()
+                try:
+                    probs = self.predict_batch([
+                        {key: encoded[key][i] for key in encoded.keys()}
+                        for i in indices])
+                except Exception as e:
+                    print(f"Batch of {len(indices)} reviews failed: {e}")
+                    failed += len(indices)
+                    continue
+                finally:
+                    batch_latencies.append(time.perf_counter() - batch_start)
+                    batch_sizes.append(len(indices))
+                for i, row in zip(indices, probs):
+                    best = int(row.argmax())
+                    results[c + i] = to_label(
+                        self.id2label[best], float(row[best]))
+
+        self.last_stats = latency_summary(
+            batch_latencies, batch_sizes, len(texts),
+            time.perf_counter() - start)
+        self.last_stats["failed"] = failed
+        if failed:
+            print(f"{failed} of {len(texts)} reviews could not be scored")
+        return results
+
+
+# -------------------------------
+# Backend comparison
+# -------------------------------
+
+
+def labeled_sample(path=None, n=2000, seed=42):
+    """
+    (texts, labels) for the comparison. A CSV with 'text' and 'label'
+    (positive/negative) columns, or by default processed reviews labeled
+    by rating (4-5 positive, 1-2 negative; 3 stars are left out).
+    """
+    import pandas as pd
+    from utils import load_reviews
+
+    if path:
+        df = pd.read_csv(path)[["text", "label"]]
+    else:
+        df = load_reviews(columns=["review_text", "rating"])
+        df = df[df["rating"] != 3]
+        df = pd.DataFrame({
+            "text": df["review_text"],
+            "label": np.where(df["rating"] >= 4, "positive", "negative")})
+    df = df.dropna()
+    df = df.sample(min(n, len(df)), random_state=seed)
+    return df["text"].astype(str).tolist(), df["label"].str.lower().tolist()
+
+
+def compare_backends(model_dir, texts, labels, backends=BACKENDS,
+                     batch_size=32, num_threads=None):
+    """Accuracy (ignoring the neutral band) and speed for each backend."""
+    rows = []
+    for backend in backends:
+        try:
+            scorer = TransformerScorer(model_dir, batch_size=batch_size,
+                                       num_threads=num_threads,
+                                       backend=backend)
+        except Exception as e:
+            print(f"Skipping {backend}: {e}")
+            continue
+        results = scorer.score(texts)
+        # Polarity of the signed score, so low-confidence rows still count;
+        # reviews in failed batches count as wrong
+        predicted = [None if result is None else
+                     "positive" if result[1] >= 0 else "negative"
+                     for result in results]
+        accuracy = np.mean([p == y for p, y in zip(predicted, labels)])
+        stats = scorer.last_stats
+        rows.append({
+            "backend": backend,
+            "accuracy": accuracy,
+            "reviews_per_s": stats["reviews_per_s"],
+            "review_p50_ms": stats["review_p50_ms"],
+            "review_p99_ms": stats["review_p99_ms"],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Accuracy vs speed of the transformer backends")
+    parser.add_argument("--model-dir", required=True,
+                        help="local model directory (save_pretrained output)")
+    parser.add_argument("--export", action="store_true",
+                        help="export model.onnx first if it is missing")
+    parser.add_argument("--sample", default=None,
+                        help="labeled CSV with text,label columns")
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.export and not os.path.exists(
+            os.path.join(args.model_dir, "model.onnx")):
+        export_onnx(args.model_dir)
+
+    texts, labels = labeled_sample(args.sample, args.n)
+    rows = compare_backends(args.model_dir, texts, labels,
+                            batch_size=args.batch_size,
+                            num_threads=args.threads)
+
+    print("\n" + "=" * 60)
+    print(f"Backend comparison ({len(texts)} labeled reviews)")
+    print("=" * 60)
+    for row in rows:
+        print(f"  {row['backend']:<6} accuracy {row['accuracy']:.3f} | "
+              f"{row['reviews_per_s']:8.1f} reviews/s | "
+              f"p50 {row['review_p50_ms']:.2f} ms | "
+              f"p99 {row['review_p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
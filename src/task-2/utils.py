@@ -1,32 +1,48 @@
 # src/task-2/utils.py
 from pathlib import Path
-import pandas as pd
+import sys
 
 # Absolute path to project root
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
+# Shared storage helpers live in Script/ at the project root
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from Script.storage import (  # noqa: E402,F401
+    frame_exists, iter_frames, load_frame, save_frame)
+
 # Data directories
 DATA_DIR = PROJECT_ROOT / "data" / "processed"
 OUTPUT_DIR = PROJECT_ROOT / "data" / "outputs"
 
 
-def load_reviews(filename=None):
+def load_reviews(filename=None, columns=None, banks=None, since=None,
+                 until=None):
     """
-    Load reviews CSV. Auto-detect if filename not provided.
+    Load reviews (CSV or its Parquet dataset). Auto-detect if filename not
+    provided.
+    Optionally load only some columns, banks (bank_code) or a review_date
+    range, e.g. load_reviews(banks=["CBE"], since="2025-06").
     """
     if filename:
         file_path = DATA_DIR / filename
-        if not file_path.exists():
+        if not frame_exists(file_path):
             raise FileNotFoundError(f"{file_path} does not exist.")
     else:
-        csv_files = list(DATA_DIR.glob("*.csv"))
-        if len(csv_files) == 0:
-            raise FileNotFoundError(f"No CSV files found in {DATA_DIR}")
-        elif len(csv_files) > 1:
+        # A table is either a CSV or a <name>.parquet dataset directory
+        tables = {p.with_suffix(".csv") for p in DATA_DIR.glob("*.csv")}
+        tables |= {p.with_suffix(".csv") for p in DATA_DIR.glob("*.parquet")
+                   if p.is_dir()}
+        if len(tables) == 0:
+            raise FileNotFoundError(f"No review tables found in {DATA_DIR}")
+        elif len(tables) > 1:
             raise FileExistsError(
-                f"Multiple CSV files found: {csv_files}. Specify filename explicitly."
+                f"Multiple review tables found: {sorted(tables)}. "
+                "Specify filename explicitly."
             )
-        file_path = csv_files[0]
+        file_path = tables.pop()
 
-    print(f"Loading CSV: {file_path}")
-    return pd.read_csv(file_path)
+    print(f"Loading reviews: {file_path}")
+    return load_frame(file_path, columns=columns, banks=banks,
+                      since=since, until=until)
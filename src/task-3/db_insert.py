@@ -19,7 +19,7 @@ if str(task2_utils_path.resolve()) not in sys.path:
     sys.path.append(str(task2_utils_path.resolve()))
 
 try:
-    from utils import OUTPUT_DIR
+    from utils import OUTPUT_DIR, frame_exists, load_frame
     print(f"✅ Found utils at: {task2_utils_path.resolve()}")
 except ImportError as e:
     raise ImportError(f"❌ Could not import utils from task-2: {e}")
@@ -172,10 +172,10 @@ def verify_data_integrity(conn):
 # -----------------------------
 def main():
     # Load CSV
-    if not INPUT_FILE.exists():
+    if not frame_exists(INPUT_FILE):
         print(f"❌ Input file not found at {INPUT_FILE}")
         return
-    df = pd.read_csv(INPUT_FILE)
+    df = load_frame(INPUT_FILE)
     print(f"Loaded {len(df)} reviews.")
 
     # Ensure review_date is proper format
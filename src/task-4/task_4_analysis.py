@@ -13,6 +13,14 @@ import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 from IPython.display import display
 from pathlib import Path
+import sys
+
+# Shared dtype schema lives in Script/ at the project root
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from Script.schema import apply_schema  # noqa: E402
 
 # -----------------------------------------
 # Database Configuration
@@ -58,7 +66,7 @@ def fetch_all_data(conn):
     """
 
     try:
-        df = pd.read_sql(query, conn)
+        df = apply_schema(pd.read_sql(query, conn))
         df["themes"] = df["themes"].str.split(", ")
         print(f"📥 Loaded {len(df)} reviews.")
         return df
@@ -0,0 +1,59 @@
+"""
+Shared fixtures. The project root (Script/, src/) and src/task-2, whose
+modules import each other by bare name, are put on sys.path.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'src', 'task-2')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def make_raw_reviews(n=60, start=0):
+    """Raw reviews in the scraper's output format, a few of them invalid."""
+    banks = [('CBE', 'Commercial Bank of Ethiopia'),
+             ('Dashen Bank', 'Dashen Bank'),
+             ('Abyssinia Bank', 'Abyssinia Bank')]
+    rows = []
+    for i in range(start, start + n):
+        bank_code, bank_name = banks[i % len(banks)]
+        rows.append({
+            'review_id': f'r{i:05d}',
+            'review_text': f'  review   number {i} about the app  ',
+            'rating': i % 5 + 1,
+            'review_date': f'2025-{i % 12 + 1:02d}-{i % 28 + 1:02d} '
+                           f'{i % 24:02d}:00:00',
+            'bank_code': bank_code,
+            'bank_name': bank_name,
+            'user_name': f'user{i}',
+            'thumbs_up': i % 7,
+            'reply_content': None,
+            'source': 'Google Play'
+        })
+    df = pd.DataFrame(rows)
+    if start == 0 and n > 10:
+        df.loc[3, 'review_text'] = '   '
+        df.loc[5, 'rating'] = 9
+        df.loc[7, 'review_date'] = 'not a date'
+    return df
+
+
+@pytest.fixture
+def raw_reviews_path(tmp_path):
+    path = tmp_path / 'raw' / 'reviews_raw.csv'
+    path.parent.mkdir()
+    make_raw_reviews().to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def no_dashboard(monkeypatch):
+    """Runs in tests never render the dashboard."""
+    from Script.config import PREPROCESSING_CONFIG
+    monkeypatch.setitem(PREPROCESSING_CONFIG, 'dashboard', 'skip')
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from src.scraper.ingest import COLUMNS, ReviewBatch, SeenIndex
+
+
+def raw_review(review_id, score=5):
+    return {'reviewId': review_id, 'content': f'text {review_id}',
+            'score': score, 'at': datetime(2025, 6, 1), 'userName': 'u',
+            'thumbsUpCount': 2, 'replyContent': None,
+            'reviewCreatedVersion': '1.0'}
+
+
+def test_review_batch_builds_typed_columns():
+    batch = ReviewBatch()
+    for i in range(3):
+        batch.append_raw(raw_review(f'r{i}', score=i + 1), 'CBE',
+                         'Commercial Bank of Ethiopia')
+    df = batch.to_frame()
+    assert list(df.columns) == COLUMNS
+    assert list(df['rating']) == [1, 2, 3]
+    assert df['rating'].dtype == 'int64'
+    assert set(df['source']) == {'Google Play'}
+
+
+def test_seen_index_drops_duplicates_across_runs(tmp_path):
+    path = str(tmp_path / 'seen_review_ids.txt')
+    index = SeenIndex(path)
+    assert index.claim('r1') and index.claim('r2')
+    assert not index.claim('r1')
+    assert index.claim(None)
+    index.persist(['r1', 'r2'])
+
+    reopened = SeenIndex(path)
+    assert 'r1' in reopened and 'r2' in reopened
+    assert not reopened.claim('r2')
+    assert reopened.claim('r3')
+
+
+def test_seen_index_is_seeded_from_existing_reviews(tmp_path):
+    csv_path = tmp_path / 'reviews_raw.csv'
+    batch = ReviewBatch()
+    batch.append_raw(raw_review('r1'), 'CBE', 'Commercial Bank of Ethiopia')
+    batch.to_frame().to_csv(csv_path, index=False)
+
+    index = SeenIndex(str(tmp_path / 'seen.txt'), bootstrap_csv=str(csv_path))
+    assert not index.claim('r1')
+    assert (tmp_path / 'seen.txt').read_text().split() == ['r1']
+
+
+def test_seen_index_claims_apply_only_on_commit(tmp_path):
+    index = SeenIndex()
+    assert index.claim('r1', 'app.a') and index.claim('r2', 'app.b')
+    # Staged claims already dedupe within the run...
+    assert not index.claim('r1', 'app.b')
+    assert 'r1' not in index
+
+    index.commit(['app.a'])
+    index.release('app.b')
+    assert 'r1' in index and 'r2' not in index
+    # ...and released ones can be ingested again by the next run
+    assert not index.claim('r1', 'app.b')
+    assert index.claim('r2', 'app.b')
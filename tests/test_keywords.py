@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from _02_keywords_topics import (fit_tfidf, group_indicator,
+                                 grouped_top_terms, top_tfidf_per_bank)
+
+
+def corpus():
+    texts = ['login otp slow', 'transfer failed again', 'great easy app',
+             'app crash after update', 'otp never arrives', 'easy transfer',
+             None, 'support never replies']
+    return pd.DataFrame({
+        'bank_name': ['CBE', 'Dashen Bank', 'CBE', 'Abyssinia Bank',
+                      'Dashen Bank', 'CBE', 'CBE', None],
+        'cleaned_review': texts,
+        'review_date': pd.date_range('2025-01-10', periods=8, freq='20D')
+    })
+
+
+def test_indicator_group_by_matches_per_bank_sums():
+    df = corpus()
+    tfidf, _ = fit_tfidf(df)
+    groups, indicator = group_indicator(df['bank_name'].to_numpy())
+    sums = (indicator @ tfidf).toarray()
+
+    assert list(groups) == ['Abyssinia Bank', 'CBE', 'Dashen Bank']
+    for g, bank in enumerate(groups):
+        rows = np.flatnonzero(df['bank_name'].to_numpy() == bank)
+        expected = np.asarray(tfidf[rows].sum(axis=0)).ravel()
+        np.testing.assert_allclose(sums[g], expected)
+    # Rows without a bank belong to no group
+    assert indicator.sum() == df['bank_name'].notna().sum()
+
+
+def test_grouped_top_terms_rank_by_summed_scores():
+    df = corpus()
+    tfidf, terms = fit_tfidf(df)
+    results = grouped_top_terms(df, tfidf, terms, top_n=3)
+    by_bank = {entry['bank']: entry['top_terms'] for entry in results}
+
+    rows = np.flatnonzero(df['bank_name'].to_numpy() == 'CBE')
+    sums = np.asarray(tfidf[rows].sum(axis=0)).ravel()
+    best = sums.argsort()[::-1][0]
+    assert by_bank['CBE'][0] == (terms[best], sums[best])
+    scores = [score for _, score in by_bank['CBE']]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_grouping_by_month_and_default_mode():
+    df = corpus()
+    tfidf, terms = fit_tfidf(df)
+    monthly = grouped_top_terms(df, tfidf, terms, by=('bank_name', 'month'))
+    assert {(e['bank'], e['month']) for e in monthly} >= {
+        ('CBE', '2025-01'), ('Dashen Bank', '2025-03')}
+
+    per_bank = top_tfidf_per_bank(df.dropna(subset=['bank_name']))
+    assert [e['bank'] for e in per_bank] == ['CBE', 'Dashen Bank',
+                                             'Abyssinia Bank']
+
+
+def test_streaming_script_never_loads_the_whole_corpus(
+        tmp_path, monkeypatch):
+    import os
+    import runpy
+    import sys
+
+    import utils
+
+    def no_full_load(*args, **kwargs):
+        raise AssertionError('streaming mode loaded the whole corpus')
+
+    df = corpus().dropna()
+    df.insert(0, 'review_id', [f'r{i}' for i in range(len(df))])
+    pd.concat([df] * 10, ignore_index=True).to_csv(
+        tmp_path / 'reviews_cleaned.csv', index=False)
+    monkeypatch.setattr(utils, 'OUTPUT_DIR', tmp_path)
+    monkeypatch.setattr(utils, 'load_frame', no_full_load)
+    monkeypatch.setattr(utils, 'load_reviews', no_full_load)
+    monkeypatch.setattr(sys, 'argv', [
+        '_02_keywords_topics.py', '--tfidf-mode', 'streaming',
+        '--lda-mode', 'online'])
+
+    script = os.path.join(os.path.dirname(utils.__file__),
+                          '_02_keywords_topics.py')
+    runpy.run_path(script, run_name='__main__')
+
+    assert (tmp_path / 'tfidf_top_terms.json').exists()
+    assert (tmp_path / 'lda_topics.json').exists()
+    assert len(pd.read_csv(tmp_path / 'reviews_topics.csv')) == 10 * len(df)
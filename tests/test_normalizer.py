@@ -0,0 +1,39 @@
+import pytest
+
+nltk = pytest.importorskip('nltk')
+
+normalizer = pytest.importorskip('normalizer')
+
+NLTK_DATA = ['tokenizers/punkt', 'tokenizers/punkt_tab', 'corpora/stopwords',
+             'corpora/wordnet', 'corpora/omw-1.4']
+
+# Edge cases word_tokenize treats specially, on top of the benchmark corpus
+EDGE_CASES = [
+    "I cannot login, gonna uninstall!!",
+    "Don't use it... it's \"great\" they said",
+    "wanna transfer? gotta wait 10 min",
+    "  Lemme   see\tthe   OTP  ",
+    "😡😡 crashes 24/7 😡",
+    "",
+    None,
+    float('nan'),
+]
+
+
+@pytest.fixture(scope='module')
+def preprocess_text():
+    for resource in NLTK_DATA:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            pytest.skip(f"NLTK data '{resource}' is not installed")
+    from _00_preprocess import preprocess_text
+    return preprocess_text
+
+
+def test_normalizer_matches_preprocess_text(preprocess_text):
+    texts = normalizer.synthetic_corpus(500) + EDGE_CASES
+    expected = [preprocess_text(text) for text in texts]
+    assert normalizer.TextNormalizer().normalize_batch(texts) == expected
+    assert normalizer.normalize_texts(texts, n_workers=2,
+                                      chunksize=100) == expected
@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+
+from conftest import make_raw_reviews
+from src.preprocessing.preprocessing import ReviewPreprocessor
+
+
+def test_incremental_sidecar_is_not_a_review_table(raw_reviews_path,
+                                                   tmp_path, monkeypatch):
+    import utils
+
+    processed_dir = tmp_path / 'processed'
+    processed_dir.mkdir()
+    output_path = str(processed_dir / 'reviews_processed.csv')
+    assert ReviewPreprocessor(raw_reviews_path,
+                              output_path).process_incremental()
+
+    monkeypatch.setattr(utils, 'DATA_DIR', processed_dir)
+    df = utils.load_reviews()
+    assert len(df) == len(pd.read_csv(output_path))
+
+
+def test_incremental_merges_new_and_updated_rows(raw_reviews_path, tmp_path):
+    output_path = str(tmp_path / 'processed' / 'reviews_processed.csv')
+    os.makedirs(os.path.dirname(output_path))
+    assert ReviewPreprocessor(raw_reviews_path,
+                              output_path).process_incremental()
+
+    raw = pd.concat([make_raw_reviews(), make_raw_reviews(10, start=60)],
+                    ignore_index=True)
+    raw.loc[0, 'review_text'] = 'edited review text'
+    raw.to_csv(raw_reviews_path, index=False)
+    preprocessor = ReviewPreprocessor(raw_reviews_path, output_path)
+    assert preprocessor.process_incremental()
+    assert preprocessor.stats['incremental_new'] == 10
+    assert preprocessor.stats['incremental_updated'] == 1
+
+    full_path = str(tmp_path / 'full.csv')
+    assert ReviewPreprocessor(raw_reviews_path, full_path).process()
+    incremental = pd.read_csv(output_path)
+    full = pd.read_csv(full_path)
+    assert incremental['review_id'].is_unique
+    assert sorted(incremental['review_id']) == sorted(full['review_id'])
+    edited = incremental.loc[incremental['review_id'] == 'r00000']
+    assert edited['review_text'].item() == 'edited review text'
+
+
+def run_full(raw_reviews_path, tmp_path):
+    output_path = str(tmp_path / 'full.csv')
+    assert ReviewPreprocessor(raw_reviews_path, output_path).process()
+    return pd.read_csv(output_path)
+
+
+def test_chunked_matches_full(raw_reviews_path, tmp_path):
+    output_path = str(tmp_path / 'chunked.csv')
+    preprocessor = ReviewPreprocessor(raw_reviews_path, output_path)
+    assert preprocessor.process_chunked(chunksize=7)
+
+    full = run_full(raw_reviews_path, tmp_path)
+    chunked = pd.read_csv(output_path)
+    pd.testing.assert_frame_equal(chunked, full)
+    assert preprocessor.stats['final_count'] == len(full)
+
+
+def test_parallel_matches_full(raw_reviews_path, tmp_path):
+    full = run_full(raw_reviews_path, tmp_path)
+    for shard_by in ('rows', 'bank'):
+        output_path = str(tmp_path / f'parallel_{shard_by}.csv')
+        preprocessor = ReviewPreprocessor(raw_reviews_path, output_path)
+        assert preprocessor.process_parallel(n_workers=2, shard_by=shard_by)
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), full)
+        assert preprocessor.stats['invalid_ratings_removed'] == 1
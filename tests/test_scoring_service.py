@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from score_cache import ScoreCache
+from scoring_service import ScoringClient, ScoringService
+
+
+class StubScorer:
+    """Positive for every text; None for 'bad', raises on 'boom'."""
+    version = 'stub-v1'
+
+    def score(self, texts):
+        if 'boom' in texts:
+            raise RuntimeError('out of memory')
+        return [None if text == 'bad' else ('positive', 0.9)
+                for text in texts]
+
+
+@pytest.fixture
+def service_url():
+    service = ScoringService(StubScorer(), max_batch_size=64,
+                             max_wait_ms=50)
+    ready = threading.Event()
+    address = {}
+
+    def on_ready(addr):
+        address['url'] = f"http://{addr[0]}:{addr[1]}"
+        ready.set()
+
+    thread = threading.Thread(
+        target=asyncio.run, args=(service.serve('127.0.0.1', 0, on_ready),),
+        daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    return address['url']
+
+
+def test_unscored_review_comes_back_as_null(service_url):
+    client = ScoringClient(service_url)
+    assert client.score(['good', 'bad', 'fine']) == [
+        ('positive', 0.9), None, ('positive', 0.9)]
+    assert client.metrics()['failed'] == 1
+
+
+def test_failed_batch_answers_every_coalesced_request(service_url):
+    client = ScoringClient(service_url)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        healthy = pool.submit(client.score, ['good', 'fine'])
+        failing = pool.submit(client.score, ['boom'])
+        results = healthy.result(timeout=10) + failing.result(timeout=10)
+    # Coalesced or not, no request fails; the exploded batch is all null
+    assert results[2] is None
+    assert all(r in (None, ('positive', 0.9)) for r in results[:2])
+    assert client.score(['good']) == [('positive', 0.9)]
+
+
+def test_failed_reviews_are_not_cached_end_to_end(service_url, tmp_path):
+    client = ScoringClient(service_url)
+    cache = ScoreCache(tmp_path / 'scores.sqlite')
+    texts = ['good', 'bad']
+    first = cache.scores(texts, 'transformer', client.version, client.score)
+    assert first == [('positive', 0.9), None]
+    assert len(cache) == 1
+
+    cache.scores(texts, 'transformer', client.version, client.score)
+    assert cache.hits['transformer'] == 1
+    assert cache.misses['transformer'] == 3
+    cache.close()
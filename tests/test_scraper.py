@@ -0,0 +1,143 @@
+from Script.config import DATA_PATHS
+from src.scraper import backends
+from src.scraper.state import ScrapeStateStore
+
+
+def test_backfill_token_round_trips_through_state(tmp_path):
+    store = ScrapeStateStore(str(tmp_path / 'scrape_state.json'))
+    token = backends.make_token('page-2', 100, 'en', 'et')
+    store.update('com.bank', [], token=token, save_token=True)
+
+    restored = ScrapeStateStore(str(tmp_path / 'scrape_state.json')) \
+        .backfill_token('com.bank')
+    assert isinstance(restored, backends.ContinuationToken)
+    assert [getattr(restored, f) for f in backends.TOKEN_FIELDS] == \
+        [getattr(token, f) for f in backends.TOKEN_FIELDS]
+
+
+def test_live_backend_falls_back_to_public_reviews(monkeypatch):
+    calls = []
+
+    def public_reviews(app_id, **kwargs):
+        calls.append((app_id, kwargs))
+        return [], backends.make_token(None, kwargs['count'])
+
+    monkeypatch.setattr(backends, '_fetch_review_items', None)
+    monkeypatch.setattr(backends, 'public_reviews', public_reviews)
+    page, token = backends.PlayStoreBackend().reviews(
+        'com.bank', 'en', 'et', 100)
+    assert page == [] and token.token is None
+    assert calls[0][0] == 'com.bank'
+    assert calls[0][1]['count'] == 100
+
+
+def test_public_reviews_fallback_never_overshoots_count(monkeypatch):
+    served = []
+
+    def public_reviews(app_id, count, continuation_token=None, **kwargs):
+        # Like google_play_scraper: a token's own count wins over `count`
+        if continuation_token is not None:
+            count = continuation_token.count
+        start = int(continuation_token.token) if continuation_token else 0
+        served.append(count)
+        page = [{'reviewId': f"r{i}", 'content': 'ok', 'score': 5}
+                for i in range(start, start + count)]
+        return page, backends.make_token(str(start + count), count)
+
+    monkeypatch.setattr(backends, '_fetch_review_items', None)
+    monkeypatch.setattr(backends, 'public_reviews', public_reviews)
+    scraper = fake_scraper('http://unused', n_apps=1)
+    scraper.backend = backends.PlayStoreBackend()
+    scraper.page_size = 40
+
+    reviews = scraper.scrape_reviews('com.fake.bank000', 100, mode='full')
+    assert served == [40, 40, 20]
+    assert len(reviews) == 100
+
+
+def fake_scraper(url, n_apps=3, reviews_per_app=150):
+    from src.scraper.benchmark import build_scraper
+    return build_scraper(url, n_apps, reviews_per_app, max_workers=4,
+                         global_rate=0, per_app_rate=0)
+
+
+def test_scheduler_counts_every_run(tmp_path, monkeypatch):
+    from src.scraper.fake_play_store import FakePlayStoreServer
+    from src.scraper.scheduler import ScrapeScheduler
+
+    monkeypatch.chdir(tmp_path)
+    with FakePlayStoreServer(reviews_per_app=50) as server:
+        scraper = fake_scraper(server.url, n_apps=4, reviews_per_app=50)
+        scheduler = ScrapeScheduler(scraper, intervals={},
+                                    default_interval=0.01, jitter=0.0,
+                                    max_workers=4)
+        scheduler.run(max_runs=12)
+    assert scheduler.runs == 12
+
+
+def test_failed_save_leaves_reviews_for_the_next_run(tmp_path, monkeypatch):
+    from Script.storage import load_frame
+    from src.scraper.fake_play_store import FakePlayStoreServer
+    from src.scraper.scheduler import ScrapeScheduler
+
+    monkeypatch.chdir(tmp_path)
+    with FakePlayStoreServer(reviews_per_app=50) as server:
+        scraper = fake_scraper(server.url, n_apps=1, reviews_per_app=50)
+        scheduler = ScrapeScheduler(scraper, intervals={}, jitter=0.0)
+        bank_code = next(iter(scraper.app_ids))
+        save_reviews = scraper.save_reviews
+
+        def failing_save(*args, **kwargs):
+            raise OSError("disk full")
+
+        scraper.save_reviews = failing_save
+        scheduler.run_app(bank_code)
+        scraper.save_reviews = save_reviews
+        scheduler.run_app(bank_code)
+        scheduler.stop()
+
+    saved = load_frame(DATA_PATHS['raw_reviews'])
+    assert len(saved) == 50 and saved['review_id'].is_unique
+
+
+def test_concurrent_scrape_matches_sequential(tmp_path, monkeypatch):
+    from src.scraper.fake_play_store import FakePlayStoreServer
+
+    monkeypatch.chdir(tmp_path)
+    frames = {}
+    with FakePlayStoreServer(reviews_per_app=400) as server:
+        for concurrent in (False, True):
+            scraper = fake_scraper(server.url)
+            scraper.page_size = 40
+            frames[concurrent] = scraper.scrape_all_banks(
+                concurrent=concurrent, mode='full', stream=False)
+
+    sequential, concurrent = frames[False], frames[True]
+    assert len(sequential) == 3 * 150
+    assert sequential['review_id'].is_unique
+    assert sequential.groupby('bank_code').size().eq(150).all()
+    assert list(concurrent['review_id']) == list(sequential['review_id'])
+
+
+def test_half_open_breaker_admits_a_single_probe(monkeypatch):
+    from src.scraper import request_policy
+
+    now = [0.0]
+    monkeypatch.setattr(request_policy.time, 'monotonic', lambda: now[0])
+    breaker = request_policy.CircuitBreaker(failure_threshold=2,
+                                            reset_timeout=10)
+    breaker.record_failure('app')
+    assert breaker.record_failure('app')
+    assert not breaker.allow('app')
+
+    now[0] = 10.0
+    assert breaker.allow('app')
+    assert not breaker.allow('app') and not breaker.allow('app')
+    # A failed probe parks the app again, a successful one closes it
+    assert breaker.record_failure('app')
+    assert not breaker.allow('app')
+    now[0] = 20.0
+    assert breaker.allow('app') and not breaker.allow('app')
+    breaker.record_success('app')
+    assert breaker.allow('app') and breaker.allow('app')
+    assert not breaker.is_open('app')
@@ -0,0 +1,61 @@
+from sqlite_cache import SQLiteCache
+
+
+def test_failed_values_are_not_cached(tmp_path):
+    cache = SQLiteCache(tmp_path / 'cache.sqlite', max_entries=100)
+    calls = []
+
+    def flaky(texts):
+        calls.append(list(texts))
+        return [None if text == 'bad' else ['positive', 0.9]
+                for text in texts]
+
+    values, _, misses = cache.lookup(['good', 'bad'], 'transformer', 'v1',
+                                     flaky)
+    assert values == [['positive', 0.9], None]
+    assert misses == 2
+    assert len(cache) == 1
+
+    values, hits, misses = cache.lookup(['good', 'bad'], 'transformer', 'v1',
+                                        flaky)
+    assert (hits, misses) == (1, 1)
+    assert calls[-1] == ['bad']
+    cache.close()
+
+
+def test_local_checkpoints_get_distinct_versions(tmp_path):
+    from transformer_scorer import MODEL_NAME, TransformerScorer
+
+    versions = set()
+    for run in ('a', 'b'):
+        model_dir = tmp_path / run / 'model'
+        model_dir.mkdir(parents=True)
+        (model_dir / 'config.json').write_text('{"run": "%s"}' % run)
+        versions.add(TransformerScorer.version_for(str(model_dir)))
+    versions.add(TransformerScorer.version_for(MODEL_NAME))
+    assert len(versions) == 3
+    assert TransformerScorer.version_for(MODEL_NAME, 'onnx') == \
+        f"{MODEL_NAME}-onnx"
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = SQLiteCache(tmp_path / 'cache.sqlite', max_entries=2)
+    cache.put_many('text', 'v1', [('a', 1)])
+    cache.put_many('text', 'v1', [('b', 2)])
+    assert cache.get_many('text', 'v1', ['a']) == {'a': 1}
+
+    cache.put_many('text', 'v1', [('c', 3)])
+    assert len(cache) == 2
+    assert cache.get_many('text', 'v1', ['a', 'b', 'c']) == {'a': 1, 'c': 3}
+    cache.close()
+
+
+def test_entries_are_scoped_by_namespace_and_version(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = SQLiteCache(path, max_entries=10)
+    cache.put_many('vader', 'v1', [('k', 0.5)])
+    assert cache.get_many('vader', 'v2', ['k']) == {}
+    assert cache.get_many('textblob', 'v1', ['k']) == {}
+    cache.close()
+    assert SQLiteCache(path, max_entries=10).get_many(
+        'vader', 'v1', ['k']) == {'k': 0.5}
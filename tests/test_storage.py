@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+import pytest
+
+from Script import storage
+from Script.config import STORAGE_CONFIG
+
+
+@pytest.fixture
+def reviews():
+    return pd.DataFrame({
+        'review_id': [f'r{i}' for i in range(12)],
+        'review_text': [f'text {i}' for i in range(12)],
+        'rating': [i % 5 + 1 for i in range(12)],
+        'review_date': [f'2025-{i + 1:02d}-15' for i in range(12)],
+        'bank_code': ['CBE', 'Dashen Bank', 'Abyssinia Bank'] * 4,
+    })
+
+
+@pytest.fixture
+def parquet_only(monkeypatch):
+    monkeypatch.setitem(STORAGE_CONFIG, 'format', 'parquet')
+
+
+def test_partitions_follow_bank_and_month(reviews, tmp_path, parquet_only):
+    path = tmp_path / 'reviews.csv'
+    storage.save_frame(reviews, path)
+
+    assert not path.exists()
+    root = storage.dataset_path(path)
+    # Hive partition values are URL-encoded in directory names
+    assert sorted(os.listdir(root)) == [
+        'bank=Abyssinia%20Bank', 'bank=CBE', 'bank=Dashen%20Bank']
+    assert os.path.isdir(os.path.join(root, 'bank=CBE', 'year=2025',
+                                      'month=10'))
+
+
+def test_partition_filters_match_csv_filters(reviews, tmp_path,
+                                             monkeypatch):
+    path = tmp_path / 'reviews.csv'
+    monkeypatch.setitem(STORAGE_CONFIG, 'format', 'both')
+    storage.save_frame(reviews, path)
+
+    filters = dict(columns=['review_id', 'rating'], banks=['CBE'],
+                   since='2025-03', until='2025-11')
+    from_dataset = storage.read_dataset(path, **filters)
+    from_csv = storage.read_csv(path, **filters)
+    assert list(from_dataset.columns) == ['review_id', 'rating']
+    assert sorted(from_dataset['review_id']) == \
+        sorted(from_csv['review_id']) == ['r3', 'r6', 'r9']
+
+
+def test_partition_filter_prunes_files(reviews, tmp_path, parquet_only):
+    import pyarrow.dataset as ds
+
+    path = tmp_path / 'reviews.csv'
+    storage.save_frame(reviews, path)
+    dataset = ds.dataset(storage.dataset_path(path), format='parquet',
+                         partitioning='hive')
+    fragments = list(dataset.get_fragments(
+        filter=storage.partition_filter(banks=['CBE'], since='2025-07')))
+    assert len(fragments) == 2
+    assert all('bank=CBE' in f.path for f in fragments)
+
+
+def test_append_keeps_one_dataset(reviews, tmp_path, parquet_only):
+    path = tmp_path / 'reviews.csv'
+    storage.save_frame(reviews.iloc[:6], path)
+    storage.save_frame(reviews.iloc[6:], path, append=True)
+    loaded = storage.load_frame(path)
+    assert sorted(loaded['review_id']) == sorted(reviews['review_id'])
+
+
+def test_export_csv_chunks_share_one_schema(tmp_path, parquet_only):
+    import pyarrow.dataset as ds
+
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame({
+        'review_id': [f'r{i}' for i in range(6)],
+        'rating': [5, 4, None, 3, 2, 1],
+        # Missing in the whole first chunk, text in the second
+        'reply_content': [None, None, None, 'thanks', None, 'ok'],
+        'review_date': [f'2025-01-0{i + 1}' for i in range(6)],
+        'bank_code': ['CBE'] * 6,
+    }).to_csv(path, index=False)
+    storage.export_csv(path, chunksize=3)
+
+    dataset = ds.dataset(storage.dataset_path(path), format='parquet',
+                         partitioning='hive')
+    schemas = {f.physical_schema for f in dataset.get_fragments()}
+    assert len(schemas) == 1
+    loaded = storage.load_frame(path)
+    assert sorted(loaded['reply_content'].dropna()) == ['ok', 'thanks']
+    assert loaded['rating'].isna().sum() == 1
@@ -0,0 +1,68 @@
+import joblib
+import pandas as pd
+
+from topic_model import OnlineTopicModel, index_path
+
+WORDS = ['login', 'error', 'transfer', 'slow', 'update', 'great', 'easy',
+         'otp', 'crash', 'support']
+
+
+def reviews(n, start=0):
+    return pd.DataFrame({
+        'review_id': [f'r{i}' for i in range(start, start + n)],
+        'cleaned_review': [' '.join(WORDS[(i + k) % len(WORDS)]
+                                    for k in range(4))
+                           for i in range(start, start + n)]
+    })
+
+
+def test_trained_ids_live_outside_the_model(tmp_path):
+    path = tmp_path / 'lda.joblib'
+    kwargs = dict(n_topics=2, batch_size=16, min_df=1)
+
+    model = OnlineTopicModel.load_or_create(path, **kwargs)
+    assert model.update(reviews(40)) == 40
+    model.save(path)
+    # The pickled model carries no ids; they are in the index file
+    assert len(joblib.load(path).index) == 0
+    assert len(model.index) == 40
+    model.index.close()
+
+    model = OnlineTopicModel.load_or_create(path, **kwargs)
+    assert model.update(reviews(50)) == 10
+    assert model.n_docs_seen == 50
+    model.save(path)
+    model.index.close()
+
+    model = OnlineTopicModel.load_or_create(path, refit=True, **kwargs)
+    assert len(model.index) == 0
+    assert index_path(path).exists()
+    model.index.close()
+
+
+def test_terms_from_later_chunks_are_learned(tmp_path):
+    model = OnlineTopicModel(n_topics=2, batch_size=16, min_df=1)
+    model.partial_fit(reviews(20)['cleaned_review'])
+    model.partial_fit(['biometric fingerprint'] * 5)
+    terms = {term for topic in model.topics(top_n=50) for term in topic}
+    assert {'biometric', 'fingerprint'} <= terms
+
+
+def test_streamed_statistics_do_not_depend_on_chunksize(tmp_path):
+    from _02_keywords_topics import streaming_online_lda_topics
+
+    path = tmp_path / 'reviews_cleaned.csv'
+    corpus = reviews(60)
+    corpus.loc[55:, 'cleaned_review'] += ' biometric'
+    corpus.to_csv(path, index=False)
+
+    models = []
+    for chunksize in (7, 1000):
+        model_path = tmp_path / f'lda_{chunksize}.joblib'
+        streaming_online_lda_topics(
+            path, tmp_path / f'topics_{chunksize}.csv', chunksize=chunksize,
+            n_topics=2, model_path=model_path, batch_size=16, n_jobs=1)
+        models.append(joblib.load(model_path))
+    assert (models[0].doc_freq == models[1].doc_freq).all()
+    assert models[0].sketch.entries == models[1].sketch.entries
+    assert models[0].n_docs_seen == 60
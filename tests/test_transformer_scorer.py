@@ -0,0 +1,56 @@
+import numpy as np
+
+from transformer_scorer import TransformerScorer
+
+
+class WordTokenizer:
+    """One token per word, truncated to max_length."""
+
+    def __call__(self, texts, truncation=True, max_length=512):
+        ids = [list(range(len(text.split())))[:max_length] for text in texts]
+        return {'input_ids': ids,
+                'attention_mask': [[1] * len(i) for i in ids]}
+
+
+def stub_scorer(batch_size=2, chunk_size=4, fail_on=None):
+    """A TransformerScorer whose 'model' is positive for even lengths."""
+    scorer = TransformerScorer.__new__(TransformerScorer)
+    scorer.tokenizer = WordTokenizer()
+    scorer.id2label = {0: 'NEGATIVE', 1: 'POSITIVE'}
+    scorer.batch_size = batch_size
+    scorer.chunk_size = chunk_size
+    scorer.max_length = 512
+    scorer.batch_lengths = []
+
+    def predict_batch(encodings):
+        lengths = [len(e['input_ids']) for e in encodings]
+        scorer.batch_lengths.append(lengths)
+        if fail_on in lengths:
+            raise RuntimeError('out of memory')
+        return np.array([[0.1, 0.9] if n % 2 == 0 else [0.95, 0.05]
+                         for n in lengths])
+
+    scorer.predict_batch = predict_batch
+    return scorer
+
+
+TEXTS = [' '.join(['w'] * n) for n in (3, 8, 1, 6, 2, 7, 4)]
+
+
+def test_results_come_back_in_input_order():
+    scorer = stub_scorer()
+    results = scorer.score(TEXTS)
+    expected = [('negative', -0.95) if len(t.split()) % 2
+                else ('positive', 0.9) for t in TEXTS]
+    assert [(label, round(score, 2)) for label, score in results] == expected
+    # Batches hold texts of similar length, longest first within a chunk
+    assert scorer.batch_lengths[:2] == [[8, 6], [3, 1]]
+    assert scorer.last_stats['reviews'] == len(TEXTS)
+
+
+def test_failed_batch_is_marked_not_neutral():
+    scorer = stub_scorer(fail_on=8)
+    results = scorer.score(TEXTS)
+    assert results[1] is None and results[3] is None
+    assert all(r is not None for i, r in enumerate(results) if i not in (1, 3))
+    assert scorer.last_stats['failed'] == 2